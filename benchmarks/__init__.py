@@ -0,0 +1 @@
+"""Headless render benchmarks: ``python -m benchmarks --help``."""
@@ -0,0 +1,106 @@
+"""Measure application startup: imports, first frame and backend init.
+
+Each run is a fresh interpreter so nothing is already imported::
+
+    python -m benchmarks.startup --runs 5
+
+Times are seconds since the child process started running Python code;
+``process_s`` adds interpreter start-up as seen from the parent.
+"""
+import argparse
+import datetime
+import json
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import time
+
+from .suite import RESULTS_DIR
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+DEFAULT_RUNS = 3
+
+# Runs in the child; prints one JSON line.
+_CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from PySide6 import QtWidgets
+app = QtWidgets.QApplication(sys.argv[:1])
+t_qt = time.perf_counter()
+from ui.mainwindow import MainWindow
+t_import = time.perf_counter()
+win = MainWindow()
+win.show()
+app.processEvents()
+t_frame = time.perf_counter()
+numba_at_frame = "numba" in sys.modules
+from core.render import init_backend_async, get_renderer_state
+future = init_backend_async()
+while not future.done():
+    app.processEvents()
+    time.sleep(0.005)
+t_backend = time.perf_counter()
+print(json.dumps({
+    "qt_s": t_qt - t0,
+    "import_s": t_import - t0,
+    "first_frame_s": t_frame - t0,
+    "backend_ready_s": t_backend - t0,
+    "cuda": bool(future.result()),
+    "numba_loaded_before_first_frame": numba_at_frame,
+    "first_frame_backend": win.canvas.last_stats.backend if win.canvas.last_stats else None,
+}))
+"""
+
+
+def run_once(env: dict) -> dict:
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", _CHILD], cwd=ROOT, env=env,
+                          capture_output=True, text=True, check=True)
+    total = time.perf_counter() - start
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_s"] = total
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup",
+                                     description="Benchmark MandelPy start-up latency.")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--platform", default="offscreen",
+                        help="QT_QPA_PLATFORM for the child (default: offscreen)")
+    parser.add_argument("--out", type=pathlib.Path,
+                        help="JSON results file (default: benchmarks/results/startup_<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ, QT_QPA_PLATFORM=args.platform)
+    runs = []
+    for i in range(max(1, args.runs)):
+        runs.append(run_once(env))
+        r = runs[-1]
+        print(f"run {i + 1}: import {r['import_s'] * 1e3:7.1f} ms"
+              f"  first frame {r['first_frame_s'] * 1e3:7.1f} ms ({r['first_frame_backend']})"
+              f"  backend ready {r['backend_ready_s'] * 1e3:7.1f} ms"
+              f"  process {r['process_s'] * 1e3:7.1f} ms")
+
+    keys = ("qt_s", "import_s", "first_frame_s", "backend_ready_s", "process_s")
+    report = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "median": {k: statistics.median(r[k] for r in runs) for k in keys},
+        "runs": runs,
+    }
+    out = args.out
+    if out is None:
+        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        out = RESULTS_DIR / f"startup_{ts}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf8") as fp:
+        json.dump(report, fp, indent=4)
+    print(f"[MandelPy bench] wrote {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
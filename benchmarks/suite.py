@@ -0,0 +1,222 @@
+"""Time every render engine over a fixed set of scenes.
+
+Results are written as JSON so two runs can be compared::
+
+    python -m benchmarks --out before.json
+    python -m benchmarks --out after.json --compare before.json
+
+Iteration throughput is estimated from the smooth counts (interior pixels
+count as ``max_iter``), so it is comparable between engines but not exact.
+"""
+import argparse
+import datetime
+import json
+import pathlib
+import platform
+import statistics
+import time
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from core import render
+from core.prefs import APP_NAME
+from core.stats import count_pixels
+
+RESULTS_DIR = pathlib.Path(__file__).parent / "results"
+DEFAULT_SIZES = ((640, 480), (1280, 720))
+DEFAULT_ITERS = (256, 2048)
+DEFAULT_REPEATS = 3
+DEFAULT_TOLERANCE = 0.10
+
+
+class Scene(NamedTuple):
+    cx: float
+    cy: float
+    span_x: float
+
+
+SCENES = {
+    "full":          Scene(-0.75, 0.0, 3.5),
+    "seahorse-1e6":  Scene(-0.743643887037151, 0.131825904205330, 3.5e-6),
+    "deep-interior": Scene(-0.2, 0.0, 0.05),
+    "boundary":      Scene(-0.10109636384562, 0.95628651080914, 0.02),
+}
+
+
+def _bounds(scene: Scene, W: int, H: int):
+    span_y = scene.span_x * H / W
+    return (scene.cx - scene.span_x / 2, scene.cx + scene.span_x / 2,
+            scene.cy - span_y / 2, scene.cy + span_y / 2)
+
+
+def _cpu(scene, W, H, max_iter, escape_radius):
+    return render._cpu_render(*_bounds(scene, W, H), W, H, max_iter, escape_radius)
+
+
+def _cuda(scene, W, H, max_iter, escape_radius):
+    return render.cuda_render(*_bounds(scene, W, H), W, H, max_iter, escape_radius)
+
+
+def _cuda_tiled(scene, W, H, max_iter, escape_radius):
+    return render.cuda_render_tiled(*_bounds(scene, W, H), W, H, max_iter, escape_radius)
+
+
+def _jit_dd(scene, W, H, max_iter, escape_radius):
+    from core.ddrender import dd_render
+    return dd_render(scene.cx, 0.0, scene.cy, 0.0, scene.span_x, scene.span_x * H / W,
+                     W, H, max_iter, escape_radius)
+
+
+def _cuda_missing():
+    return None if render._cuda_ready() else "CUDA unavailable"
+
+
+def _dd_missing():
+    try:
+        from core import ddrender  # noqa: F401
+    except ImportError as exc:
+        return f"numba unavailable ({exc})"
+    return None
+
+
+class Engine(NamedTuple):
+    run: Callable
+    unavailable: Callable[[], str | None]
+
+
+ENGINES = {
+    "cpu":        Engine(_cpu, lambda: None),
+    "cuda":       Engine(_cuda, _cuda_missing),
+    "cuda-tiled": Engine(_cuda_tiled, _cuda_missing),
+    "jit-dd":     Engine(_jit_dd, _dd_missing),
+}
+
+
+def time_case(engine: Engine, scene: Scene, W: int, H: int, max_iter: int,
+              escape_radius: float = 4.0, repeats: int = DEFAULT_REPEATS) -> dict:
+    """Warm up once (JIT compiles, autotuning), then time `repeats` runs."""
+    iters = engine.run(scene, W, H, max_iter, escape_radius)
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        engine.run(scene, W, H, max_iter, escape_radius)
+        times.append(time.perf_counter() - t0)
+    seconds = statistics.median(times)
+    counts = count_pixels(iters, max_iter)
+    return {
+        "seconds": seconds,
+        "min_seconds": min(times),
+        "px_per_s": W * H / seconds,
+        "iter_per_s": counts.iterations / seconds,
+        "iterations": counts.iterations,
+        "interior_fraction": counts.interior / iters.size,
+    }
+
+
+def _environment() -> dict:
+    env = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+    }
+    try:
+        import numba
+        env["numba"] = numba.__version__
+    except ImportError:
+        env["numba"] = None
+    env["cuda_device"] = render._device_name() if render._cuda_ready() else None
+    return env
+
+
+def run_suite(engines, scenes, sizes, iters, repeats=DEFAULT_REPEATS, log=print) -> dict:
+    results = []
+    for engine_name in engines:
+        engine = ENGINES[engine_name]
+        reason = engine.unavailable()
+        if reason:
+            log(f"[{APP_NAME} bench] skipping {engine_name}: {reason}")
+            continue
+        for scene_name in scenes:
+            for W, H in sizes:
+                for max_iter in iters:
+                    row = {"engine": engine_name, "scene": scene_name,
+                           "width": W, "height": H, "max_iter": max_iter}
+                    row.update(time_case(engine, SCENES[scene_name], W, H,
+                                         max_iter, repeats=repeats))
+                    results.append(row)
+                    log(f"{engine_name:<11} {scene_name:<14} {W}x{H} it={max_iter:<6}"
+                        f" {row['seconds'] * 1e3:9.2f} ms"
+                        f" {row['px_per_s'] / 1e6:8.2f} Mpx/s"
+                        f" {row['iter_per_s'] / 1e9:8.3f} Giter/s")
+    return {"environment": _environment(), "results": results}
+
+
+def _case_key(row: dict) -> tuple:
+    return (row["engine"], row["scene"], row["width"], row["height"], row["max_iter"])
+
+
+def compare(current: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """Return a line per case that got more than `tolerance` slower."""
+    previous = {_case_key(row): row for row in baseline.get("results", [])}
+    regressions = []
+    for row in current["results"]:
+        old = previous.get(_case_key(row))
+        if old is None:
+            continue
+        ratio = row["seconds"] / old["seconds"]
+        if ratio > 1.0 + tolerance:
+            regressions.append(
+                "{} {} {}x{} it={}: {:.2f} ms -> {:.2f} ms ({:+.0%})".format(
+                    *_case_key(row), old["seconds"] * 1e3, row["seconds"] * 1e3, ratio - 1))
+    return regressions
+
+
+def _parse_size(text: str) -> tuple[int, int]:
+    try:
+        w, h = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WxH, got {text!r}")
+    if w < 1 or h < 1:
+        raise argparse.ArgumentTypeError(f"size must be positive, got {text!r}")
+    return w, h
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmark the MandelPy render engines.")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument("--scenes", nargs="+", choices=list(SCENES), default=list(SCENES))
+    parser.add_argument("--sizes", nargs="+", type=_parse_size, default=list(DEFAULT_SIZES),
+                        metavar="WxH")
+    parser.add_argument("--iters", nargs="+", type=int, default=list(DEFAULT_ITERS))
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--out", type=pathlib.Path,
+                        help="JSON results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", type=pathlib.Path, metavar="BASELINE",
+                        help="earlier results file; exit 1 if any case regressed")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.engines, args.scenes, args.sizes, args.iters,
+                       repeats=max(1, args.repeats))
+
+    out = args.out
+    if out is None:
+        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        out = RESULTS_DIR / f"bench_{ts}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf8") as fp:
+        json.dump(report, fp, indent=4)
+    print(f"[{APP_NAME} bench] wrote {out}")
+
+    if args.compare is not None:
+        with open(args.compare, "r", encoding="utf8") as fp:
+            regressions = compare(report, json.load(fp), args.tolerance)
+        for line in regressions:
+            print(f"[{APP_NAME} bench] regression: {line}")
+        if regressions:
+            return 1
+    return 0
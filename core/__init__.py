@@ -1,5 +1,11 @@
 from .prefs    import PREFS, load_prefs, save_prefs, APP_NAME
-from .render   import cuda_render
+from .render   import (
+    cuda_render,
+    cuda_render_tiled,
+    cuda_render_async,
+    render_view,
+    get_renderer_state,
+)
 from .gradient import (
     gradient_to_lut,
     save_preset_file,
@@ -9,11 +15,22 @@ from .gradient import (
     ASSETS_DIR,
     _unique_default_name,
 )
+from .export   import export_poster
+from .stats    import (
+    FrameStats,
+    add_stats_listener,
+    remove_stats_listener,
+    last_frame_stats,
+)
 
 __all__ = [
     "PREFS", "load_prefs", "save_prefs", "APP_NAME",
-    "cuda_render",
+    "cuda_render", "cuda_render_tiled", "cuda_render_async",
+    "render_view", "get_renderer_state",
     "gradient_to_lut", "save_preset_file", "load_preset_file",
     "list_presets", "gradient_preview_pixmap",
     "ASSETS_DIR", "_unique_default_name",
+    "export_poster",
+    "FrameStats", "add_stats_listener", "remove_stats_listener",
+    "last_frame_stats",
 ]
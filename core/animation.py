@@ -0,0 +1,285 @@
+"""Zoom-sequence export: numbered PNG frames plus a JSON manifest.
+
+Frames interpolate the span exponentially between two viewports. With
+keyframe reuse on, only every halving of the span is rendered (at twice the
+output size); the frames in between are resampled crops of that keyframe,
+the classic zoom-video trick that cuts rendering by roughly an order of
+magnitude.
+"""
+import json
+import math
+import os
+import pathlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import NamedTuple
+
+import numpy as np
+
+from .ddmath import dd_add_float
+from .export import PngStreamWriter, render_band
+from .render import _cuda_ready, _render_executor
+
+MANIFEST_NAME = "manifest.json"
+# keyframes rendering or queued at once; each holds a 2W x 2H image until
+# its derived frames are written
+_KEYS_AHEAD = 2
+
+
+class View(NamedTuple):
+    cx: float
+    cy: float
+    span_x: float
+    span_y: float
+    cx_lo: float = 0.0
+    cy_lo: float = 0.0
+
+
+class _Frame(NamedTuple):
+    view: View
+    t: float          # position on the path, 0 at start .. 1 at end
+    key: int | None   # index of the keyframe it is derived from
+
+
+def _path_point(start: View, end: View, span_x: float) -> tuple[View, float]:
+    """Viewport on the zoom path whose width is `span_x`.
+
+    The centre moves in proportion to the span, so the end view's centre
+    stays put on screen while zooming instead of drifting.
+    """
+    if start.span_x == end.span_x:
+        f = 0.0
+    else:
+        f = (span_x - end.span_x) / (start.span_x - end.span_x)
+    dx = (start.cx - end.cx) + (start.cx_lo - end.cx_lo)
+    dy = (start.cy - end.cy) + (start.cy_lo - end.cy_lo)
+    cx, cx_lo = dd_add_float(end.cx, end.cx_lo, dx * f)
+    cy, cy_lo = dd_add_float(end.cy, end.cy_lo, dy * f)
+    aspect = end.span_y / end.span_x
+    return View(cx, cy, span_x, span_x * aspect, cx_lo, cy_lo), f
+
+
+def plan_frames(start: View, end: View, frames: int,
+                keyframes: bool = True) -> tuple[list[_Frame], list[View]]:
+    """Return the frame list and the keyframe views they are derived from."""
+    frames = max(2, int(frames))
+    ratio = end.span_x / start.span_x
+    top = max(start.span_x, end.span_x)
+    plan, keys, key_index = [], [], {}
+    for n in range(frames):
+        t = n / (frames - 1)
+        view, f = _path_point(start, end, start.span_x * ratio ** t)
+        key = None
+        if keyframes:
+            # keyframe j covers spans in (top / 2**(j+1), top / 2**j]
+            j = max(0, math.floor(math.log2(top / view.span_x) + 1e-9))
+            kview, kf = _path_point(start, end, top / 2 ** j)
+            dx = ((start.cx - end.cx) + (start.cx_lo - end.cx_lo)) * (f - kf)
+            dy = ((start.cy - end.cy) + (start.cy_lo - end.cy_lo)) * (f - kf)
+            inside = (abs(dx) + view.span_x / 2 <= kview.span_x / 2 * (1 + 1e-9)
+                      and abs(dy) + view.span_y / 2 <= kview.span_y / 2 * (1 + 1e-9))
+            if inside:
+                key = key_index.setdefault(j, len(keys))
+                if key == len(keys):
+                    keys.append(kview)
+        plan.append(_Frame(view, t, key))
+    return plan, keys
+
+
+def _render_rgb(view: View, W, H, max_iter, escape_radius, lut,
+                aa_level=1, distance=False) -> np.ndarray:
+    return render_band(view.cx, view.cy, view.span_x, view.span_y, W, H,
+                       0, H, max_iter, escape_radius, lut,
+                       view.cx_lo, view.cy_lo, aa_level, distance)
+
+
+def _resample(key_rgb: np.ndarray, key: View, view: View, W, H) -> np.ndarray:
+    """Bilinearly resample the part of a 2W x 2H keyframe covered by `view`."""
+    KH, KW = key_rgb.shape[:2]
+    kdx, kdy = key.span_x / KW, key.span_y / KH
+    off_x = (view.cx - key.cx) + (view.cx_lo - key.cx_lo)
+    off_y = (view.cy - key.cy) + (view.cy_lo - key.cy_lo)
+    u = (off_x + (np.arange(W) - W / 2) * view.span_x / W) / kdx + KW / 2
+    v = (off_y + (np.arange(H) - H / 2) * view.span_y / H) / kdy + KH / 2
+    u = np.clip(u, 0, KW - 1)
+    v = np.clip(v, 0, KH - 1)
+    u0 = np.minimum(u.astype(np.int64), KW - 2)
+    v0 = np.minimum(v.astype(np.int64), KH - 2)
+    fu = (u - u0)[None, :, None]
+    fv = (v - v0)[:, None, None]
+    src = key_rgb.astype(np.float32)
+    top = src[v0[:, None], u0[None, :]] * (1 - fu) + src[v0[:, None], u0[None, :] + 1] * fu
+    bot = src[v0[:, None] + 1, u0[None, :]] * (1 - fu) + src[v0[:, None] + 1, u0[None, :] + 1] * fu
+    return np.round(top * (1 - fv) + bot * fv).astype(np.uint8)
+
+
+def _write_png(path: pathlib.Path, rgb: np.ndarray):
+    with PngStreamWriter(path, rgb.shape[1], rgb.shape[0]) as writer:
+        writer.write_rows(rgb)
+
+
+class ZoomExport:
+    """A zoom-sequence export running in the background.
+
+    The GUI drives it with `poll`, which never blocks; `cancel` stops it and
+    removes whatever it wrote. CUDA renders go through the render executor,
+    so they stay serialized with the canvas's own GPU work.
+    """
+
+    def __init__(self, out_dir, start: View, end: View, frames: int,
+                 W: int, H: int, max_iter: int, escape_radius: float,
+                 lut: np.ndarray, keyframes: bool = True,
+                 aa_level: int = 1, distance: bool = False,
+                 workers: int | None = None):
+        self.out_dir = pathlib.Path(out_dir)
+        self._made_dir = not self.out_dir.exists()
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.plan, self.keys = plan_frames(start, end, frames, keyframes)
+        self.start, self.end, self.W, self.H = start, end, W, H
+        self._render_args = (max_iter, escape_radius, lut, aa_level, distance)
+        self._keyframes = keyframes
+        self.names = [f"frame_{n:05d}.png" for n in range(len(self.plan))]
+        self.done, self.total = 0, len(self.keys) + len(self.plan)
+        self.manifest: pathlib.Path | None = None
+        self.finished = self.cancelled = False
+        self._error: BaseException | None = None
+        # a keyframe's image is kept until the last frame derived from it
+        # is written; those frames are queued as soon as it is rendered
+        self._key_images: dict[int, np.ndarray] = {}
+        self._key_frames = [[n for n, f in enumerate(self.plan) if f.key == j]
+                            for j in range(len(self.keys))]
+        self._key_left = [len(frames) for frames in self._key_frames]
+        self._pool = ThreadPoolExecutor(max_workers=workers or min(8, os.cpu_count() or 1))
+        self._render_pool = _render_executor() if _cuda_ready() else self._pool
+        self._next_key = min(_KEYS_AHEAD, len(self.keys))
+        self._jobs = [self._render_pool.submit(self._key, j) for j in range(self._next_key)]
+        self._jobs += [self._render_pool.submit(self._direct, n)
+                       for n, f in enumerate(self.plan) if f.key is None]
+
+    def _key(self, j):
+        # keyframes are rendered at twice the size so every derived frame
+        # samples at least one keyframe pixel per output pixel
+        return j, _render_rgb(self.keys[j], 2 * self.W, 2 * self.H, *self._render_args)
+
+    def _direct(self, n):
+        _write_png(self.out_dir / self.names[n],
+                   _render_rgb(self.plan[n].view, self.W, self.H, *self._render_args))
+
+    def _derived(self, n):
+        frame = self.plan[n]
+        _write_png(self.out_dir / self.names[n],
+                   _resample(self._key_images[frame.key], self.keys[frame.key],
+                             frame.view, self.W, self.H))
+        return frame.key
+
+    def poll(self) -> bool:
+        """Collect finished frames; True once the export has ended.
+
+        Re-raises the first error a frame hit, after cleaning up.
+        """
+        if self.finished:
+            return True
+        for job in [j for j in self._jobs if j.done()]:
+            self._jobs.remove(job)
+            if job.cancelled():
+                continue
+            if job.exception() is not None:
+                if self._error is None:
+                    self._error = job.exception()
+                    self.cancel()
+                continue
+            result = job.result()
+            if isinstance(result, tuple):           # keyframe j rendered
+                j, rgb = result
+                self._key_images[j] = rgb
+                if not self.cancelled:
+                    self._jobs += [self._pool.submit(self._derived, n)
+                                   for n in self._key_frames[j]]
+                    if self._next_key < len(self.keys):
+                        self._jobs.append(self._render_pool.submit(self._key, self._next_key))
+                        self._next_key += 1
+            elif result is not None:                # a frame derived from it
+                self._key_left[result] -= 1
+                if not self._key_left[result]:
+                    del self._key_images[result]
+            self.done += 1
+        if self._jobs:
+            return False
+        if self.cancelled:
+            self._finish()
+            self._remove_outputs()
+            if self._error is not None:
+                raise self._error
+            return True
+        self.manifest = self._write_manifest()
+        self._finish()
+        return True
+
+    def wait(self, timeout: float | None = None):
+        """Block until a frame finishes or `timeout` seconds pass."""
+        if self._jobs:
+            wait(self._jobs, timeout, return_when=FIRST_COMPLETED)
+
+    def cancel(self):
+        """Stop queued frames; `poll` cleans up once running ones finish."""
+        self.cancelled = True
+        for job in self._jobs:
+            job.cancel()
+
+    def _finish(self):
+        self.finished = True
+        self._key_images.clear()
+        self._pool.shutdown(wait=False)
+
+    def _remove_outputs(self):
+        for name in self.names:
+            (self.out_dir / name).unlink(missing_ok=True)
+        if self._made_dir:
+            try:
+                self.out_dir.rmdir()
+            except OSError:
+                pass        # something else was put there
+
+    def _write_manifest(self) -> pathlib.Path:
+        max_iter, escape_radius = self._render_args[:2]
+        manifest = {
+            "width": self.W,
+            "height": self.H,
+            "max_iter": max_iter,
+            "escape_radius": escape_radius,
+            "keyframe_reuse": bool(self._keyframes),
+            "start": self.start._asdict(),
+            "end": self.end._asdict(),
+            "keyframes": [k._asdict() for k in self.keys],
+            "frames": [
+                {"file": self.names[n], "t": f.t, "keyframe": f.key, **f.view._asdict()}
+                for n, f in enumerate(self.plan)
+            ],
+        }
+        path = self.out_dir / MANIFEST_NAME
+        with open(path, "w", encoding="utf8") as fp:
+            json.dump(manifest, fp, indent=4)
+        return path
+
+
+def export_zoom_sequence(out_dir, start: View, end: View, frames: int,
+                         W: int, H: int, max_iter: int, escape_radius: float,
+                         lut: np.ndarray, keyframes: bool = True,
+                         aa_level: int = 1, distance: bool = False,
+                         workers: int | None = None,
+                         progress=None, cancelled=None) -> pathlib.Path | None:
+    """Render `frames` frames from `start` to `end` into `out_dir`.
+
+    Writes ``frame_00000.png`` ... and a manifest, returning the manifest
+    path, or None if `cancelled()` returned True (the frames written so far
+    are removed). `progress(done, total)` is called from the calling thread
+    as frames complete. The blocking form of `ZoomExport`.
+    """
+    job = ZoomExport(out_dir, start, end, frames, W, H, max_iter, escape_radius,
+                     lut, keyframes, aa_level, distance, workers)
+    while not job.poll():
+        if cancelled is not None and not job.cancelled and cancelled():
+            job.cancel()
+        job.wait(0.1)
+        if progress is not None:
+            progress(job.done, job.total)
+    return job.manifest
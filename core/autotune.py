@@ -0,0 +1,76 @@
+import json
+import sys
+
+# the block parser lives with the prefs, which validate cuda_block with it
+from .prefs import APP_NAME, CONFIG_DIR, format_block, parse_block
+
+# (rows, cols) thread-block shapes tried by the autotuner; the first entry is
+# the historical hard-coded geometry and the fallback when tuning is skipped.
+DEFAULT_BLOCK = (16, 16)
+CANDIDATE_BLOCKS = (
+    (16, 16),
+    (8, 32),
+    (32, 8),
+    (8, 16),
+    (16, 32),
+    (32, 32),
+)
+AUTO = "Auto"
+CACHE_FILE = CONFIG_DIR / "cuda_launch.json"
+
+
+def _warn(msg: str):
+    print(f"[{APP_NAME} autotune] {msg}", file=sys.stderr)
+
+
+def select_block_shape(time_fn, candidates=CANDIDATE_BLOCKS,
+                       repeats: int = 3) -> tuple[int, int]:
+    """Return the candidate with the lowest best-of-`repeats` time.
+
+    `time_fn(block)` runs one benchmark launch and returns its duration in
+    seconds. Candidates whose launch raises are skipped.
+    """
+    best_block, best_time = None, None
+    for block in candidates:
+        try:
+            elapsed = min(time_fn(block) for _ in range(max(1, repeats)))
+        except Exception as exc:
+            _warn(f"Block {format_block(block)} failed ({exc}); skipping.")
+            continue
+        if best_time is None or elapsed < best_time:
+            best_block, best_time = block, elapsed
+    return best_block or DEFAULT_BLOCK
+
+
+def _load_cache() -> dict:
+    try:
+        with open(CACHE_FILE, "r", encoding="utf8") as fp:
+            data = json.load(fp)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def load_cached_block(device_name: str) -> tuple[int, int] | None:
+    return parse_block(_load_cache().get(device_name))
+
+
+def store_block(device_name: str, block: tuple[int, int]):
+    cache = _load_cache()
+    cache[device_name] = format_block(block)
+    try:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        with open(CACHE_FILE, "w", encoding="utf8") as fp:
+            json.dump(cache, fp, indent=4)
+    except OSError as exc:
+        _warn(f"Could not save launch cache ({exc}).")
+
+
+def block_for_device(device_name: str, time_fn) -> tuple[int, int]:
+    """Return the cached winner for `device_name`, tuning it on first use."""
+    cached = load_cached_block(device_name)
+    if cached is not None:
+        return cached
+    block = select_block_shape(time_fn)
+    store_block(device_name, block)
+    return block
@@ -0,0 +1,217 @@
+"""CUDA kernels. Importing this module imports numba.cuda.
+
+`core.render` imports it lazily (see ``_load_cuda``) so that starting the
+GUI does not pay for numba/CUDA initialization; an ImportError here means
+no CUDA backend.
+"""
+import importlib
+import importlib.abc
+import importlib.util
+import math
+import os
+import pathlib
+import sys
+
+import numpy as np
+
+class _NumbaCudaFinder(importlib.abc.MetaPathFinder):
+    """Redirect `numba.cuda.*` imports to `numba_cuda/numba/cuda/*` when available."""
+
+    def __init__(self):
+        self.initialized = None
+
+    def ensure_initialized(self) -> bool:
+        if self.initialized is not None:
+            return self.initialized
+
+        numba_spec = importlib.util.find_spec("numba")
+        numba_cuda_spec = importlib.util.find_spec("numba_cuda")
+        if numba_spec is None or numba_cuda_spec is None:
+            self.initialized = False
+            return False
+
+        numba_locs = numba_spec.submodule_search_locations
+        numba_cuda_locs = numba_cuda_spec.submodule_search_locations
+        if not numba_locs or len(numba_locs) != 1:
+            self.initialized = False
+            return False
+        if not numba_cuda_locs or len(numba_cuda_locs) != 1:
+            self.initialized = False
+            return False
+
+        self.numba_path = str(pathlib.Path(numba_locs[0]))
+        self.numba_cuda_path = str(pathlib.Path(numba_cuda_locs[0]) / "numba")
+        self.initialized = True
+        return True
+
+    def find_spec(self, name, path, target=None):
+        if "numba.cuda" not in name or path is None:
+            return None
+        if not self.ensure_initialized():
+            return None
+
+        if any(self.numba_cuda_path in p for p in path):
+            return None
+
+        redirected = [p.replace(self.numba_path, self.numba_cuda_path) for p in path]
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(name, redirected, target)
+            if spec is not None:
+                return spec
+        return None
+
+
+if not any(isinstance(f, _NumbaCudaFinder) for f in sys.meta_path):
+    sys.meta_path.insert(0, _NumbaCudaFinder())
+
+# Prefer NVIDIA's CUDA Python bindings only when the legacy entrypoint
+# (`cuda.cuda`) exists; otherwise keep numba's default binding path.
+_requested_nvidia_binding = importlib.util.find_spec("cuda.cuda") is not None
+if _requested_nvidia_binding:
+    os.environ.setdefault("NUMBA_CUDA_USE_NVIDIA_BINDING", "1")
+
+try:
+    from numba import cuda
+    _CUDA_IMPORT_ERROR = None
+except Exception as first_exc:
+    cuda = None
+    _CUDA_IMPORT_ERROR = str(first_exc)
+    if _requested_nvidia_binding:
+        os.environ.pop("NUMBA_CUDA_USE_NVIDIA_BINDING", None)
+        try:
+            from numba import cuda
+            _CUDA_IMPORT_ERROR = None
+        except Exception as second_exc:
+            cuda = None
+            _CUDA_IMPORT_ERROR = f"{first_exc}; fallback import failed: {second_exc}"
+
+if cuda is None:
+    raise ImportError(_CUDA_IMPORT_ERROR)
+
+
+@cuda.jit(cache=True)
+def mandelbrot_kernel(xmin,xmax,ymin,ymax,
+                      img, max_iter, escape2, skip0, skip1, row0, frame_h):
+    h,w = img.shape
+    row,col = cuda.grid(2)
+    if row>=h or col>=w: return
+    # rows [skip0, skip1) are filled by mirroring (see core.symmetry)
+    if row>=skip0 and row<skip1: return
+    # img holds rows row0.. of a frame_h-row frame spanning ymin..ymax, so a
+    # band lands on exactly the pixel grid of the whole frame
+    x0 = np.float64(xmin) + (np.float64(xmax) - xmin) * col / w
+    y0 = np.float64(ymin) + (np.float64(ymax) - ymin) * (row + row0) / frame_h
+    x = y = np.float64(0.0)
+    it = 0
+    while x*x+y*y<=escape2 and it<max_iter:
+        x, y = x*x - y*y + x0, 2.0*x*y + y0
+        it += 1
+    if it < max_iter:
+        log_zn  = math.log(x*x + y*y) / 2.0
+        nu      = math.log(log_zn / math.log(2.0)) / math.log(2.0)
+        it = it + 1 - nu
+    img[row,col] = it
+
+@cuda.jit(cache=True)
+def mandelbrot_kernel_f32(xmin,xmax,ymin,ymax,
+                          img, max_iter, escape2, skip0, skip1, row0, frame_h):
+    h,w = img.shape
+    row,col = cuda.grid(2)
+    if row>=h or col>=w: return
+    if row>=skip0 and row<skip1: return
+    # Pixel coordinates are still derived in float64, only the orbit
+    # itself runs in single precision.
+    x0 = np.float32(xmin + (xmax - xmin) * col / w)
+    y0 = np.float32(ymin + (ymax - ymin) * (row + row0) / frame_h)
+    esc = np.float32(escape2)
+    two = np.float32(2.0)
+    log2 = np.float32(math.log(2.0))
+    x = y = np.float32(0.0)
+    it = 0
+    while x*x+y*y<=esc and it<max_iter:
+        x, y = x*x - y*y + x0, two*x*y + y0
+        it += 1
+    if it < max_iter:
+        log_zn  = math.log(x*x + y*y) / two
+        nu      = math.log(log_zn / log2) / log2
+        img[row,col] = it + 1 - nu
+    else:
+        img[row,col] = it
+
+@cuda.jit(cache=True)
+def mandelbrot_de_kernel(xmin,xmax,ymin,ymax,
+                         img, dist, max_iter, escape2, skip0, skip1):
+    h,w = img.shape
+    row,col = cuda.grid(2)
+    if row>=h or col>=w: return
+    if row>=skip0 and row<skip1: return
+    x0 = np.float64(xmin) + (np.float64(xmax) - xmin) * col / w
+    y0 = np.float64(ymin) + (np.float64(ymax) - ymin) * row / h
+    x = y = np.float64(0.0)
+    dx = dy = np.float64(0.0)
+    it = 0
+    while x*x+y*y<=escape2 and it<max_iter:
+        # dz/dc of z -> z*z + c is 2*z*dz + 1
+        dx, dy = 2.0*(x*dx - y*dy) + 1.0, 2.0*(x*dy + y*dx)
+        x, y = x*x - y*y + x0, 2.0*x*y + y0
+        it += 1
+    if it < max_iter:
+        mag2    = x*x + y*y
+        log_zn  = math.log(mag2) / 2.0
+        nu      = math.log(log_zn / math.log(2.0)) / math.log(2.0)
+        img[row,col] = it + 1 - nu
+        dist[row,col] = math.sqrt(mag2) * math.log(mag2) / math.sqrt(dx*dx + dy*dy)
+    else:
+        img[row,col] = it
+        dist[row,col] = 0.0
+
+@cuda.jit(cache=True)
+def mandelbrot_state_kernel(xmin,xmax,ymin,ymax,
+                            img, zr, zi, max_iter, escape2, skip0, skip1):
+    # mandelbrot_kernel that also keeps the final z, so unescaped
+    # pixels can later be resumed by mandelbrot_resume_kernel
+    h,w = img.shape
+    row,col = cuda.grid(2)
+    if row>=h or col>=w: return
+    if row>=skip0 and row<skip1: return
+    x0 = np.float64(xmin) + (np.float64(xmax) - xmin) * col / w
+    y0 = np.float64(ymin) + (np.float64(ymax) - ymin) * row / h
+    x = y = np.float64(0.0)
+    it = 0
+    while x*x+y*y<=escape2 and it<max_iter:
+        x, y = x*x - y*y + x0, 2.0*x*y + y0
+        it += 1
+    if it < max_iter:
+        log_zn  = math.log(x*x + y*y) / 2.0
+        nu      = math.log(log_zn / math.log(2.0)) / math.log(2.0)
+        img[row,col] = it + 1 - nu
+    else:
+        img[row,col] = it
+    zr[row,col] = x
+    zi[row,col] = y
+
+@cuda.jit(cache=True)
+def mandelbrot_resume_kernel(cr, ci, zr, zi, start, max_iter, escape2, out):
+    i = cuda.grid(1)
+    if i >= out.shape[0]: return
+    x0 = cr[i]
+    y0 = ci[i]
+    x = zr[i]
+    y = zi[i]
+    it = start
+    while x*x+y*y<=escape2 and it<max_iter:
+        x, y = x*x - y*y + x0, 2.0*x*y + y0
+        it += 1
+    if it < max_iter:
+        log_zn  = math.log(x*x + y*y) / 2.0
+        nu      = math.log(log_zn / math.log(2.0)) / math.log(2.0)
+        out[i] = it + 1 - nu
+    else:
+        out[i] = it
+    zr[i] = x
+    zi[i] = y
@@ -0,0 +1,107 @@
+"""On-disk cache of the CUDA capability probe.
+
+Probing CUDA means importing numba.cuda and creating a context, which costs
+seconds even when it ends in failure. The outcome is stored in
+``CONFIG_DIR/cuda_probe.json`` together with the driver and library
+versions it was measured under; a launch with the same versions reuses it
+instead of importing numba.cuda just to fail again. A failure with a driver
+present may be transient (a busy or resetting device), so it is only
+trusted for `FAILURE_TTL_S` seconds.
+"""
+import ctypes
+import json
+import os
+import sys
+import time
+from importlib import metadata
+from typing import NamedTuple
+
+from .prefs import APP_NAME, CONFIG_DIR
+
+CACHE_FILE = CONFIG_DIR / "cuda_probe.json"
+FAILURE_TTL_S = 3600.0
+# Environment variables that change what numba.cuda finds.
+_ENV_KEYS = ("CUDA_VISIBLE_DEVICES", "NUMBA_ENABLE_CUDASIM", "NUMBA_DISABLE_CUDA",
+             "CUDA_HOME", "CUDA_PATH")
+
+
+class ProbeResult(NamedTuple):
+    available: bool
+    device: str | None = None
+    compute_capability: tuple[int, int] | None = None
+    reason: str | None = None
+
+
+def _warn(msg: str):
+    print(f"[{APP_NAME} cudaprobe] {msg}", file=sys.stderr)
+
+
+def driver_version() -> int | None:
+    """CUDA driver API version (e.g. 12040), or None without a driver.
+
+    Asks libcuda directly through ctypes, so no numba import is needed.
+    """
+    if sys.platform == "win32":
+        names, loader = ("nvcuda.dll",), getattr(ctypes, "WinDLL", ctypes.CDLL)
+    elif sys.platform == "darwin":
+        names, loader = ("libcuda.dylib",), ctypes.CDLL
+    else:
+        names, loader = ("libcuda.so.1", "libcuda.so"), ctypes.CDLL
+    for name in names:
+        try:
+            lib = loader(name)
+        except OSError:
+            continue
+        version = ctypes.c_int(0)
+        try:
+            if lib.cuDriverGetVersion(ctypes.byref(version)) == 0:
+                return version.value
+        except AttributeError:
+            pass
+    return None
+
+
+def _package_version(name: str) -> str | None:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def environment_key() -> dict:
+    """Everything a cached probe result depends on."""
+    return {
+        "driver": driver_version(),
+        "numba": _package_version("numba"),
+        "numba-cuda": _package_version("numba-cuda"),
+        "python": sys.version.split()[0],
+        "env": {k: os.environ[k] for k in _ENV_KEYS if k in os.environ},
+    }
+
+
+def load_cached(key: dict) -> ProbeResult | None:
+    """The stored result if it was measured under `key`, else None."""
+    try:
+        with open(CACHE_FILE, "r", encoding="utf8") as fp:
+            data = json.load(fp)
+        if data.get("key") != key:
+            return None
+        # without a driver a failure cannot heal until the key changes
+        age = time.time() - float(data.get("stored_at", 0.0))
+        if not data["available"] and key.get("driver") is not None and age >= FAILURE_TTL_S:
+            return None
+        cc = data.get("compute_capability")
+        return ProbeResult(bool(data["available"]), data.get("device"),
+                           tuple(cc) if cc else None, data.get("reason"))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def store(key: dict, result: ProbeResult):
+    data = {"key": key, **result._asdict(), "stored_at": time.time()}
+    try:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        with open(CACHE_FILE, "w", encoding="utf8") as fp:
+            json.dump(data, fp, indent=4)
+    except OSError as exc:
+        _warn(f"Could not save probe cache ({exc}).")
@@ -0,0 +1,23 @@
+"""Scalar double-double helpers for viewport bookkeeping.
+
+A double-double stores a value as an unevaluated sum ``hi + lo`` of two
+float64s, giving roughly 32 significant digits. The canvas keeps its centre
+in this form so it can be navigated past the ~1e-16 relative resolution of a
+single float64; the heavy lifting lives in the JIT renderer (`ddrender`).
+"""
+
+
+def two_sum(a: float, b: float) -> tuple[float, float]:
+    """Return ``(s, err)`` with ``s = fl(a + b)`` and ``a + b == s + err``."""
+    s = a + b
+    bb = s - a
+    err = (a - (s - bb)) + (b - bb)
+    return s, err
+
+
+def dd_add_float(hi: float, lo: float, b: float) -> tuple[float, float]:
+    """Add the float64 `b` to the double-double ``hi + lo``."""
+    s, err = two_sum(hi, b)
+    err += lo
+    hi = s + err
+    return hi, err - (hi - s)
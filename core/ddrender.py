@@ -0,0 +1,201 @@
+"""Double-double (two float64) escape-time renderer, JIT-compiled with numba.
+
+Covers the zoom band where float64 can no longer tell neighbouring pixels
+apart (roughly 1e13 - 1e30) at a small multiple of the float64 cost.
+Importing this module requires numba; `core.render` imports it lazily.
+"""
+import math
+
+import numpy as np
+from numba import float64, int64, njit, prange
+
+from .symmetry import apply_mirror, mirror_plan_for
+
+_SPLITTER = 134217729.0  # 2**27 + 1, splits a float64 into two 26-bit halves
+
+
+@njit(cache=True)
+def _two_sum(a, b):
+    s = a + b
+    bb = s - a
+    return s, (a - (s - bb)) + (b - bb)
+
+
+@njit(cache=True)
+def _quick_two_sum(a, b):
+    s = a + b
+    return s, b - (s - a)
+
+
+@njit(cache=True)
+def _two_prod(a, b):
+    p = a * b
+    t = _SPLITTER * a
+    ahi = t - (t - a)
+    alo = a - ahi
+    t = _SPLITTER * b
+    bhi = t - (t - b)
+    blo = b - bhi
+    return p, ((ahi * bhi - p) + ahi * blo + alo * bhi) + alo * blo
+
+
+@njit(cache=True)
+def _dd_add(ah, al, bh, bl):
+    s, e = _two_sum(ah, bh)
+    t, f = _two_sum(al, bl)
+    e += t
+    s, e = _quick_two_sum(s, e)
+    e += f
+    return _quick_two_sum(s, e)
+
+
+@njit(cache=True)
+def _dd_mul(ah, al, bh, bl):
+    p, e = _two_prod(ah, bh)
+    e += ah * bl + al * bh
+    return _quick_two_sum(p, e)
+
+
+@njit(cache=True)
+def _dd_escape(crh, crl, cih, cil, max_iter, escape2):
+    """Iterate one orbit; return the smooth iteration count (max_iter inside)."""
+    zrh = zrl = zih = zil = 0.0
+    for i in range(max_iter):
+        r2h, r2l = _dd_mul(zrh, zrl, zrh, zrl)
+        i2h, i2l = _dd_mul(zih, zil, zih, zil)
+        mag2 = r2h + i2h
+        if mag2 > escape2:
+            log_zn = math.log(mag2) / 2.0
+            nu = math.log(log_zn / math.log(2.0)) / math.log(2.0)
+            return i + 1 - nu
+        rih, ril = _dd_mul(zrh, zrl, zih, zil)
+        th, tl = _dd_add(r2h, r2l, -i2h, -i2l)
+        zrh, zrl = _dd_add(th, tl, crh, crl)
+        zih, zil = _dd_add(2.0 * rih, 2.0 * ril, cih, cil)
+    return float(max_iter)
+
+
+@njit(cache=True)
+def _dd_escape_de(crh, crl, cih, cil, max_iter, escape2):
+    """Like `_dd_escape`, also returning the exterior distance estimate.
+
+    The derivative only needs float64: its magnitude matters, not digits
+    beyond the 16th, so it is tracked on the high parts of z.
+    """
+    zrh = zrl = zih = zil = 0.0
+    dzr = dzi = 0.0
+    for i in range(max_iter):
+        r2h, r2l = _dd_mul(zrh, zrl, zrh, zrl)
+        i2h, i2l = _dd_mul(zih, zil, zih, zil)
+        mag2 = r2h + i2h
+        if mag2 > escape2:
+            log_zn = math.log(mag2) / 2.0
+            nu = math.log(log_zn / math.log(2.0)) / math.log(2.0)
+            dist = math.sqrt(mag2) * math.log(mag2) / math.sqrt(dzr * dzr + dzi * dzi)
+            return i + 1 - nu, dist
+        dzr, dzi = 2.0 * (zrh * dzr - zih * dzi) + 1.0, 2.0 * (zrh * dzi + zih * dzr)
+        rih, ril = _dd_mul(zrh, zrl, zih, zil)
+        th, tl = _dd_add(r2h, r2l, -i2h, -i2l)
+        zrh, zrl = _dd_add(th, tl, crh, crl)
+        zih, zil = _dd_add(2.0 * rih, 2.0 * ril, cih, cil)
+    return float(max_iter), 0.0
+
+
+@njit(parallel=True, cache=True)
+def _dd_kernel(cxh, cxl, cyh, cyl, dx, dy, max_iter, escape2, out, skip0, skip1):
+    H, W = out.shape
+    for row in prange(H):
+        if row >= skip0 and row < skip1:
+            continue            # mirrored afterwards, see dd_render
+        # Offsets from the centre are small, so float64 holds them exactly
+        # enough; only the sum with the centre needs the extra precision.
+        cih, cil = _dd_add(cyh, cyl, (row - H * 0.5) * dy, 0.0)
+        for col in range(W):
+            crh, crl = _dd_add(cxh, cxl, (col - W * 0.5) * dx, 0.0)
+            out[row, col] = _dd_escape(crh, crl, cih, cil, max_iter, escape2)
+
+
+@njit(parallel=True, cache=True)
+def _dd_kernel_de(cxh, cxl, cyh, cyl, dx, dy, max_iter, escape2, out, dist,
+                  skip0, skip1):
+    H, W = out.shape
+    for row in prange(H):
+        if row >= skip0 and row < skip1:
+            continue
+        cih, cil = _dd_add(cyh, cyl, (row - H * 0.5) * dy, 0.0)
+        for col in range(W):
+            crh, crl = _dd_add(cxh, cxl, (col - W * 0.5) * dx, 0.0)
+            out[row, col], dist[row, col] = _dd_escape_de(
+                crh, crl, cih, cil, max_iter, escape2)
+
+
+@njit(parallel=True, cache=True)
+def _dd_points_kernel(cxh, cxl, cyh, cyl, ox, oy, max_iter, escape2,
+                      out, dist, distance):
+    for k in prange(out.shape[0]):
+        crh, crl = _dd_add(cxh, cxl, ox[k], 0.0)
+        cih, cil = _dd_add(cyh, cyl, oy[k], 0.0)
+        if distance:
+            out[k], dist[k] = _dd_escape_de(crh, crl, cih, cil, max_iter, escape2)
+        else:
+            out[k] = _dd_escape(crh, crl, cih, cil, max_iter, escape2)
+
+
+def dd_render(cx, cx_lo, cy, cy_lo, span_x, span_y,
+              W, H, max_iter: int, escape_radius: float,
+              distance: bool = False):
+    """Render a W x H frame centred on the double-double ``(cx, cy)``.
+
+    Uses the same pixel grid as the CUDA kernel (``xmin + span * col / W``).
+    With ``distance=True`` returns ``(iters, dist)`` like `cuda_render`.
+    """
+    out = np.empty((H, W), dtype=np.float32)
+    dy = span_y / H
+    args = (float(cx), float(cx_lo), float(cy), float(cy_lo),
+            span_x / W, dy,
+            int(max_iter), float(escape_radius * escape_radius))
+    # rows r and k - r are mirror images when the centre sits a whole number
+    # of half-rows from the real axis
+    plan = None
+    if abs(cy) < span_y / 2:
+        plan = mirror_plan_for(H - 2.0 * (cy / dy + cy_lo / dy), H)
+    skip0, skip1 = (plan[1], plan[2]) if plan is not None else (0, 0)
+    if distance:
+        dist = np.empty((H, W), dtype=np.float32)
+        _dd_kernel_de(*args, out, dist, skip0, skip1)
+        if plan is not None:
+            apply_mirror(out, plan)
+            apply_mirror(dist, plan)
+        return out, dist
+    _dd_kernel(*args, out, skip0, skip1)
+    return out if plan is None else apply_mirror(out, plan)
+
+
+def dd_render_points(cx, cx_lo, cy, cy_lo, ox, oy,
+                     max_iter: int, escape_radius: float,
+                     distance: bool = False):
+    """Render samples at float64 offsets `ox`, `oy` from the centre."""
+    shape = np.shape(ox)
+    ox = np.ascontiguousarray(ox, dtype=np.float64).ravel()
+    oy = np.ascontiguousarray(oy, dtype=np.float64).ravel()
+    out = np.empty(ox.shape[0], dtype=np.float32)
+    dist = np.zeros(ox.shape[0], dtype=np.float32)
+    _dd_points_kernel(float(cx), float(cx_lo), float(cy), float(cy_lo),
+                      ox, oy, int(max_iter), float(escape_radius * escape_radius),
+                      out, dist, bool(distance))
+    if distance:
+        return out.reshape(shape), dist.reshape(shape)
+    return out.reshape(shape)
+
+
+def warm_up():
+    """Compile the escape loops, or load them from the on-disk cache.
+
+    Runs on a background thread at startup. The ``parallel=True`` kernels
+    are left for the first render: compiling them starts numba's thread
+    pool, and a TBB pool started off the main thread hangs interpreter
+    exit. They are cheap on top of the warmed loops and cached on disk.
+    """
+    sig = (float64,) * 4 + (int64, float64)
+    _dd_escape.compile(sig)
+    _dd_escape_de.compile(sig)
@@ -0,0 +1,133 @@
+"""Streaming exports that never hold a full-resolution frame in memory."""
+import pathlib
+import struct
+import zlib
+
+import numpy as np
+
+from .antialias import supersample
+from .ddmath import dd_add_float
+from .gradient import colorize, shade_by_distance
+from .render import precision_for_view, render_view
+
+DEFAULT_EXPORT_BAND_ROWS = 256
+
+
+class ExportCancelled(Exception):
+    """Raised inside an export when the caller's cancel check fires."""
+
+
+class PngStreamWriter:
+    """Write an 8-bit RGB PNG incrementally, a band of rows at a time."""
+
+    def __init__(self, path, width: int, height: int, level: int = 6):
+        self.path = pathlib.Path(path)
+        self.width, self.height = int(width), int(height)
+        self.rows_written = 0
+        self._z = zlib.compressobj(level)
+        self._fp = open(self.path, "wb")
+        self._fp.write(b"\x89PNG\r\n\x1a\n")
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", self.width, self.height,
+                                         8, 2, 0, 0, 0))
+
+    def _chunk(self, kind: bytes, data: bytes):
+        self._fp.write(struct.pack(">I", len(data)))
+        self._fp.write(kind)
+        self._fp.write(data)
+        self._fp.write(struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    def write_rows(self, rgb: np.ndarray):
+        """Append an (n, width, 3) uint8 band below the rows written so far."""
+        n = rgb.shape[0]
+        if rgb.shape[1:] != (self.width, 3):
+            raise ValueError("Band width does not match the image.")
+        if self.rows_written + n > self.height:
+            raise ValueError("More rows than the image height.")
+        raw = np.zeros((n, self.width * 3 + 1), dtype=np.uint8)  # filter 0
+        raw[:, 1:] = rgb.reshape(n, -1)
+        data = self._z.compress(raw.tobytes())
+        if data:
+            self._chunk(b"IDAT", data)
+        self.rows_written += n
+
+    def close(self):
+        if self._fp.closed:
+            return
+        try:
+            if self.rows_written != self.height:
+                raise ValueError(
+                    f"PNG incomplete: {self.rows_written} of {self.height} rows written."
+                )
+            self._chunk(b"IDAT", self._z.flush())
+            self._chunk(b"IEND", b"")
+        finally:
+            self._fp.close()
+
+    def abort(self):
+        """Close and delete a partially written file."""
+        self._fp.close()
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def render_band(cx, cy, span_x, span_y, W, H, r0: int, rows: int,
+                max_iter: int, escape_radius: float, lut: np.ndarray,
+                cx_lo: float = 0.0, cy_lo: float = 0.0,
+                aa_level: int = 1, distance: bool = False) -> np.ndarray:
+    """Colour rows ``r0 .. r0 + rows`` of the W x H frame as RGB uint8."""
+    # the frame's tier, not the last render's: bands may render concurrently
+    precision = precision_for_view(cx, cy, span_x, span_y, W, H, max_iter)
+    dy = span_y / H
+    bcy, bcy_lo = dd_add_float(cy, cy_lo, (r0 + rows / 2 - H / 2) * dy)
+    result = render_view(cx, bcy, span_x, rows * dy, W, rows,
+                         max_iter, escape_radius, cx_lo, bcy_lo,
+                         distance=distance)
+    iters, dist = result if distance else (result, None)
+    colors = colorize(iters, max_iter, lut)
+    if dist is not None:
+        colors = shade_by_distance(colors, iters, dist, max_iter, span_x / W)
+    if aa_level > 1:
+        colors, _ = supersample(colors, cx, bcy, span_x, rows * dy,
+                                max_iter, escape_radius, lut,
+                                samples=aa_level, cx_lo=cx_lo, cy_lo=bcy_lo,
+                                precision=precision,
+                                dist=dist)
+    return colors
+
+
+def export_poster(path, cx, cy, span_x, span_y, W, H,
+                  max_iter: int, escape_radius: float, lut: np.ndarray,
+                  cx_lo: float = 0.0, cy_lo: float = 0.0,
+                  aa_level: int = 1, distance: bool = False,
+                  band_rows: int = DEFAULT_EXPORT_BAND_ROWS,
+                  progress=None, cancelled=None) -> bool:
+    """Render a W x H PNG band by band, streaming rows to `path`.
+
+    Peak memory is proportional to ``band_rows * W`` whatever the height.
+    `progress(rows_done, H)` is called after each band; if `cancelled()`
+    returns True the partial file is removed and False is returned.
+    """
+    band_rows = max(1, min(int(band_rows), H))
+    try:
+        with PngStreamWriter(path, W, H) as writer:
+            for r0 in range(0, H, band_rows):
+                if cancelled is not None and cancelled():
+                    raise ExportCancelled()
+                rows = min(band_rows, H - r0)
+                writer.write_rows(render_band(
+                    cx, cy, span_x, span_y, W, H, r0, rows,
+                    max_iter, escape_radius, lut, cx_lo, cy_lo,
+                    aa_level, distance))
+                if progress is not None:
+                    progress(r0 + rows, H)
+    except ExportCancelled:
+        return False
+    return True
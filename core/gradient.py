@@ -152,6 +152,25 @@ def gradient_to_lut(gradient: list, lut_size: int = 2048) -> np.ndarray:
     return lut
 
 
+def colorize(iters: np.ndarray, max_iter: int, lut: np.ndarray) -> np.ndarray:
+    """Map an iteration buffer onto `lut`, returning an (H, W, 3) uint8 image."""
+    norm = np.clip(iters.astype(np.float64), 0, max_iter)
+    idx = (norm * (len(lut) - 1)) / max_iter
+    return lut[idx.astype(np.int32)]
+
+
+def shade_by_distance(colors: np.ndarray, iters: np.ndarray, dist: np.ndarray,
+                      max_iter: int, pixel_size: float) -> np.ndarray:
+    """Darken exterior pixels that lie within ~2 pixels of the set boundary.
+
+    Filaments thinner than a pixel are missed by point sampling but still
+    show up in the distance estimate, so they stay visible at low budgets.
+    """
+    shade = np.clip(dist / (2.0 * pixel_size), 0.0, 1.0)
+    shade[iters >= max_iter] = 1.0
+    return (colors * shade[..., None]).astype(np.uint8)
+
+
 def save_preset_file(gradient: object, name: str) -> pathlib.Path:
     safe_name = validate_preset_name(name)
     safe_stops = normalize_gradient_stops(gradient)
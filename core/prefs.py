@@ -1,6 +1,7 @@
 ﻿import copy
 import json
 import math
+import os
 import pathlib
 import sys
 
@@ -18,6 +19,12 @@ DEFAULT_PREFS = dict(
     escape_radius=4.0,
     quality="High",
     default_save=str(pathlib.Path.home() / "Pictures"),
+    cuda_block="Auto",
+    render_mode="Iterations",
+    aa_level=1,
+    target_frame_ms=33,
+    interactive_reduce_iter=False,
+    idle_refine=True,
     gradient=[
         (0.0, "#000764"),
         (0.16, "#2068CB"),
@@ -27,7 +34,9 @@ DEFAULT_PREFS = dict(
     ],
 )
 
-_VALID_QUALITY = {"Low", "Medium", "High", "Ultra", "Custom"}
+_VALID_QUALITY = {"Low", "Medium", "High", "Ultra", "Custom", "Auto"}
+_VALID_RENDER_MODES = {"Iterations", "Distance"}
+_VALID_AA_LEVELS = {1, 4, 9, 16}
 _MIN_ITER = 64
 _MAX_ITER = 20000
 _MIN_ESCAPE_RADIUS = 2.0
@@ -37,6 +46,8 @@ _MAX_CUSTOM_MIN_ITER = 20000
 _MIN_CUSTOM_MULTIPLIER = 1.0
 _MAX_CUSTOM_MULTIPLIER = 500.0
 _MAX_GRADIENT_STOPS = 256
+_MAX_CUDA_BLOCK_THREADS = 1024
+_MAX_TARGET_FRAME_MS = 1000
 
 
 def _default_prefs_copy() -> dict:
@@ -48,7 +59,10 @@ def _warn(msg: str):
 
 
 def _resolve_config_dir() -> pathlib.Path:
+    # MANDELPY_CONFIG_DIR keeps tests and headless runs out of the user's own
+    override = os.environ.get(f"{APP_NAME.upper()}_CONFIG_DIR")
     for candidate in (
+        *((pathlib.Path(override),) if override else ()),
         _base_config_dir / APP_NAME,
         _fallback_config_dir,
         _workspace_config_dir,
@@ -67,6 +81,8 @@ def _resolve_config_dir() -> pathlib.Path:
 
 CONFIG_DIR = _resolve_config_dir()
 CONFIG_FILE = CONFIG_DIR / "prefs.json"
+# keys an opened session has overridden for this run: key -> (user, session)
+_SESSION_OVERRIDES: dict = {}
 
 
 def _clamp_int(value, default: int, minimum: int, maximum: int) -> int:
@@ -93,6 +109,52 @@ def _sanitize_quality(value) -> str:
     return DEFAULT_PREFS["quality"]
 
 
+def _sanitize_render_mode(value) -> str:
+    if isinstance(value, str) and value in _VALID_RENDER_MODES:
+        return value
+    return DEFAULT_PREFS["render_mode"]
+
+
+def _sanitize_aa_level(value) -> int:
+    try:
+        level = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_PREFS["aa_level"]
+    return level if level in _VALID_AA_LEVELS else DEFAULT_PREFS["aa_level"]
+
+
+def _sanitize_bool(value, default: bool) -> bool:
+    return value if isinstance(value, bool) else default
+
+
+def parse_block(value) -> tuple[int, int] | None:
+    """Parse "16x16" (or a 2-sequence) into a CUDA block shape, or return None."""
+    if isinstance(value, str):
+        parts = value.lower().replace(" ", "").split("x")
+    elif isinstance(value, (list, tuple)):
+        parts = list(value)
+    else:
+        return None
+    if len(parts) != 2:
+        return None
+    try:
+        rows, cols = int(parts[0]), int(parts[1])
+    except (TypeError, ValueError):
+        return None
+    if rows < 1 or cols < 1 or rows * cols > _MAX_CUDA_BLOCK_THREADS:
+        return None
+    return rows, cols
+
+
+def format_block(block: tuple[int, int]) -> str:
+    return f"{block[0]}x{block[1]}"
+
+
+def _sanitize_cuda_block(value) -> str:
+    block = parse_block(value) if isinstance(value, str) else None
+    return format_block(block) if block else DEFAULT_PREFS["cuda_block"]
+
+
 def _sanitize_default_save(value) -> str:
     default_path = pathlib.Path(DEFAULT_PREFS["default_save"]).expanduser()
     if not isinstance(value, str):
@@ -158,6 +220,21 @@ def _sanitize_prefs(raw_prefs: object) -> dict:
         "quality": _sanitize_quality(raw_prefs.get("quality")),
         "default_save": _sanitize_default_save(raw_prefs.get("default_save")),
         "gradient": _sanitize_gradient(raw_prefs.get("gradient")),
+        "cuda_block": _sanitize_cuda_block(raw_prefs.get("cuda_block")),
+        "render_mode": _sanitize_render_mode(raw_prefs.get("render_mode")),
+        "aa_level": _sanitize_aa_level(raw_prefs.get("aa_level")),
+        # 0 turns interactive resolution scaling off
+        "target_frame_ms": _clamp_int(
+            raw_prefs.get("target_frame_ms"),
+            defaults["target_frame_ms"],
+            0,
+            _MAX_TARGET_FRAME_MS,
+        ),
+        "interactive_reduce_iter": _sanitize_bool(
+            raw_prefs.get("interactive_reduce_iter"),
+            defaults["interactive_reduce_iter"],
+        ),
+        "idle_refine": _sanitize_bool(raw_prefs.get("idle_refine"), defaults["idle_refine"]),
         "custom_min_iter": _clamp_int(
             raw_prefs.get("custom_min_iter"),
             64,
@@ -189,10 +266,34 @@ def load_prefs() -> dict:
         return _sanitize_prefs(_default_prefs_copy())
 
 
+def _without_session(prefs: dict) -> dict:
+    """`prefs` with the user's own value for each key a session still holds."""
+    out = dict(prefs)
+    for key, (user, session) in list(_SESSION_OVERRIDES.items()):
+        if out.get(key) == session:
+            out[key] = user
+        else:
+            # changed since the session was opened: that value is the user's
+            del _SESSION_OVERRIDES[key]
+    return out
+
+
+def apply_session_prefs(values: dict):
+    """Use a session's settings for this run without saving them.
+
+    PREFS takes the values at once; `save_prefs` keeps writing the user's
+    own for as long as a key still holds the session's.
+    """
+    for key, value in values.items():
+        user = _SESSION_OVERRIDES.get(key, (PREFS[key], None))[0]
+        _SESSION_OVERRIDES[key] = (user, value)
+        PREFS[key] = value
+
+
 def save_prefs(prefs: dict):
     try:
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        sanitized = _sanitize_prefs(prefs)
+        sanitized = _sanitize_prefs(_without_session(prefs))
         with open(CONFIG_FILE, "w", encoding="utf8") as fp:
             json.dump(sanitized, fp, indent=4)
     except OSError as exc:
@@ -0,0 +1,79 @@
+"""Single-frame profiling: cProfile plus the frame's stage timings.
+
+`profile_call` runs one call under cProfile and writes two files to
+``CONFIG_DIR/profiles``: a ``.prof`` for snakeviz / pstats and a ``.txt``
+summary that users can paste into a bug report.
+"""
+import cProfile
+import datetime
+import io
+import pathlib
+import platform
+import pstats
+from typing import Callable, NamedTuple
+
+from .prefs import APP_NAME, CONFIG_DIR
+from .render import get_renderer_state
+from .stats import last_frame_stats
+
+PROFILE_DIR = CONFIG_DIR / "profiles"
+_TOP_FUNCTIONS = 40
+
+
+class ProfileReport(NamedTuple):
+    prof_path: pathlib.Path
+    text_path: pathlib.Path
+
+
+def _stage_lines() -> list[str]:
+    s = last_frame_stats()
+    if s is None:
+        return ["(no frame stats recorded)"]
+    lines = [
+        f"frame      {s.width}x{s.height}, dyn_iter {s.max_iter}",
+        f"backend    {s.backend} / {s.precision}" + (f" ({s.reason})" if s.reason else ""),
+        f"probe      {s.probe_ms:9.2f} ms",
+        f"render     {s.render_ms:9.2f} ms",
+        f"colour     {s.color_ms:9.2f} ms",
+        f"AA         {s.aa_ms:9.2f} ms",
+        f"QImage     {s.qimage_ms:9.2f} ms",
+        f"upload     {s.upload_ms:9.2f} ms",
+        f"total      {s.total_ms:9.2f} ms",
+        f"pixels     interior {s.interior}, exterior {s.exterior}, early-out {s.early_out}",
+        f"iterations {s.iterations}",
+    ]
+    return lines
+
+
+def profile_call(fn: Callable, *args, name: str = "frame", **kwargs) -> ProfileReport:
+    """Run ``fn(*args, **kwargs)`` under cProfile and write the report."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        fn(*args, **kwargs)
+    finally:
+        profiler.disable()
+
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    prof_path = PROFILE_DIR / f"{name}_{ts}.prof"
+    text_path = prof_path.with_suffix(".txt")
+    profiler.dump_stats(str(prof_path))
+
+    buf = io.StringIO()
+    stats = pstats.Stats(profiler, stream=buf)
+    stats.strip_dirs().sort_stats("cumulative").print_stats(_TOP_FUNCTIONS)
+    state = get_renderer_state()
+    header = [
+        f"{APP_NAME} frame profile — {ts}",
+        f"python {platform.python_version()} on {platform.platform()}",
+        f"renderer {state.backend} / {state.precision}",
+        "",
+        "── stage timings ──",
+        *_stage_lines(),
+        "",
+        f"── top {_TOP_FUNCTIONS} functions by cumulative time ──",
+    ]
+    with open(text_path, "w", encoding="utf8") as fp:
+        fp.write("\n".join(header) + "\n" + buf.getvalue())
+    return ProfileReport(prof_path, text_path)
@@ -0,0 +1,133 @@
+"""Raw iteration-buffer files: a float32 ``.npy`` plus a JSON sidecar.
+
+The ``.npy`` is written with the standard header so it can be opened with
+``np.load(path, mmap_mode="r")``; colouring a huge buffer then only pages
+in the rows currently being processed.
+"""
+import json
+import math
+import pathlib
+
+import numpy as np
+
+from .ddmath import dd_add_float
+from .export import PngStreamWriter
+from .gradient import colorize
+
+RAW_FORMAT = "mandelpy-raw"
+RAW_VERSION = 1
+_META_FLOATS = ("escape_radius", "cx", "cy", "cx_lo", "cy_lo", "span_x", "span_y")
+
+
+class RawFormatError(ValueError):
+    """Raised when a raw buffer or its metadata is missing or malformed."""
+
+
+def meta_path_for(path) -> pathlib.Path:
+    return pathlib.Path(path).with_suffix(".json")
+
+
+def save_raw(path, iters: np.ndarray, *, max_iter: int, escape_radius: float,
+             cx: float, cy: float, span_x: float, span_y: float,
+             cx_lo: float = 0.0, cy_lo: float = 0.0) -> pathlib.Path:
+    """Write `iters` to ``path`` (.npy) and its viewport to the sidecar."""
+    path = pathlib.Path(path).with_suffix(".npy")
+    H, W = iters.shape
+    np.save(path, np.ascontiguousarray(iters, dtype=np.float32))
+    meta = {
+        "format": RAW_FORMAT,
+        "version": RAW_VERSION,
+        "width": int(W),
+        "height": int(H),
+        "max_iter": int(max_iter),
+        "escape_radius": float(escape_radius),
+        "cx": float(cx),
+        "cy": float(cy),
+        "cx_lo": float(cx_lo),
+        "cy_lo": float(cy_lo),
+        "span_x": float(span_x),
+        "span_y": float(span_y),
+    }
+    with open(meta_path_for(path), "w", encoding="utf8") as fp:
+        json.dump(meta, fp, indent=4)
+    return path
+
+
+def _validate_meta(meta: object) -> dict:
+    if not isinstance(meta, dict) or meta.get("format") != RAW_FORMAT:
+        raise RawFormatError("Not a MandelPy raw metadata file.")
+    try:
+        clean = {
+            "width": int(meta["width"]),
+            "height": int(meta["height"]),
+            "max_iter": int(meta["max_iter"]),
+        }
+        for key in _META_FLOATS:
+            clean[key] = float(meta.get(key, 0.0))
+    except (KeyError, TypeError, ValueError) as exc:
+        raise RawFormatError(f"Raw metadata is incomplete ({exc}).") from exc
+    if clean["max_iter"] < 1 or not all(math.isfinite(clean[k]) for k in _META_FLOATS):
+        raise RawFormatError("Raw metadata contains invalid values.")
+    return clean
+
+
+def load_raw(path, mmap: bool = True) -> tuple[np.ndarray, dict]:
+    """Return ``(iters, meta)``; `iters` is a read-only memmap by default."""
+    path = pathlib.Path(path)
+    try:
+        with open(meta_path_for(path), "r", encoding="utf8") as fp:
+            meta = _validate_meta(json.load(fp))
+        iters = np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+    except (OSError, json.JSONDecodeError) as exc:
+        raise RawFormatError(f"Could not read raw buffer ({exc}).") from exc
+    if iters.dtype != np.float32 or iters.shape != (meta["height"], meta["width"]):
+        raise RawFormatError("Raw buffer does not match its metadata.")
+    return iters, meta
+
+
+def sample_raw(iters: np.ndarray, max_w: int, max_h: int) -> np.ndarray:
+    """A float32 copy of `iters` that fits in ``max_w x max_h`` pixels.
+
+    The aspect is kept and each output pixel takes its nearest sample, so a
+    memmapped buffer only pages in the rows that are shown.
+    """
+    H, W = iters.shape
+    f = min(1.0, max_w / W, max_h / H)
+    w, h = max(1, round(W * f)), max(1, round(H * f))
+    if (w, h) == (W, H):
+        return np.array(iters, dtype=np.float32)
+    rows = ((np.arange(h) + 0.5) * (H / h)).astype(np.intp)
+    cols = ((np.arange(w) + 0.5) * (W / w)).astype(np.intp)
+    return np.ascontiguousarray(iters[rows][:, cols], dtype=np.float32)
+
+
+def crop_raw(iters: np.ndarray, meta: dict, max_w: int, max_h: int) -> tuple[np.ndarray, dict]:
+    """Centre crop of `iters` with the aspect of ``max_w x max_h``, sampled to fit.
+
+    Returns the sample and a copy of `meta` whose centre and spans describe
+    the crop, so it fills a ``max_w x max_h`` widget without stretching.
+    """
+    H, W = iters.shape
+    w = min(W, max(1, round(H * max_w / max_h)))
+    h = min(H, max(1, round(W * max_h / max_w)))
+    x0, y0 = (W - w) // 2, (H - h) // 2
+    dx, dy = meta["span_x"] / W, meta["span_y"] / H
+    cx, cx_lo = dd_add_float(meta["cx"], meta["cx_lo"], (x0 + w / 2 - W / 2) * dx)
+    cy, cy_lo = dd_add_float(meta["cy"], meta["cy_lo"], (y0 + h / 2 - H / 2) * dy)
+    meta = {**meta, "cx": cx, "cx_lo": cx_lo, "cy": cy, "cy_lo": cy_lo,
+            "span_x": w * dx, "span_y": h * dy}
+    return sample_raw(iters[y0:y0 + h, x0:x0 + w], max_w, max_h), meta
+
+
+def colorize_raw_to_png(raw_path, png_path, lut: np.ndarray,
+                        band_rows: int = 1024, progress=None) -> pathlib.Path:
+    """Colour a raw buffer into a PNG without rendering, band by band."""
+    iters, meta = load_raw(raw_path, mmap=True)
+    H, W = iters.shape
+    with PngStreamWriter(png_path, W, H) as writer:
+        for r0 in range(0, H, band_rows):
+            band = np.asarray(iters[r0:r0 + band_rows])
+            writer.write_rows(colorize(band, meta["max_iter"], lut))
+            if progress is not None:
+                progress(min(r0 + band_rows, H), H)
+    return pathlib.Path(png_path)
@@ -0,0 +1,208 @@
+"""Idle-time refinement of a finished frame, a small step at a time.
+
+A `Refinement` takes the frame on screen towards export quality in passes.
+Iteration passes double the cap up to the target, iterating only the pixels
+that have not escaped (continuing their orbits when an `EscapeState` is at
+hand). AA passes then add jittered sub-samples at each AA level up to the
+target: the first to the pixels on an edge, later ones only where the
+samples taken so far disagree. `step` does a bounded amount of work, so the
+canvas can run it between UI events and drop it the moment input arrives.
+"""
+import time
+
+import numpy as np
+
+from .antialias import (AA_LEVELS, DEFAULT_THRESHOLD, _linear_to_srgb,
+                        _srgb_to_linear, edge_mask)
+from .gradient import colorize, shade_by_distance
+from .render import EscapeState, render_points, resume_render
+
+# later AA passes resample pixels whose samples' standard deviation (linear
+# light, any channel) exceeds this
+VARIANCE_THRESHOLD = 0.02
+_FIRST_CHUNK = 256
+_MIN_CHUNK = 32
+
+
+class Refinement:
+    """Refine one frame; `iters`, `dist`, `max_iter` and `state` follow the passes.
+
+    AA passes go up to `aa_level`, starting above `shown_aa`, the level the
+    caller already displays, so every finished pass is an improvement on
+    screen. An iteration pass recolours the frame with one sample per pixel.
+    """
+
+    def __init__(self, iters, dist, cx, cy, span_x, span_y,
+                 max_iter: int, escape_radius: float, lut: np.ndarray,
+                 cx_lo: float = 0.0, cy_lo: float = 0.0,
+                 precision: str = "float64", state: EscapeState | None = None,
+                 target_iter: int | None = None, aa_level: int = 1,
+                 shown_aa: int = 1, seed: int = 0):
+        self.iters = np.array(iters, dtype=np.float32)
+        self.dist = None if dist is None else np.array(dist, dtype=np.float32)
+        self.state = state if dist is None else None
+        self.max_iter = int(max_iter)
+        self.samples = 1                # AA level of the accumulated colours
+        self.resampled = 0
+        self.done = False
+        self.pass_label = ""
+        self._view = (cx, cx_lo, cy, cy_lo, span_x, span_y)
+        self._escape_radius = escape_radius
+        self._lut = lut
+        self._precision = precision
+        self._target_iter = max(int(target_iter or max_iter), self.max_iter)
+        self._target_aa = aa_level
+        self._shown_aa = shown_aa
+        self._rng = np.random.default_rng(seed)
+        self._sum = self._sumsq = self._count = None
+        self._work = None               # items of the current pass, `_pos` of them done
+        self._pos = 0
+        self._chunk = _FIRST_CHUNK
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the current pass done."""
+        if self._work is None or not len(self._work):
+            return 0.0
+        return self._pos / len(self._work)
+
+    def colors(self) -> np.ndarray:
+        """The refined frame as an (H, W, 3) uint8 image."""
+        if self._count is not None:
+            return _linear_to_srgb(self._sum / self._count[..., None])
+        return self._base_colors()
+
+    def step(self, budget: float) -> bool:
+        """Work for about `budget` seconds; True once a pass has finished."""
+        start = time.perf_counter()
+        if self._work is None:
+            self._next_pass()
+        while not self.done:
+            if self._pos < len(self._work):
+                n = self._chunk
+                t0 = time.perf_counter()
+                self._run_chunk(slice(self._pos, self._pos + n))
+                self._pos = min(self._pos + n, len(self._work))
+                elapsed = time.perf_counter() - t0
+                # aim for chunks of half the budget: the next must not overrun
+                self._chunk = max(_MIN_CHUNK, int(n * budget / 2 / max(elapsed, 1e-4)))
+            if self._pos >= len(self._work):
+                self._finish_pass()
+                self._work = None
+                return True
+            if time.perf_counter() - start >= budget:
+                break
+        return False
+
+    # ─── passes ──────────────────────────────────────────────────
+    def _next_pass(self):
+        self._pos, self._chunk = 0, _FIRST_CHUNK
+        if self.max_iter < self._target_iter:
+            self._cap = min(2 * self.max_iter, self._target_iter)
+            self.pass_label = f"iterations {self._cap}"
+            if self.state is not None:
+                self._work = np.arange(self.state.idx.size)
+                self._pieces = []
+            else:
+                self._work = np.flatnonzero(self.iters >= self.max_iter)
+            return
+        levels = [lv for lv in AA_LEVELS
+                  if max(self.samples, self._shown_aa) < lv <= self._target_aa]
+        if not levels:
+            self.done = True
+            self._work = np.empty(0, dtype=np.intp)
+            return
+        level = levels[0]
+        if self._count is None:
+            base = self._base_colors()
+            H, W = self.iters.shape
+            linear = _srgb_to_linear(base)
+            self._sum, self._sumsq = linear, linear * linear
+            self._count = np.ones((H, W), dtype=np.int32)
+            mask = edge_mask(base, DEFAULT_THRESHOLD, self.dist, self._view[4] / W)
+        else:
+            mean = self._sum / self._count[..., None]
+            var = self._sumsq / self._count[..., None] - mean * mean
+            mask = (self._count == self.samples) & (
+                np.sqrt(np.maximum(var, 0.0)).max(axis=2) > VARIANCE_THRESHOLD)
+        pixels = np.flatnonzero(mask)
+        if not pixels.size:
+            self.done = True
+            self._work = pixels
+            return
+        self._work = np.repeat(pixels, level - self.samples)
+        self._level = level
+        self.pass_label = f"AA {level}x on {pixels.size} px"
+
+    def _finish_pass(self):
+        if self._count is None:
+            if self.state is not None:
+                s = self.state
+                parts = list(zip(*self._pieces)) or [
+                    [a[:0]] for a in (s.idx, s.cr, s.ci, s.zr, s.zi)]
+                idx, cr, ci, zr, zi = (np.concatenate(p) for p in parts)
+                self.state = s._replace(idx=idx, cr=cr, ci=ci, zr=zr, zi=zi, n=self._cap)
+            self.max_iter = self._cap
+            self._shown_aa = 1
+            return
+        self.samples = self._level
+        self.resampled = int(np.count_nonzero(self._count > 1))
+
+    def _run_chunk(self, part: slice):
+        if self._count is None:
+            self._iterate(part)
+        else:
+            self._supersample(part)
+
+    def _offsets(self, pixels, u, v):
+        H, W = self.iters.shape
+        rows, cols = np.divmod(pixels, W)
+        span_x, span_y = self._view[4], self._view[5]
+        return (cols + u - W / 2) * (span_x / W), (rows + v - H / 2) * (span_y / H)
+
+    def _points(self, ox, oy, max_iter):
+        cx, cx_lo, cy, cy_lo = self._view[:4]
+        want_dist = self.dist is not None
+        result = render_points(cx, cy, ox, oy, max_iter, self._escape_radius,
+                               cx_lo, cy_lo, self._precision, distance=want_dist)
+        return result if want_dist else (result, None)
+
+    def _iterate(self, part: slice):
+        if self.state is not None:
+            s = self.state
+            pos = self._work[part]
+            m = pos.size
+            # resume the chunk's orbits as a buffer of their own
+            sub = s._replace(shape=(m,), idx=np.arange(m), cr=s.cr[pos], ci=s.ci[pos],
+                             zr=s.zr[pos], zi=s.zi[pos])
+            vals, rest = resume_render(np.full(m, s.n, dtype=np.float32), sub, self._cap)
+            self.iters.flat[s.idx[pos]] = vals
+            self._pieces.append((s.idx[pos][rest.idx], rest.cr, rest.ci, rest.zr, rest.zi))
+            return
+        pixels = self._work[part]
+        ox, oy = self._offsets(pixels, 0.0, 0.0)
+        vals, dist = self._points(ox, oy, self._cap)
+        self.iters.flat[pixels] = vals
+        if dist is not None:
+            self.dist.flat[pixels] = dist
+
+    def _supersample(self, part: slice):
+        pixels = self._work[part]
+        n = pixels.size
+        ox, oy = self._offsets(pixels, self._rng.random(n), self._rng.random(n))
+        iters, dist = self._points(ox, oy, self.max_iter)
+        colors = colorize(iters, self.max_iter, self._lut)
+        if dist is not None:
+            colors = shade_by_distance(colors, iters, dist, self.max_iter,
+                                       self._view[4] / self.iters.shape[1])
+        linear = _srgb_to_linear(colors)
+        np.add.at(self._sum.reshape(-1, 3), pixels, linear)
+        np.add.at(self._sumsq.reshape(-1, 3), pixels, linear * linear)
+        np.add.at(self._count.reshape(-1), pixels, 1)
+
+    def _base_colors(self) -> np.ndarray:
+        colors = colorize(self.iters, self.max_iter, self._lut)
+        if self.dist is not None:
+            colors = shade_by_distance(colors, self.iters, self.dist, self.max_iter,
+                                       self._view[4] / self.iters.shape[1])
+        return colors
@@ -1,112 +1,72 @@
-import importlib
-import importlib.abc
-import importlib.util
 import math
 import os
-import pathlib
 import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import NamedTuple
 import numpy as np
 
-class _NumbaCudaFinder(importlib.abc.MetaPathFinder):
-    """Redirect `numba.cuda.*` imports to `numba_cuda/numba/cuda/*` when available."""
+from . import autotune, cudaprobe
+from .symmetry import apply_mirror, mirror_plan
+from .prefs import PREFS, CONFIG_DIR
 
-    def __init__(self):
-        self.initialized = None
+# Compiled kernels (CUDA and the numba CPU ones) are cached here between
+# runs. numba reads the variable when it is first imported, which is always
+# after this module; a user-set NUMBA_CACHE_DIR wins.
+JIT_CACHE_DIR = CONFIG_DIR / "jit_cache"
+os.environ.setdefault("NUMBA_CACHE_DIR", str(JIT_CACHE_DIR))
 
-    def ensure_initialized(self) -> bool:
-        if self.initialized is not None:
-            return self.initialized
-
-        numba_spec = importlib.util.find_spec("numba")
-        numba_cuda_spec = importlib.util.find_spec("numba_cuda")
-        if numba_spec is None or numba_cuda_spec is None:
-            self.initialized = False
-            return False
-
-        numba_locs = numba_spec.submodule_search_locations
-        numba_cuda_locs = numba_cuda_spec.submodule_search_locations
-        if not numba_locs or len(numba_locs) != 1:
-            self.initialized = False
-            return False
-        if not numba_cuda_locs or len(numba_cuda_locs) != 1:
-            self.initialized = False
-            return False
-
-        self.numba_path = str(pathlib.Path(numba_locs[0]))
-        self.numba_cuda_path = str(pathlib.Path(numba_cuda_locs[0]) / "numba")
-        self.initialized = True
-        return True
-
-    def find_spec(self, name, path, target=None):
-        if "numba.cuda" not in name or path is None:
-            return None
-        if not self.ensure_initialized():
-            return None
-
-        if any(self.numba_cuda_path in p for p in path):
-            return None
-
-        redirected = [p.replace(self.numba_path, self.numba_cuda_path) for p in path]
-        for finder in sys.meta_path:
-            if finder is self:
-                continue
-            find_spec = getattr(finder, "find_spec", None)
-            if find_spec is None:
-                continue
-            spec = find_spec(name, redirected, target)
-            if spec is not None:
-                return spec
-        return None
-
-
-if not any(isinstance(f, _NumbaCudaFinder) for f in sys.meta_path):
-    sys.meta_path.insert(0, _NumbaCudaFinder())
-
-# Prefer NVIDIA's CUDA Python bindings only when the legacy entrypoint
-# (`cuda.cuda`) exists; otherwise keep numba's default binding path.
-_requested_nvidia_binding = importlib.util.find_spec("cuda.cuda") is not None
-if _requested_nvidia_binding:
-    os.environ.setdefault("NUMBA_CUDA_USE_NVIDIA_BINDING", "1")
-
-try:
-    from numba import cuda
-    _CUDA_IMPORT_ERROR = None
-except Exception as first_exc:
-    cuda = None
-    _CUDA_IMPORT_ERROR = str(first_exc)
-    if _requested_nvidia_binding:
-        os.environ.pop("NUMBA_CUDA_USE_NVIDIA_BINDING", None)
-        try:
-            from numba import cuda
-            _CUDA_IMPORT_ERROR = None
-        except Exception as second_exc:
-            cuda = None
-            _CUDA_IMPORT_ERROR = f"{first_exc}; fallback import failed: {second_exc}"
+# numba.cuda and the kernels (core.cudakernels) are imported on first use, or
+# in the background by init_backend_async, never at import time.
+cuda = None
+_kernels = None
+_CUDA_IMPORT_ERROR = None
+_CUDA_LOAD_ATTEMPTED = False
+_CUDA_LOAD_LOCK = threading.Lock()
+_BACKEND_INIT = None
+_CUDA_PROBE_KEY = None
+_CUDA_PROBE_CACHED = None
+_CUDA_PROBE_DONE = False
+_WARMUP_THREAD = None
+_WARMUP_STATUS = "not started"
 
 _CUDA_DISABLED_REASON = None
 _CUDA_SMOKE_TESTED = False
 _LAST_RENDER_BACKEND = "CPU"
 _LAST_RENDER_REASON = "CUDA not initialized."
+_LAST_RENDER_PRECISION = "float64"
+_DD_DISABLED_REASON = None
+_RENDER_EXECUTOR = None
+_TUNED_BLOCK = None
 
-if cuda is not None:
-    @cuda.jit
-    def mandelbrot_kernel(xmin,xmax,ymin,ymax,
-                          img, max_iter, escape2):
-        h,w = img.shape
-        row,col = cuda.grid(2)
-        if row>=h or col>=w: return
-        x0 = np.float64(xmin) + (np.float64(xmax) - xmin) * col / w
-        y0 = np.float64(ymin) + (np.float64(ymax) - ymin) * row / h
-        x = y = np.float64(0.0)
-        it = 0
-        while x*x+y*y<=escape2 and it<max_iter:
-            x, y = x*x - y*y + x0, 2.0*x*y + y0
-            it += 1
-        if it < max_iter:
-            log_zn  = math.log(x*x + y*y) / 2.0
-            nu      = math.log(log_zn / math.log(2.0)) / math.log(2.0)
-            it = it + 1 - nu
-        img[row,col] = it
+# Benchmark frame used when timing candidate launch geometries.
+_TUNE_W, _TUNE_H, _TUNE_ITER = 512, 512, 256
+
+# Tiled renders split the frame into horizontal bands of this many rows and
+# round-robin them over a few streams, so the copy of band N overlaps the
+# kernel of band N+1.
+DEFAULT_BAND_ROWS = 256
+DEFAULT_STREAMS = 3
+
+# Smallest pixel spacing, relative to the magnitude of the coordinates, at
+# which each float type still resolves neighbouring pixels with a few ulps to
+# spare. Rounding errors in an orbit grow about linearly with its length, so
+# float32 must also beat the iteration cap: it needs
+# ``_FLOAT32_ITER_MARGIN * eps32 * max_iter`` (measured: past that, under 1%
+# of pixels differ from float64 by more than an iteration, about the share
+# of chaotic boundary pixels that differ at any zoom). That leaves float32,
+# at twice the SIMD width of float64, to the overview frames.
+_FLOAT32_EPS = float(np.finfo(np.float32).eps)
+_FLOAT32_ITER_MARGIN = 16
+_FLOAT64_MIN_REL_SPACING = 4 * float(np.finfo(np.float64).eps)
+_DOUBLE_DOUBLE_MIN_REL_SPACING = 4 * 2.0 ** -104
+
+class RendererState(NamedTuple):
+    backend: str
+    reason: str | None
+    precision: str
+    warmup: str = "not started"   # kernel warm-up: running / done in … / failed: …
 
 def _disable_cuda(exc: Exception):
     global _CUDA_DISABLED_REASON
@@ -117,12 +77,66 @@ def _disable_cuda(exc: Exception):
             file=sys.stderr
         )
 
-def get_renderer_state() -> tuple[str, str | None]:
-    return _LAST_RENDER_BACKEND, _LAST_RENDER_REASON
+def get_renderer_state() -> RendererState:
+    return RendererState(
+        _LAST_RENDER_BACKEND, _LAST_RENDER_REASON, _LAST_RENDER_PRECISION,
+        _WARMUP_STATUS
+    )
+
+def _precision_for(spacing: float, scale: float, max_iter: int) -> str:
+    # |z| reaches the escape radius regardless of where c sits, so never
+    # judge the spacing against anything smaller than 2.
+    rel = spacing / max(scale, 2.0)
+    if rel >= _FLOAT32_ITER_MARGIN * _FLOAT32_EPS * max(int(max_iter), 1):
+        return "float32"
+    if rel >= _FLOAT64_MIN_REL_SPACING:
+        return "float64"
+    return "double-double"
 
-def _cuda_ready() -> bool:
+def choose_precision(xmin, xmax, ymin, ymax, W, H, max_iter: int) -> str:
+    """Pick the cheapest arithmetic that still resolves this pixel grid."""
+    spacing = min(abs(xmax - xmin) / max(W, 1), abs(ymax - ymin) / max(H, 1))
+    scale = max(abs(xmin), abs(xmax), abs(ymin), abs(ymax))
+    return _precision_for(spacing, scale, max_iter)
+
+def precision_for_view(cx, cy, span_x, span_y, W, H, max_iter: int) -> str:
+    """Like `choose_precision`, for a viewport given as centre and spans."""
+    spacing = min(span_x / max(W, 1), span_y / max(H, 1))
+    scale = max(abs(cx) + span_x / 2, abs(cy) + span_y / 2)
+    return _precision_for(spacing, scale, max_iter)
+
+def _load_cuda() -> bool:
+    """Import numba.cuda and compile-ready kernels; safe to call repeatedly.
+
+    Skips the import when the cached probe says it failed under the same
+    driver and libraries.
+    """
+    global cuda, _kernels, _CUDA_IMPORT_ERROR, _CUDA_LOAD_ATTEMPTED
+    global _CUDA_DISABLED_REASON, _CUDA_PROBE_KEY, _CUDA_PROBE_CACHED, _CUDA_PROBE_DONE
+    with _CUDA_LOAD_LOCK:
+        if not _CUDA_LOAD_ATTEMPTED:
+            _CUDA_LOAD_ATTEMPTED = True
+            _CUDA_PROBE_KEY = cudaprobe.environment_key()
+            _CUDA_PROBE_CACHED = cudaprobe.load_cached(_CUDA_PROBE_KEY)
+            if _CUDA_PROBE_CACHED is not None and not _CUDA_PROBE_CACHED.available:
+                _CUDA_DISABLED_REASON = f"{_CUDA_PROBE_CACHED.reason} (cached probe)"
+                _CUDA_PROBE_DONE = True
+                return False
+            try:
+                from . import cudakernels
+            except Exception as exc:
+                _CUDA_IMPORT_ERROR = str(exc)
+            else:
+                _kernels = cudakernels
+                cuda = cudakernels.cuda
+    return _kernels is not None
+
+def _backend_initializing() -> bool:
+    return _BACKEND_INIT is not None and not _BACKEND_INIT.done()
+
+def _probe_device() -> bool:
     global _CUDA_SMOKE_TESTED
-    if cuda is None:
+    if not _load_cuda():
         return False
     if _CUDA_DISABLED_REASON is not None:
         return False
@@ -140,19 +154,163 @@ def _cuda_ready() -> bool:
         _disable_cuda(exc)
         return False
 
-def _cpu_render(xmin, xmax, ymin, ymax,
-                W, H, max_iter: int, escape_radius: float):
-    xs = np.linspace(xmin, xmax, W, dtype=np.float64)
-    ys = np.linspace(ymin, ymax, H, dtype=np.float64)
-    c = xs[None, :] + 1j * ys[:, None]
-    z = np.zeros_like(c, dtype=np.complex128)
-
-    iters = np.full((H, W), float(max_iter), dtype=np.float64)
-    active = np.ones((H, W), dtype=bool)
+def _store_probe(ready: bool):
+    if ready:
+        result = cudaprobe.ProbeResult(True, *_device_info())
+    else:
+        result = cudaprobe.ProbeResult(False, reason=_cuda_failure_reason())
+    if result != _CUDA_PROBE_CACHED:
+        cudaprobe.store(_CUDA_PROBE_KEY, result)
+
+def _probe_cuda() -> bool:
+    global _CUDA_PROBE_DONE
+    ready = _probe_device()
+    if not _CUDA_PROBE_DONE:
+        # only the first outcome is cached; later failures are runtime errors
+        _CUDA_PROBE_DONE = True
+        try:
+            _store_probe(ready)
+        except Exception as exc:
+            print(f"[MandelPy render] Could not record CUDA probe: {exc}", file=sys.stderr)
+    return ready
+
+def _cuda_ready() -> bool:
+    # While the background init runs, callers on other threads render on
+    # the CPU instead of waiting for numba to import.
+    if _backend_initializing():
+        return False
+    return _probe_cuda()
+
+def _warm_cuda_kernels():
+    # One tiny launch per kernel: loads it from the JIT cache (or compiles
+    # it) before the first real frame needs it.
+    box = (-2.0, 1.0, -1.0, 1.0, 8, 8, 16, 4.0)
+    _cuda_render_frame(*box, "float32")
+    _cuda_render_frame(*box, "float64")
+    _cuda_render_distance(*box)
+    _cuda_render_state(*box)
+    one = cuda.to_device(np.zeros(1))
+    _kernels.mandelbrot_resume_kernel[1, 1](
+        one, one, cuda.to_device(np.zeros(1)), cuda.to_device(np.zeros(1)),
+        np.int32(0), np.int32(16), 4.0, cuda.device_array(1, dtype=np.float32))
+    cuda.synchronize()
+
+def _init_backend() -> bool:
+    ready = _probe_cuda()
+    if ready:
+        _launch_block()
+        try:
+            _warm_cuda_kernels()
+        except Exception as exc:
+            _disable_cuda(exc)
+            ready = False
+    return ready
+
+def _warm_up():
+    """Warm the double-double JIT kernels, then wait for the CUDA ones."""
+    global _WARMUP_STATUS
+    start = time.perf_counter()
+    error = None
+    try:
+        from . import ddrender
+        ddrender.warm_up()
+    except ImportError:
+        pass                # no numba: nothing to compile
+    except Exception as exc:
+        error = f"double-double kernels: {exc}"
+    try:
+        _BACKEND_INIT.result()
+    except Exception as exc:
+        error = error or f"CUDA kernels: {exc}"
+    if error is None:
+        _WARMUP_STATUS = f"done in {time.perf_counter() - start:.1f} s"
+    else:
+        _WARMUP_STATUS = f"failed: {error}"
+        print(f"[MandelPy render] Kernel warm-up failed: {error}", file=sys.stderr)
+
+def init_backend_async() -> Future:
+    """Load numba/CUDA, probe the device and warm the kernels off the GUI thread.
+
+    Until the returned Future resolves, renders on other threads use the
+    CPU path; its result says whether CUDA ended up usable. The
+    double-double kernels warm up alongside on their own thread; see
+    ``get_renderer_state().warmup``.
+    """
+    global _BACKEND_INIT, _WARMUP_THREAD, _WARMUP_STATUS
+    if _BACKEND_INIT is None:
+        _WARMUP_STATUS = "running"
+        _BACKEND_INIT = _render_executor().submit(_init_backend)
+        _WARMUP_THREAD = threading.Thread(target=_warm_up, name="mandelpy-warmup",
+                                          daemon=True)
+        _WARMUP_THREAD.start()
+    return _BACKEND_INIT
+
+def _device_info() -> tuple[str, tuple[int, int] | None]:
+    dev = cuda.get_current_device()
+    name = getattr(dev, "name", b"CUDA device")
+    if isinstance(name, bytes):
+        name = name.decode(errors="replace")
+    cc = getattr(dev, "compute_capability", None)
+    return str(name), (tuple(cc) if cc else None)
+
+def _device_name() -> str:
+    name, cc = _device_info()
+    return f"{name} (cc {cc[0]}.{cc[1]})" if cc else name
+
+def _time_block(block: tuple[int, int]) -> float:
+    img_dev = cuda.device_array((_TUNE_H, _TUNE_W), dtype=np.float32)
+    bpg = (math.ceil(_TUNE_H / block[0]), math.ceil(_TUNE_W / block[1]))
+    # Untimed launch first so JIT compilation never skews the comparison.
+    _kernels.mandelbrot_kernel[bpg, block](-2.5, 1.0, -1.25, 1.25,
+                                  img_dev, np.int32(_TUNE_ITER), 4.0, 0, 0,
+                                  0, _TUNE_H)
+    cuda.synchronize()
+    start = time.perf_counter()
+    _kernels.mandelbrot_kernel[bpg, block](-2.5, 1.0, -1.25, 1.25,
+                                  img_dev, np.int32(_TUNE_ITER), 4.0, 0, 0,
+                                  0, _TUNE_H)
+    cuda.synchronize()
+    return time.perf_counter() - start
+
+def _launch_block() -> tuple[int, int]:
+    """Threads-per-block for the kernels: prefs override, else autotuned."""
+    global _TUNED_BLOCK
+    override = PREFS.get("cuda_block", autotune.AUTO)
+    if override != autotune.AUTO:
+        block = autotune.parse_block(override)
+        if block is not None:
+            return block
+    if _TUNED_BLOCK is None:
+        from numba import config as numba_config
+        if numba_config.ENABLE_CUDASIM:
+            # Simulator timings say nothing about real hardware.
+            _TUNED_BLOCK = autotune.DEFAULT_BLOCK
+        else:
+            _TUNED_BLOCK = autotune.block_for_device(_device_name(), _time_block)
+    return _TUNED_BLOCK
+
+def _cpu_escape(c: np.ndarray, max_iter: int, escape_radius: float,
+                distance: bool = False, z0: np.ndarray | None = None,
+                start: int = 0, return_z: bool = False):
+    """Escape-time iteration for an array of c values of any shape.
+
+    `z0`/`start` continue orbits that already ran `start` iterations;
+    ``return_z=True`` also returns the final z (used by `resume_render`).
+    """
+    real = np.float32 if c.dtype == np.complex64 else np.float64
+    z = np.zeros_like(c) if z0 is None else z0.astype(c.dtype, copy=True)
+
+    iters = np.full(c.shape, float(max_iter), dtype=real)
+    active = np.ones(c.shape, dtype=bool)
     escape2 = float(escape_radius * escape_radius)
     log2 = math.log(2.0)
+    if distance:
+        dz = np.zeros_like(c)
+        dist = np.zeros(c.shape, dtype=real)
 
-    for i in range(max_iter):
+    for i in range(start, max_iter):
+        if distance:
+            dz[active] = 2.0 * z[active] * dz[active] + 1.0
         z[active] = z[active] * z[active] + c[active]
         mag2 = z.real * z.real + z.imag * z.imag
         escaped = active & (mag2 > escape2)
@@ -160,43 +318,491 @@ def _cpu_render(xmin, xmax, ymin, ymax,
             log_zn = np.log(mag2[escaped]) / 2.0
             nu = np.log(log_zn / log2) / log2
             iters[escaped] = i + 1 - nu
+            if distance:
+                m = mag2[escaped]
+                dist[escaped] = np.sqrt(m) * np.log(m) / np.abs(dz[escaped])
             active[escaped] = False
         if not np.any(active):
             break
 
+    if distance:
+        return iters.astype(np.float32), dist.astype(np.float32)
+    if return_z:
+        return iters.astype(np.float32), z
     return iters.astype(np.float32)
 
-def cuda_render(xmin, xmax, ymin, ymax,
-                W, H, max_iter: int, escape_radius: float):
+def _cpu_render(xmin, xmax, ymin, ymax,
+                W, H, max_iter: int, escape_radius: float,
+                precision: str = "float64", distance: bool = False):
+    real = np.float32 if precision == "float32" else np.float64
+    # Same pixel grid as the CUDA kernel (xmin + span * col / W), so bands
+    # of a frame rendered separately line up exactly.
+    xs = (xmin + (xmax - xmin) * np.arange(W) / W).astype(real)
+    ys = (ymin + (ymax - ymin) * np.arange(H) / H).astype(real)
+    plan = mirror_plan(ymin, ymax, H)
+    if plan is None:
+        c = xs[None, :] + 1j * ys[:, None]
+        return _cpu_escape(c, max_iter, escape_radius, distance)
+
+    # iterate only the rows that have no mirror image in the frame
+    _, lo, hi = plan
+    rows = np.r_[0:lo, hi:H]
+    c = xs[None, :] + 1j * ys[rows, None]
+    part = _cpu_escape(c, max_iter, escape_radius, distance)
+    outs = []
+    for arr in (part if distance else (part,)):
+        full = np.empty((H, W), dtype=arr.dtype)
+        full[rows] = arr
+        outs.append(apply_mirror(full, plan))
+    return tuple(outs) if distance else outs[0]
+
+def _cuda_failure_reason() -> str:
+    if _CUDA_DISABLED_REASON:
+        return _CUDA_DISABLED_REASON
+    if cuda is None:
+        if _CUDA_IMPORT_ERROR:
+            return f"numba.cuda import failed: {_CUDA_IMPORT_ERROR}"
+        return "numba.cuda could not be imported."
+    return "cuda.is_available() returned False."
+
+def _record_cpu_fallback():
     global _LAST_RENDER_BACKEND, _LAST_RENDER_REASON
+    _LAST_RENDER_BACKEND = "CPU"
+    if _backend_initializing():
+        _LAST_RENDER_REASON = "CUDA backend still initializing."
+    else:
+        _LAST_RENDER_REASON = _cuda_failure_reason()
+
+def _skip_rows(plan):
+    if plan is None:
+        return np.int32(0), np.int32(0)
+    return np.int32(plan[1]), np.int32(plan[2])
+
+def _float_precision(xmin, xmax, ymin, ymax, W, H, max_iter: int) -> str:
+    # The float engines top out at float64; deeper views go via render_view.
+    if choose_precision(xmin, xmax, ymin, ymax, W, H, max_iter) == "float32":
+        return "float32"
+    return "float64"
+
+def _kernel_for(precision: str):
+    if precision == "float32":
+        return _kernels.mandelbrot_kernel_f32
+    return _kernels.mandelbrot_kernel
+
+def _cuda_render_frame(xmin, xmax, ymin, ymax, W, H,
+                       max_iter: int, escape_radius: float, precision: str):
+    img_dev = cuda.device_array((H, W), dtype=np.float32)
+    tpb = _launch_block()
+    bpg = (math.ceil(H / tpb[0]), math.ceil(W / tpb[1]))
+    plan = mirror_plan(ymin, ymax, H)
+    _kernel_for(precision)[bpg, tpb](
+        xmin, xmax, ymin, ymax,
+        img_dev,
+        np.int32(max_iter),
+        escape_radius * escape_radius,
+        *_skip_rows(plan),
+        np.int32(0), np.int32(H)
+    )
+    img = img_dev.copy_to_host()
+    return img if plan is None else apply_mirror(img, plan)
+
+def _cuda_render_distance(xmin, xmax, ymin, ymax, W, H,
+                          max_iter: int, escape_radius: float):
+    img_dev = cuda.device_array((H, W), dtype=np.float32)
+    dist_dev = cuda.device_array((H, W), dtype=np.float32)
+    tpb = _launch_block()
+    bpg = (math.ceil(H / tpb[0]), math.ceil(W / tpb[1]))
+    plan = mirror_plan(ymin, ymax, H)
+    _kernels.mandelbrot_de_kernel[bpg, tpb](
+        xmin, xmax, ymin, ymax,
+        img_dev, dist_dev,
+        np.int32(max_iter),
+        escape_radius * escape_radius,
+        *_skip_rows(plan)
+    )
+    img, dist = img_dev.copy_to_host(), dist_dev.copy_to_host()
+    if plan is not None:
+        apply_mirror(img, plan)
+        apply_mirror(dist, plan)
+    return img, dist
+
+def cuda_render(xmin, xmax, ymin, ymax,
+                W, H, max_iter: int, escape_radius: float,
+                distance: bool = False):
+    """Render the iteration buffer, plus the exterior distance estimate.
+
+    With ``distance=True`` a ``(iters, dist)`` pair is returned; `dist` holds
+    the estimated distance from each pixel's c to the set in plane units
+    (0 for interior pixels). Distance renders always use float64.
+    """
+    global _LAST_RENDER_BACKEND, _LAST_RENDER_REASON, _LAST_RENDER_PRECISION
+    precision = "float64" if distance else _float_precision(xmin, xmax, ymin, ymax,
+                                                             W, H, max_iter)
+    _LAST_RENDER_PRECISION = precision
+    if _cuda_ready():
+        try:
+            if distance:
+                result = _cuda_render_distance(xmin, xmax, ymin, ymax, W, H,
+                                               max_iter, escape_radius)
+            else:
+                result = _cuda_render_frame(xmin, xmax, ymin, ymax, W, H,
+                                            max_iter, escape_radius, precision)
+            _LAST_RENDER_BACKEND = "CUDA"
+            _LAST_RENDER_REASON = None
+            return result
+        except Exception as exc:
+            _disable_cuda(exc)
+
+    _record_cpu_fallback()
+    return _cpu_render(
+        xmin, xmax, ymin, ymax,
+        W, H, max_iter, escape_radius, precision, distance
+    )
+
+def _cuda_render_bands(xmin, xmax, ymin, ymax, W, H,
+                       max_iter: int, escape_radius: float,
+                       band_rows: int, n_streams: int, precision: str):
+    kernel = _kernel_for(precision)
+    out = cuda.pinned_array((H, W), dtype=np.float32)
+    streams = [cuda.stream() for _ in range(n_streams)]
+    buffers = [
+        cuda.device_array((band_rows, W), dtype=np.float32, stream=s)
+        for s in streams
+    ]
+    tpb = _launch_block()
+    escape2 = escape_radius * escape_radius
+    plan = mirror_plan(ymin, ymax, H)
+    skip0, skip1 = _skip_rows(plan)
+
+    for band, r0 in enumerate(range(0, H, band_rows)):
+        rows = min(band_rows, H - r0)
+        # band-local rows that will be mirrored; bands entirely inside that
+        # range are never launched
+        b_skip0 = min(max(skip0 - r0, 0), rows)
+        b_skip1 = min(max(skip1 - r0, 0), rows)
+        if b_skip0 == 0 and b_skip1 == rows:
+            continue
+        slot = band % n_streams
+        stream = streams[slot]
+        # Each stream owns one device buffer; work queued on the same stream
+        # runs in order, so reusing it for the next band is safe.
+        band_dev = buffers[slot][:rows]
+        bpg = (math.ceil(rows / tpb[0]), math.ceil(W / tpb[1]))
+        kernel[bpg, tpb, stream](
+            xmin, xmax, ymin, ymax,
+            band_dev,
+            np.int32(max_iter),
+            escape2,
+            np.int32(b_skip0), np.int32(b_skip1),
+            np.int32(r0), np.int32(H)
+        )
+        band_dev.copy_to_host(out[r0:r0 + rows], stream=stream)
+
+    for stream in streams:
+        stream.synchronize()
+    return out if plan is None else apply_mirror(out, plan)
+
+def cuda_render_tiled(xmin, xmax, ymin, ymax,
+                      W, H, max_iter: int, escape_radius: float,
+                      band_rows: int = DEFAULT_BAND_ROWS,
+                      n_streams: int = DEFAULT_STREAMS):
+    """Render a frame as horizontal bands spread over several CUDA streams.
+
+    Produces the same image as `cuda_render`, but the device-to-host copy of
+    each band overlaps the kernel of the next one. Falls back to the CPU
+    renderer exactly like `cuda_render` does.
+    """
+    global _LAST_RENDER_BACKEND, _LAST_RENDER_REASON, _LAST_RENDER_PRECISION
+    band_rows = max(1, min(int(band_rows), H))
+    n_streams = max(1, int(n_streams))
+    precision = _float_precision(xmin, xmax, ymin, ymax, W, H, max_iter)
+    _LAST_RENDER_PRECISION = precision
     if _cuda_ready():
         try:
-            img_dev = cuda.device_array((H, W), dtype=np.float32)
-            tpb = (16, 16)
-            bpg = (math.ceil(H / tpb[0]), math.ceil(W / tpb[1]))
-            mandelbrot_kernel[bpg, tpb](
-                xmin, xmax, ymin, ymax,
-                img_dev,
-                np.int32(max_iter),
-                escape_radius * escape_radius
+            iters = _cuda_render_bands(
+                xmin, xmax, ymin, ymax, W, H,
+                max_iter, escape_radius, band_rows, n_streams, precision
             )
             _LAST_RENDER_BACKEND = "CUDA"
             _LAST_RENDER_REASON = None
-            return img_dev.copy_to_host()
+            return iters
         except Exception as exc:
             _disable_cuda(exc)
 
-    _LAST_RENDER_BACKEND = "CPU"
-    if cuda is None:
-        if _CUDA_IMPORT_ERROR:
-            _LAST_RENDER_REASON = f"numba.cuda import failed: {_CUDA_IMPORT_ERROR}"
-        else:
-            _LAST_RENDER_REASON = "numba.cuda could not be imported."
-    elif _CUDA_DISABLED_REASON:
-        _LAST_RENDER_REASON = _CUDA_DISABLED_REASON
-    else:
-        _LAST_RENDER_REASON = "cuda.is_available() returned False."
+    _record_cpu_fallback()
     return _cpu_render(
         xmin, xmax, ymin, ymax,
-        W, H, max_iter, escape_radius
+        W, H, max_iter, escape_radius, precision
+    )
+
+class EscapeState(NamedTuple):
+    """Orbits of the pixels still unescaped after `n` iterations.
+
+    Returned next to an iteration buffer by `render_state`; hand both to
+    `resume_render` to raise the cap without restarting escaped pixels.
+    """
+    shape: tuple[int, int]
+    idx: np.ndarray             # flat indices into the iteration buffer
+    cr: np.ndarray
+    ci: np.ndarray
+    zr: np.ndarray
+    zi: np.ndarray
+    n: int
+    escape_radius: float
+    backend: str
+
+def _active_state(iters, zr, zi, xmin, xmax, ymin, ymax, max_iter,
+                  escape_radius, backend, plan=None) -> EscapeState:
+    H, W = iters.shape
+    idx = np.flatnonzero(iters >= max_iter)
+    row, col = np.divmod(idx, W)
+    # same expressions as the kernels' pixel grid, so c is bit-identical;
+    # mirrored rows take the conjugate of the row their orbit came from
+    cr = xmin + (xmax - xmin) * col / W
+    if plan is not None:
+        k, lo, hi = plan
+        mirrored = (row >= lo) & (row < hi)
+        ci = np.where(mirrored, -(ymin + (ymax - ymin) * (k - row) / H),
+                      ymin + (ymax - ymin) * row / H)
+    else:
+        ci = ymin + (ymax - ymin) * row / H
+    return EscapeState((H, W), idx, cr, ci,
+                       np.ravel(zr)[idx], np.ravel(zi)[idx],
+                       int(max_iter), float(escape_radius), backend)
+
+def _cuda_render_state(xmin, xmax, ymin, ymax, W, H,
+                       max_iter: int, escape_radius: float):
+    img_dev = cuda.device_array((H, W), dtype=np.float32)
+    zr_dev = cuda.device_array((H, W), dtype=np.float64)
+    zi_dev = cuda.device_array((H, W), dtype=np.float64)
+    tpb = _launch_block()
+    bpg = (math.ceil(H / tpb[0]), math.ceil(W / tpb[1]))
+    plan = mirror_plan(ymin, ymax, H)
+    _kernels.mandelbrot_state_kernel[bpg, tpb](
+        xmin, xmax, ymin, ymax,
+        img_dev, zr_dev, zi_dev,
+        np.int32(max_iter),
+        escape_radius * escape_radius,
+        *_skip_rows(plan)
+    )
+    img, zr, zi = img_dev.copy_to_host(), zr_dev.copy_to_host(), zi_dev.copy_to_host()
+    if plan is not None:
+        # the mirrored orbit is the complex conjugate
+        apply_mirror(img, plan)
+        apply_mirror(zr, plan)
+        apply_mirror(zi, plan, sign=-1.0)
+    return img, zr, zi, plan
+
+def render_state(xmin, xmax, ymin, ymax,
+                 W, H, max_iter: int, escape_radius: float):
+    """float64 render that also returns an `EscapeState` for resuming."""
+    global _LAST_RENDER_BACKEND, _LAST_RENDER_REASON, _LAST_RENDER_PRECISION
+    _LAST_RENDER_PRECISION = "float64"
+    if _cuda_ready():
+        try:
+            iters, zr, zi, plan = _cuda_render_state(xmin, xmax, ymin, ymax, W, H,
+                                                     max_iter, escape_radius)
+            _LAST_RENDER_BACKEND = "CUDA"
+            _LAST_RENDER_REASON = None
+            return iters, _active_state(iters, zr, zi, xmin, xmax, ymin, ymax,
+                                        max_iter, escape_radius, "CUDA", plan)
+        except Exception as exc:
+            _disable_cuda(exc)
+
+    _record_cpu_fallback()
+    xs = xmin + (xmax - xmin) * np.arange(W) / W
+    ys = ymin + (ymax - ymin) * np.arange(H) / H
+    plan = mirror_plan(ymin, ymax, H)
+    rows = np.arange(H) if plan is None else np.r_[0:plan[1], plan[2]:H]
+    c = xs[None, :] + 1j * ys[rows, None]
+    part, z = _cpu_escape(c, max_iter, escape_radius, return_z=True)
+    iters = np.empty((H, W), dtype=np.float32)
+    zr = np.empty((H, W))
+    zi = np.empty((H, W))
+    iters[rows], zr[rows], zi[rows] = part, z.real, z.imag
+    if plan is not None:
+        apply_mirror(iters, plan)
+        apply_mirror(zr, plan)
+        apply_mirror(zi, plan, sign=-1.0)
+    return iters, _active_state(iters, zr, zi, xmin, xmax, ymin, ymax,
+                                max_iter, escape_radius, "CPU", plan)
+
+def resume_render(iters: np.ndarray, state: EscapeState, max_iter: int):
+    """Continue the still-active pixels of `iters` up to `max_iter`.
+
+    Only ``len(state.idx)`` orbits are iterated, for ``max_iter - state.n``
+    steps each. Returns a new ``(iters, state)``; `iters` is not modified.
+    A cap at or below ``state.n`` returns the inputs unchanged.
+    """
+    global _LAST_RENDER_BACKEND, _LAST_RENDER_REASON, _LAST_RENDER_PRECISION
+    if max_iter <= state.n:
+        return iters, state
+    _LAST_RENDER_PRECISION = "float64"
+    out = np.array(iters, dtype=np.float32)
+    vals = zr = zi = None
+    # prefer the engine that started the orbits; the CUDA kernels report
+    # escaped pixels one iteration higher than _cpu_escape
+    if state.backend == "CUDA" and state.idx.size and _cuda_ready():
+        try:
+            zr_dev = cuda.to_device(state.zr)
+            zi_dev = cuda.to_device(state.zi)
+            out_dev = cuda.device_array(state.idx.size, dtype=np.float32)
+            tpb = _launch_block()[0] * _launch_block()[1]
+            _kernels.mandelbrot_resume_kernel[math.ceil(state.idx.size / tpb), tpb](
+                cuda.to_device(state.cr), cuda.to_device(state.ci),
+                zr_dev, zi_dev, np.int32(state.n), np.int32(max_iter),
+                state.escape_radius * state.escape_radius, out_dev)
+            vals = out_dev.copy_to_host()
+            zr, zi = zr_dev.copy_to_host(), zi_dev.copy_to_host()
+            _LAST_RENDER_BACKEND = "CUDA"
+            _LAST_RENDER_REASON = None
+        except Exception as exc:
+            _disable_cuda(exc)
+    if vals is None:
+        _record_cpu_fallback()
+        c = state.cr + 1j * state.ci
+        vals, z = _cpu_escape(c, max_iter, state.escape_radius,
+                              z0=state.zr + 1j * state.zi, start=state.n,
+                              return_z=True)
+        zr, zi = z.real, z.imag
+        if state.backend == "CUDA":
+            vals[vals < max_iter] += 1.0
+
+    out.flat[state.idx] = vals
+    still = vals >= max_iter
+    return out, EscapeState(state.shape, state.idx[still],
+                            state.cr[still], state.ci[still],
+                            zr[still], zi[still], int(max_iter),
+                            state.escape_radius, state.backend)
+
+def render_view(cx, cy, span_x, span_y,
+                W, H, max_iter: int, escape_radius: float,
+                cx_lo: float = 0.0, cy_lo: float = 0.0,
+                distance: bool = False):
+    """Render the frame centred on ``(cx + cx_lo, cy + cy_lo)``.
+
+    Shallow views are handed to `cuda_render`. Once float64 cannot resolve
+    the pixel spacing the double-double JIT renderer takes over; the centre
+    is accepted as a double-double so those views survive the trip here.
+    ``distance=True`` returns ``(iters, dist)`` as in `cuda_render`.
+    """
+    global _LAST_RENDER_BACKEND, _LAST_RENDER_REASON, _LAST_RENDER_PRECISION
+    global _DD_DISABLED_REASON
+    spacing = min(span_x / max(W, 1), span_y / max(H, 1))
+    scale = max(abs(cx) + span_x / 2, abs(cy) + span_y / 2)
+    precision = precision_for_view(cx, cy, span_x, span_y, W, H, max_iter)
+    if precision == "double-double" and _DD_DISABLED_REASON is None:
+        try:
+            from . import ddrender
+            iters = ddrender.dd_render(cx, cx_lo, cy, cy_lo, span_x, span_y,
+                                       W, H, max_iter, escape_radius,
+                                       distance)
+            _LAST_RENDER_BACKEND = "JIT"
+            _LAST_RENDER_PRECISION = "double-double"
+            if spacing / max(scale, 2.0) < _DOUBLE_DOUBLE_MIN_REL_SPACING:
+                _LAST_RENDER_REASON = "view is deeper than double-double precision"
+            else:
+                _LAST_RENDER_REASON = None
+            return iters
+        except Exception as exc:
+            _DD_DISABLED_REASON = f"double-double renderer unavailable: {exc}"
+            print(
+                "[MandelPy render] Double-double renderer unavailable; "
+                "using float64.",
+                file=sys.stderr
+            )
+
+    iters = cuda_render(cx - span_x / 2, cx + span_x / 2,
+                        cy - span_y / 2, cy + span_y / 2,
+                        W, H, max_iter, escape_radius, distance)
+    if _DD_DISABLED_REASON and precision == "double-double":
+        _LAST_RENDER_REASON = _DD_DISABLED_REASON
+    return iters
+
+# "Auto" quality: iteration caps are chosen from a low-resolution probe of
+# the view. The cap doubles until fewer than AUTO_LATE_ESCAPE_FRACTION of the
+# probe pixels escape in the top half of the budget, i.e. until raising it
+# further would change little of the picture.
+AUTO_MIN_ITER = 64
+AUTO_MAX_ITER = 20000
+AUTO_LATE_ESCAPE_FRACTION = 0.005
+AUTO_PROBE_DIVISOR = 8
+AUTO_PROBE_MIN_W = 32
+
+def auto_iteration_cap(cx, cy, span_x, span_y, W, H, escape_radius: float,
+                       cx_lo: float = 0.0, cy_lo: float = 0.0,
+                       threshold: float = AUTO_LATE_ESCAPE_FRACTION,
+                       max_iter: int = AUTO_MAX_ITER) -> int:
+    """Pick an iteration cap for the view from a cheap low-res probe.
+
+    A probe where nothing escapes says nothing about the set (deep interior
+    or a view whose first escapes lie past the cap), so in that case the
+    search stops at the "Ultra" zoom-formula cap instead of `max_iter`.
+    """
+    pw = max(AUTO_PROBE_MIN_W, W // AUTO_PROBE_DIVISOR)
+    ph = max(1, round(pw * H / max(W, 1)))
+    blind_limit = max(AUTO_MIN_ITER, int(200 * math.log2(max(2.5 / span_x, 1.0))))
+    cap = AUTO_MIN_ITER
+    while True:
+        iters = render_view(cx, cy, span_x, span_y, pw, ph, cap, escape_radius,
+                            cx_lo, cy_lo)
+        escaped = iters < cap
+        any_escaped = bool(escaped.any())
+        late = np.count_nonzero(escaped & (iters >= cap / 2)) / iters.size
+        if any_escaped and late < threshold:
+            return cap
+        if cap >= max_iter or (not any_escaped and cap >= blind_limit):
+            return cap
+        cap = min(cap * 2, max_iter)
+
+def render_points(cx, cy, ox, oy, max_iter: int, escape_radius: float,
+                  cx_lo: float = 0.0, cy_lo: float = 0.0,
+                  precision: str = "float64", distance: bool = False):
+    """Render scattered samples ``c = (cx + ox) + i (cy + oy)``.
+
+    `ox`/`oy` are float64 offset arrays from the double-double centre, so
+    callers such as the anti-aliasing pass can sample anywhere in the frame
+    at the precision the frame itself was rendered with.
+    """
+    ox = np.asarray(ox, dtype=np.float64)
+    oy = np.asarray(oy, dtype=np.float64)
+    if precision == "double-double" and _DD_DISABLED_REASON is None:
+        try:
+            from . import ddrender
+            return ddrender.dd_render_points(cx, cx_lo, cy, cy_lo, ox, oy,
+                                             max_iter, escape_radius, distance)
+        except Exception as exc:
+            print(
+                f"[MandelPy render] Double-double point render failed ({exc}); "
+                "using float64.",
+                file=sys.stderr
+            )
+    c = (cx + ox) + 1j * (cy + oy)
+    result = _cpu_escape(c, max_iter, escape_radius, distance)
+    if _cuda_ready():
+        # frames come from the CUDA kernels, which (like the double-double
+        # engine) report escaped pixels one iteration higher; see resume_render
+        iters = result[0] if distance else result
+        iters[iters < max_iter] += 1.0
+    return result
+
+def _render_executor() -> ThreadPoolExecutor:
+    global _RENDER_EXECUTOR
+    if _RENDER_EXECUTOR is None:
+        # A single worker keeps GPU submissions (and the CPU fallback, which
+        # already saturates memory bandwidth) serialized.
+        _RENDER_EXECUTOR = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="mandelpy-render"
+        )
+    return _RENDER_EXECUTOR
+
+def cuda_render_async(xmin, xmax, ymin, ymax,
+                      W, H, max_iter: int, escape_radius: float,
+                      band_rows: int = DEFAULT_BAND_ROWS,
+                      n_streams: int = DEFAULT_STREAMS) -> Future:
+    """Queue a tiled render on the background worker and return its Future."""
+    return _render_executor().submit(
+        cuda_render_tiled,
+        xmin, xmax, ymin, ymax, W, H,
+        max_iter, escape_radius, band_rows, n_streams
     )
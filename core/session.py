@@ -0,0 +1,110 @@
+"""Session files: viewport, render prefs and gradient in one ``.json``.
+
+A session may also point at a raw iteration buffer (see `core.rawio`) saved
+next to it, so reopening it can show the image without rendering.
+"""
+import json
+import math
+import pathlib
+
+from .prefs import _sanitize_prefs
+from .rawio import RawFormatError, load_raw, save_raw
+
+SESSION_FORMAT = "mandelpy-session"
+SESSION_VERSION = 1
+RENDER_PREF_KEYS = ("quality", "escape_radius", "render_mode", "aa_level",
+                    "custom_min_iter", "custom_multiplier")
+_VIEW_FLOATS = ("cx", "cy", "cx_lo", "cy_lo", "span_x", "span_y")
+
+
+class SessionFormatError(ValueError):
+    """Raised when a session file is missing or malformed."""
+
+
+def raw_path_for(path) -> pathlib.Path:
+    """``foo.json`` → ``foo.raw.npy`` (its sidecar becomes ``foo.raw.json``)."""
+    path = pathlib.Path(path)
+    return path.with_name(path.stem + ".raw.npy")
+
+
+def save_session(path, view: dict, prefs: dict, iters=None) -> pathlib.Path:
+    """Write a session; `view` holds the canvas viewport and ``max_iter``.
+
+    When `iters` is given it is stored as a raw buffer beside the session.
+    """
+    path = pathlib.Path(path).with_suffix(".json")
+    clean = _sanitize_prefs(prefs)
+    payload = {
+        "format": SESSION_FORMAT,
+        "version": SESSION_VERSION,
+        "view": {key: float(view.get(key, 0.0)) for key in _VIEW_FLOATS},
+        "render": {key: clean[key] for key in RENDER_PREF_KEYS},
+        "gradient": clean["gradient"],
+        "raw": None,
+    }
+    payload["view"]["max_iter"] = int(view["max_iter"])
+    if iters is not None:
+        coords = {key: payload["view"][key] for key in _VIEW_FLOATS}
+        raw = save_raw(raw_path_for(path), iters,
+                       max_iter=view["max_iter"],
+                       escape_radius=clean["escape_radius"], **coords)
+        # stored relative so the pair can be moved together
+        payload["raw"] = raw.name
+    with open(path, "w", encoding="utf8") as fp:
+        json.dump(payload, fp, indent=4)
+    return path
+
+
+def _validate_view(view: object) -> dict:
+    if not isinstance(view, dict):
+        raise SessionFormatError("Session has no viewport.")
+    try:
+        clean = {key: float(view.get(key, 0.0)) for key in _VIEW_FLOATS}
+        clean["max_iter"] = int(view["max_iter"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise SessionFormatError(f"Session viewport is incomplete ({exc}).") from exc
+    if (not all(math.isfinite(v) for v in clean.values())
+            or clean["span_x"] <= 0 or clean["span_y"] <= 0 or clean["max_iter"] < 1):
+        raise SessionFormatError("Session viewport contains invalid values.")
+    return clean
+
+
+def load_session(path) -> dict:
+    """Return ``{"view", "render", "gradient", "iters"}``.
+
+    ``iters`` is the memory-mapped raw buffer, or None when the session has
+    none or it no longer matches the saved viewport.
+    """
+    path = pathlib.Path(path)
+    try:
+        with open(path, "r", encoding="utf8") as fp:
+            payload = json.load(fp)
+    except (OSError, json.JSONDecodeError) as exc:
+        raise SessionFormatError(f"Could not read session ({exc}).") from exc
+    if not isinstance(payload, dict) or payload.get("format") != SESSION_FORMAT:
+        raise SessionFormatError("Not a MandelPy session file.")
+
+    view = _validate_view(payload.get("view"))
+    render = payload.get("render")
+    if not isinstance(render, dict):
+        render = {}
+    # run the render settings through the same clamps as prefs.json
+    clean = _sanitize_prefs({**render, "gradient": payload.get("gradient")})
+
+    iters = None
+    raw_name = payload.get("raw")
+    if isinstance(raw_name, str) and raw_name:
+        try:
+            iters, meta = load_raw(path.parent / pathlib.Path(raw_name).name)
+        except RawFormatError:
+            iters = None
+        else:
+            if any(meta[key] != view[key] for key in (*_VIEW_FLOATS, "max_iter")):
+                iters = None
+
+    return {
+        "view": view,
+        "render": {key: clean[key] for key in RENDER_PREF_KEYS},
+        "gradient": clean["gradient"],
+        "iters": iters,
+    }
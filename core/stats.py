@@ -0,0 +1,97 @@
+"""Per-frame render statistics and a hook for anyone who wants to log them.
+
+`publish` is called by the canvas after every frame; register a callback
+with `add_stats_listener` to receive the `FrameStats`::
+
+    from core.stats import add_stats_listener
+    add_stats_listener(lambda s: log.info(s._asdict()))
+"""
+import sys
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+# Escaped pixels that bailed out within this many iterations count as
+# "early-out": they cost next to nothing whatever the iteration cap.
+EARLY_OUT_ITERS = 4
+
+_LISTENERS: list[Callable] = []
+_LAST_STATS = None
+
+
+class PixelCounts(NamedTuple):
+    interior: int
+    exterior: int
+    early_out: int
+    iterations: int
+
+
+class FrameStats(NamedTuple):
+    width: int
+    height: int
+    backend: str
+    precision: str
+    reason: str | None
+    max_iter: int
+    render_ms: float            # escape iteration (incl. transfers)
+    color_ms: float             # LUT mapping and distance shading
+    aa_ms: float                # adaptive supersampling pass
+    qimage_ms: float            # numpy → QImage conversion
+    upload_ms: float            # QPixmap conversion and setPixmap
+    interior: int
+    exterior: int               # escaped pixels, early-outs included
+    early_out: int
+    iterations: int             # iterations executed, estimated from smooth counts
+    probe_ms: float = 0.0       # "Auto" quality iteration-cap probe
+
+    @property
+    def total_ms(self) -> float:
+        return (self.probe_ms + self.render_ms + self.color_ms + self.aa_ms
+                + self.qimage_ms + self.upload_ms)
+
+    def summary(self) -> str:
+        """One-line form for the status bar."""
+        parts = [f"render {self.render_ms:.1f}", f"colour {self.color_ms:.1f}"]
+        if self.probe_ms:
+            parts.insert(0, f"probe {self.probe_ms:.1f}")
+        if self.aa_ms:
+            parts.append(f"AA {self.aa_ms:.1f}")
+        parts.append(f"image {self.qimage_ms + self.upload_ms:.1f}")
+        return (f"{self.total_ms:.1f} ms ({', '.join(parts)}) · "
+                f"{self.iterations / 1e6:.1f} M iter · "
+                f"interior {self.interior / max(self.width * self.height, 1):.0%}")
+
+
+def count_pixels(iters: np.ndarray, max_iter: int) -> PixelCounts:
+    """Classify a smooth iteration buffer; interior pixels hold `max_iter`."""
+    interior = int(np.count_nonzero(iters >= max_iter))
+    early_out = int(np.count_nonzero(iters < EARLY_OUT_ITERS))
+    executed = np.minimum(np.ceil(np.maximum(iters, 0.0)), max_iter)
+    return PixelCounts(interior, iters.size - interior, early_out,
+                       int(executed.sum(dtype=np.float64)))
+
+
+def add_stats_listener(fn: Callable[[FrameStats], None]):
+    if fn not in _LISTENERS:
+        _LISTENERS.append(fn)
+
+
+def remove_stats_listener(fn: Callable[[FrameStats], None]):
+    if fn in _LISTENERS:
+        _LISTENERS.remove(fn)
+
+
+def last_frame_stats() -> FrameStats | None:
+    return _LAST_STATS
+
+
+def publish(stats: FrameStats):
+    """Record `stats` as the latest frame and hand it to every listener."""
+    global _LAST_STATS
+    _LAST_STATS = stats
+    for fn in list(_LISTENERS):
+        try:
+            fn(stats)
+        except Exception as exc:
+            # a broken logger must never take the render loop down with it
+            print(f"[MandelPy stats] Listener {fn!r} failed: {exc}", file=sys.stderr)
@@ -0,0 +1,57 @@
+"""Real-axis symmetry of the pixel grid.
+
+The set is symmetric about Im(c) = 0. When the rows of a frame satisfy
+``y[r] == -y[k - r]`` for an integer ``k``, every row past the axis that
+has a partner inside the frame is a copy of that partner, so the engines
+iterate one side and mirror the rest (``lo..hi-1`` below).
+"""
+import math
+
+import numpy as np
+
+# Within this fraction of a row `k` still counts as a whole number.
+MIRROR_ROW_TOLERANCE = 1e-6
+
+
+def mirror_plan_for(k: float, H: int):
+    """``(k, lo, hi)`` if rows ``lo..hi-1`` mirror rows ``k - r``, else None.
+
+    `k` is the (fractional) row index sum ``r + r'`` of mirror-image rows.
+    """
+    if not math.isfinite(k):
+        return None
+    ki = round(k)
+    if abs(k - ki) > MIRROR_ROW_TOLERANCE:
+        return None
+    lo, hi = ki // 2 + 1, min(ki, H - 1) + 1
+    if lo >= hi:
+        return None
+    return ki, lo, hi
+
+
+def mirror_plan(ymin, ymax, H):
+    """Mirror plan for the grid ``ymin + (ymax - ymin) * row / H``."""
+    if not ymin < 0.0 < ymax:
+        return None
+    return mirror_plan_for(-2.0 * ymin * H / (ymax - ymin), H)
+
+
+def apply_mirror(arr: np.ndarray, plan, sign: float = 1.0) -> np.ndarray:
+    """Fill the mirrored rows of `arr` in place (negated for ``sign < 0``)."""
+    k, lo, hi = plan
+    src = arr[k - np.arange(lo, hi)]
+    arr[lo:hi] = src if sign > 0 else -src
+    return arr
+
+
+def axis_snap(cy: float, cy_lo: float, span_y: float, H: int) -> float:
+    """Shift of the centre that makes an axis-straddling grid symmetric.
+
+    Moves the view by at most a quarter of a pixel; 0 when the view does
+    not cross the real axis.
+    """
+    if H < 2 or not abs(cy) < span_y / 2:
+        return 0.0
+    d = span_y / H
+    k = H - 2.0 * (cy / d + cy_lo / d)
+    return (k - round(k)) * d / 2
@@ -0,0 +1,238 @@
+"""Tiled rendering of a frame, nearest-to-the-focus first.
+
+Frames are assembled from square tiles on a pixel lattice per zoom level;
+each tile is rendered as a small frame of its own whose pixel grid
+coincides with the full frame's (``cx + (col - W/2) * dx``), so tiles can
+be computed in any order and pasted into one buffer. `order_tiles` puts
+the tiles around the points the user is looking at (cursor, view centre)
+first.
+
+`TileCache` keeps the rendered tiles, so a view panned by whole pixels
+reuses every tile it shares with earlier frames, or with tiles prefetched
+while idle. The cache is not thread-safe; to render off the GUI thread,
+run `render_tile` on a `TileCache.job` and hand the result to
+`TileCache.store`.
+"""
+import collections
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+from .ddmath import dd_add_float, two_sum
+from .render import render_view
+
+TILE_SIZE = 128
+DEFAULT_CACHE_TILES = 1024      # 64 MiB of iteration tiles at TILE_SIZE
+# how close to a whole pixel a frame must sit to share its level's lattice
+_LATTICE_TOLERANCE = 1e-3
+
+
+class Tile(NamedTuple):
+    row0: int
+    row1: int
+    col0: int
+    col1: int
+
+
+def order_tiles(tiles, foci, rect_of=lambda t: t) -> list:
+    """Sort by distance from the tile centre to the nearest ``(x, y)`` focus.
+
+    `rect_of` maps an entry of `tiles` to its `Tile` rectangle in frame pixels.
+    """
+    foci = list(foci)
+    if not foci:
+        return list(tiles)
+
+    def key(t):
+        r = rect_of(t)
+        x, y = (r.col0 + r.col1) / 2, (r.row0 + r.row1) / 2
+        return min((x - fx) ** 2 + (y - fy) ** 2 for fx, fy in foci)
+
+    return sorted(tiles, key=key)
+
+
+class LatticeTile(NamedTuple):
+    i: int                      # lattice column / row of the tile
+    j: int
+
+
+class FrameLayout(NamedTuple):
+    """Where a W x H frame sits on its level's lattice."""
+    level: tuple                # (dx, dy, max_iter, escape_radius, distance)
+    ox: int                     # lattice pixel of frame column 0 / row 0
+    oy: int
+    W: int
+    H: int
+    tiles: list[LatticeTile]
+
+    def tile_rect(self, t: LatticeTile, size: int = TILE_SIZE) -> Tile:
+        """The part of the frame covered by `t`, in frame pixels."""
+        return Tile(max(t.j * size - self.oy, 0), min((t.j + 1) * size - self.oy, self.H),
+                    max(t.i * size - self.ox, 0), min((t.i + 1) * size - self.ox, self.W))
+
+
+class CacheStats(NamedTuple):
+    lookups: int
+    hits: int
+    prefetched: int             # tiles rendered speculatively
+    prefetch_hits: int          # of those, tiles a frame later used
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    @property
+    def prefetch_yield(self) -> float:
+        return self.prefetch_hits / self.prefetched if self.prefetched else 0.0
+
+
+class TileCache:
+    """LRU cache of lattice tiles, ``(iters, dist)`` per tile.
+
+    Each zoom level (pixel spacing, iteration cap, escape radius, render
+    mode) gets a lattice anchored at the first frame seen at that level;
+    a later frame that is not a whole number of pixels away re-anchors it.
+    """
+
+    def __init__(self, max_tiles: int = DEFAULT_CACHE_TILES, size: int = TILE_SIZE):
+        self.max_tiles = max_tiles
+        self.size = size
+        self._anchors = {}
+        self._tiles = collections.OrderedDict()
+        self._level_tiles = collections.Counter()
+        self._lookups = self._hits = self._prefetched = self._prefetch_hits = 0
+
+    def layout(self, cx, cx_lo, cy, cy_lo, span_x, span_y, W, H,
+               max_iter: int, escape_radius: float, distance: bool,
+               create: bool = True) -> FrameLayout | None:
+        """Place the frame on its level's lattice.
+
+        With ``create=False`` returns None instead of (re-)anchoring the
+        level, which would drop the tiles cached for it.
+        """
+        dx, dy = span_x / W, span_y / H
+        level = (dx, dy, int(max_iter), float(escape_radius), bool(distance))
+        ox = oy = None
+        anchor = self._anchors.get(level)
+        if anchor is not None:
+            ax, ax_lo, ay, ay_lo = anchor
+            ox = self._offset(cx, cx_lo, ax, ax_lo, dx, W)
+            oy = self._offset(cy, cy_lo, ay, ay_lo, dy, H)
+        if ox is None or oy is None:
+            if not create:
+                return None
+            self.drop_level(level)
+            self._anchors[level] = (*dd_add_float(cx, cx_lo, -W / 2 * dx),
+                                    *dd_add_float(cy, cy_lo, -H / 2 * dy))
+            ox = oy = 0
+        n = self.size
+        tiles = [LatticeTile(i, j)
+                 for j in range(oy // n, (oy + H - 1) // n + 1)
+                 for i in range(ox // n, (ox + W - 1) // n + 1)]
+        return FrameLayout(level, ox, oy, W, H, tiles)
+
+    @staticmethod
+    def _offset(c, c_lo, a, a_lo, d, n):
+        hi, err = two_sum(c, -a)
+        px = (hi + (err + c_lo - a_lo)) / d - n / 2
+        k = round(px) if math.isfinite(px) else None
+        if k is None or abs(px - k) > _LATTICE_TOLERANCE:
+            return None
+        return int(k)
+
+    def ring(self, layout: FrameLayout) -> list[LatticeTile]:
+        """The lattice tiles bordering the frame: what a short pan uncovers."""
+        inside = set(layout.tiles)
+        i0, i1 = min(t.i for t in inside) - 1, max(t.i for t in inside) + 1
+        j0, j1 = min(t.j for t in inside) - 1, max(t.j for t in inside) + 1
+        return [LatticeTile(i, j) for j in range(j0, j1 + 1) for i in range(i0, i1 + 1)
+                if LatticeTile(i, j) not in inside]
+
+    def covers(self, layout: FrameLayout) -> bool:
+        return all((layout.level, t) in self._tiles for t in layout.tiles)
+
+    def __contains__(self, item) -> bool:
+        layout, t = item
+        return (layout.level, t) in self._tiles
+
+    def get(self, layout: FrameLayout, t: LatticeTile):
+        """``(iters, dist)`` of a cached tile, or None; counts towards the hit rate."""
+        self._lookups += 1
+        entry = self._tiles.get((layout.level, t))
+        if entry is None:
+            return None
+        self._hits += 1
+        self._tiles.move_to_end((layout.level, t))
+        iters, dist, prefetched = entry
+        if prefetched:
+            self._prefetch_hits += 1
+            self._tiles[(layout.level, t)] = (iters, dist, False)
+        return iters, dist
+
+    def render(self, layout: FrameLayout, t: LatticeTile, prefetch: bool = False):
+        """Render lattice tile `t` and store it; returns ``(iters, dist)``."""
+        job = self.job(layout, t)
+        result = render_tile(*job)
+        self.store(layout, t, job[0], result, prefetch)
+        return result
+
+    def job(self, layout: FrameLayout, t: LatticeTile) -> tuple:
+        """Arguments of `render_tile` for `t`; the render may run on any thread."""
+        return self._anchors[layout.level], layout.level, t, self.size
+
+    def store(self, layout: FrameLayout, t: LatticeTile, anchor: tuple, result,
+              prefetch: bool = False) -> bool:
+        """Keep a tile rendered from `job`; False if its lattice moved since."""
+        if self._anchors.get(layout.level) != anchor:
+            return False
+        iters, dist = result
+        if (layout.level, t) not in self._tiles:
+            self._level_tiles[layout.level] += 1
+        self._tiles[(layout.level, t)] = (iters, dist, prefetch)
+        self._tiles.move_to_end((layout.level, t))
+        if prefetch:
+            self._prefetched += 1
+        while len(self._tiles) > self.max_tiles:
+            (level, _), _ = self._tiles.popitem(last=False)
+            self._level_tiles[level] -= 1
+            if not self._level_tiles[level]:
+                # its last tile is gone: forget the lattice too
+                del self._level_tiles[level]
+                self._anchors.pop(level, None)
+        return True
+
+    def drop_level(self, level):
+        self._anchors.pop(level, None)
+        self._level_tiles.pop(level, None)
+        for key in [k for k in self._tiles if k[0] == level]:
+            del self._tiles[key]
+
+    def clear(self):
+        self._anchors.clear()
+        self._tiles.clear()
+        self._level_tiles.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self._lookups, self._hits, self._prefetched, self._prefetch_hits)
+
+
+def render_tile(anchor: tuple, level: tuple, t: LatticeTile, size: int = TILE_SIZE):
+    """Render tile `t` of the lattice anchored at `anchor`; ``(iters, dist)``."""
+    dx, dy, max_iter, escape_radius, distance = level
+    ax, ax_lo, ay, ay_lo = anchor
+    tcx, tcx_lo = dd_add_float(ax, ax_lo, (t.i * size + size / 2) * dx)
+    tcy, tcy_lo = dd_add_float(ay, ay_lo, (t.j * size + size / 2) * dy)
+    result = render_view(tcx, tcy, size * dx, size * dy, size, size, max_iter,
+                         escape_radius, tcx_lo, tcy_lo, distance=distance)
+    return result if distance else (result, None)
+
+
+def paste_tile(layout: FrameLayout, t: LatticeTile, tile: np.ndarray, out: np.ndarray,
+               size: int = TILE_SIZE) -> Tile:
+    """Copy the part of lattice tile `t` inside the frame into `out`."""
+    rect = layout.tile_rect(t, size)
+    r0, c0 = rect.row0 + layout.oy - t.j * size, rect.col0 + layout.ox - t.i * size
+    out[rect.row0:rect.row1, rect.col0:rect.col1] = \
+        tile[r0:r0 + rect.row1 - rect.row0, c0:c0 + rect.col1 - rect.col0]
+    return rect
@@ -1,27 +1,70 @@
 # main.py
 
+import argparse
 import sys
-from PySide6 import QtWidgets, QtGui
-
-# optional resource module ────────────────────────────────────────────────
-try:
-    import resources_rc           # generated from resources.qrc
-except ModuleNotFoundError:
-    # No embedded resources – continue without them
-    pass
+from PySide6 import QtWidgets, QtGui, QtCore
 
 from core.prefs import APP_NAME
-from ui.mainwindow import MainWindow
+from ui.mainwindow import MainWindow, LOGO_PATH
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog=APP_NAME,
+        description="Mandelbrot explorer. Without options the GUI starts.",
+    )
+    parser.add_argument(
+        "--colorize-raw", nargs=2, metavar=("RAW", "PNG"),
+        help="colour a raw iteration buffer (.npy) into a PNG and exit",
+    )
+    parser.add_argument(
+        "--gradient", metavar="PRESET",
+        help="gradient preset name for --colorize-raw (default: current gradient)",
+    )
+    parser.add_argument(
+        "--profile-frame", action="store_true",
+        help="profile the first full-size frame (report goes to the config directory)",
+    )
+    # anything we don't recognise is left for Qt (-style, -platform, …)
+    return parser.parse_known_args(argv[1:])
+
+def _colorize_raw(args) -> int:
+    from core.gradient import (PresetValidationError, gradient_to_lut,
+                               load_preset_file, preset_path_for_name)
+    from core.prefs import PREFS
+    from core.rawio import RawFormatError, colorize_raw_to_png
+
+    raw, png = args.colorize_raw
+    try:
+        if args.gradient:
+            _, gradient = load_preset_file(preset_path_for_name(args.gradient))
+        else:
+            gradient = PREFS["gradient"]
+        colorize_raw_to_png(raw, png, gradient_to_lut(gradient))
+    except (PresetValidationError, RawFormatError, OSError) as exc:
+        print(f"[{APP_NAME}] {exc}", file=sys.stderr)
+        return 1
+    print(f"[{APP_NAME}] Wrote {png}")
+    return 0
 
 def main():
-    app = QtWidgets.QApplication(sys.argv)
+    args, qt_args = _parse_args(sys.argv)
+    if args.colorize_raw:
+        sys.exit(_colorize_raw(args))
+
+    app = QtWidgets.QApplication(sys.argv[:1] + qt_args)
     app.setOrganizationName("GlobileShop LLC")
     app.setApplicationName(APP_NAME)
     # optional: set a global window icon
-    app.setWindowIcon(QtGui.QIcon(":/assets/logo.png"))
+    app.setWindowIcon(QtGui.QIcon(str(LOGO_PATH)))
     
     win = MainWindow()
     win.show()
+    if args.profile_frame:
+        def _profile_first_frame():
+            win.canvas.profile_next_frame()
+            win.canvas.full_render()
+        # once the window has its real size
+        QtCore.QTimer.singleShot(0, _profile_first_frame)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
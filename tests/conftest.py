@@ -0,0 +1,40 @@
+import atexit
+import os
+import pathlib
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+# run from anywhere: the packages live at the repository root
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+# prefs.json, the probe and launch caches and the JIT cache go to a
+# throwaway directory, never the user's config (set before core is imported)
+_CONFIG_DIR = tempfile.mkdtemp(prefix="mandelpy-tests-")
+os.environ["MANDELPY_CONFIG_DIR"] = _CONFIG_DIR
+atexit.register(shutil.rmtree, _CONFIG_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def on_cuda(request):
+    """True to run the test body here, on a GPU or the CUDA simulator.
+
+    numba only reads NUMBA_ENABLE_CUDASIM at import, so without a CUDA
+    backend the test is run again in a subprocess with the simulator on;
+    the fixture asserts that passed and returns False.
+    """
+    from core import render
+    if render._cuda_ready():
+        return True
+    if os.environ.get("NUMBA_ENABLE_CUDASIM") == "1":
+        pytest.skip(f"CUDA simulator unavailable: {render._cuda_failure_reason()}")
+    env = {**os.environ, "NUMBA_ENABLE_CUDASIM": "1"}
+    env.pop("CUDA_VISIBLE_DEVICES", None)
+    run = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", request.node.nodeid],
+        cwd=request.config.rootpath, env=env, capture_output=True, text=True)
+    assert run.returncode == 0, run.stdout + run.stderr
+    return False
@@ -0,0 +1,45 @@
+import json
+
+import numpy as np
+
+from core.animation import View, ZoomExport, export_zoom_sequence
+
+LUT = np.linspace(0, 255, 256 * 3).reshape(256, 3).astype(np.uint8)
+START = View(-0.75, 0.0, 3.5, 2.625)
+END = View(-0.7436, 0.1318, 0.05, 0.0375)
+
+
+def test_export_writes_frames_and_manifest(tmp_path):
+    out = tmp_path / "zoom"
+    manifest = export_zoom_sequence(out, START, END, 6, 32, 24, 128, 4.0, LUT)
+    data = json.loads(manifest.read_text(encoding="utf8"))
+    assert [f["file"] for f in data["frames"]] == sorted(p.name for p in out.glob("*.png"))
+
+
+def test_cancel_removes_written_frames(tmp_path):
+    out = tmp_path / "zoom"
+    job = ZoomExport(out, START, END, 12, 32, 24, 128, 4.0, LUT, keyframes=False)
+    while not any(out.glob("*.png")):
+        job.wait(0.1)
+    job.cancel()        # nothing polled yet, so no manifest either
+    while not job.poll():
+        job.wait(0.1)
+    assert job.manifest is None
+    assert not out.exists()
+
+
+def test_keyframes_are_released_once_their_frames_are_written(tmp_path):
+    out = tmp_path / "zoom"
+    job = ZoomExport(out, START, END, 24, 32, 24, 128, 4.0, LUT, workers=2)
+    assert len(job.keys) > 2
+    held = set()
+    while not job.poll():
+        for j in job._key_images:
+            # held only while some frame derived from it is still to come
+            assert job._key_left[j] > 0
+            held.add(j)
+        for j in held - set(job._key_images):
+            assert all((out / job.names[n]).exists() for n in job._key_frames[j])
+        job.wait(0.1)
+    assert job._key_left == [0] * len(job.keys)
+    assert len(list(out.glob("*.png"))) == 24
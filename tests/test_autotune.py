@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from core import autotune, prefs
+
+
+def _timer(times: dict, calls: list | None = None):
+    def time_fn(block):
+        if calls is not None:
+            calls.append(block)
+        t = times[block]
+        if isinstance(t, Exception):
+            raise t
+        return t
+    return time_fn
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(autotune, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(autotune, "CACHE_FILE", tmp_path / "cuda_launch.json")
+    return tmp_path / "cuda_launch.json"
+
+
+def test_fastest_shape_wins():
+    times = {(16, 16): 3.0, (8, 32): 1.0, (32, 8): 2.0}
+    assert autotune.select_block_shape(_timer(times), list(times)) == (8, 32)
+
+
+def test_best_of_repeats_is_used():
+    runs = iter([5.0, 0.5, 5.0, 1.0, 1.0, 1.0])
+    assert autotune.select_block_shape(lambda block: next(runs),
+                                       [(16, 16), (8, 32)], repeats=3) == (16, 16)
+
+
+def test_ties_keep_the_earlier_candidate():
+    times = {(32, 8): 1.0, (16, 16): 1.0, (8, 32): 2.0}
+    assert autotune.select_block_shape(_timer(times), list(times)) == (32, 8)
+
+
+def test_failing_shapes_are_skipped():
+    times = {(32, 32): RuntimeError("too many resources"), (8, 16): 2.0}
+    assert autotune.select_block_shape(_timer(times), list(times)) == (8, 16)
+    everything_fails = {(32, 32): RuntimeError("no device")}
+    assert autotune.select_block_shape(_timer(everything_fails),
+                                       list(everything_fails)) == autotune.DEFAULT_BLOCK
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("16x16", (16, 16)),
+    (" 8 X 32 ", (8, 32)),
+    ([32, 32], (32, 32)),
+    ("64x32", None),            # more threads than a block may hold
+    ("0x16", None),
+    ("16x16x1", None),
+    ("wide", None),
+    (None, None),
+    (16, None),
+])
+def test_parse_block(value, expected):
+    assert autotune.parse_block(value) == expected
+
+
+def test_block_is_tuned_once_and_persisted(cache):
+    calls = []
+    times = {b: 1.0 for b in autotune.CANDIDATE_BLOCKS}
+    times[(32, 8)] = 0.5
+    assert autotune.block_for_device("GPU A", _timer(times, calls)) == (32, 8)
+    assert json.loads(cache.read_text(encoding="utf8")) == {"GPU A": "32x8"}
+
+    calls.clear()
+    assert autotune.block_for_device("GPU A", _timer(times, calls)) == (32, 8)
+    assert calls == []          # reloaded from cuda_launch.json
+    assert autotune.block_for_device("GPU B", _timer(times, calls)) == (32, 8)
+    assert calls
+    assert set(json.loads(cache.read_text(encoding="utf8"))) == {"GPU A", "GPU B"}
+
+
+def test_invalid_cached_shape_is_retuned(cache):
+    cache.write_text(json.dumps({"GPU A": "4096x4096"}), encoding="utf8")
+    times = {b: 1.0 for b in autotune.CANDIDATE_BLOCKS}
+    times[(8, 16)] = 0.1
+    assert autotune.block_for_device("GPU A", _timer(times)) == (8, 16)
+    assert json.loads(cache.read_text(encoding="utf8")) == {"GPU A": "8x16"}
+
+
+@pytest.mark.parametrize("value", ["16x16", " 8 X 32 ", "64x32", "0x16", "wide", "Auto"])
+def test_prefs_validate_cuda_block_with_the_same_parser(value):
+    block = autotune.parse_block(value)
+    expected = autotune.format_block(block) if block else prefs.DEFAULT_PREFS["cuda_block"]
+    assert prefs._sanitize_cuda_block(value) == expected
@@ -0,0 +1,44 @@
+import pytest
+
+from core import cudaprobe
+
+KEY = {"driver": 12040, "numba": "0.60.0", "numba-cuda": None,
+       "python": "3.11.9", "env": {}}
+OK = cudaprobe.ProbeResult(True, "GPU A", (8, 6))
+FAILED = cudaprobe.ProbeResult(False, reason="CUDA_ERROR_OUT_OF_MEMORY")
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cudaprobe, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(cudaprobe, "CACHE_FILE", tmp_path / "cuda_probe.json")
+
+
+def _later(monkeypatch, seconds):
+    now = cudaprobe.time.time()
+    monkeypatch.setattr(cudaprobe.time, "time", lambda: now + seconds)
+
+
+def test_success_is_reused(monkeypatch):
+    cudaprobe.store(KEY, OK)
+    _later(monkeypatch, 30 * 24 * 3600)
+    assert cudaprobe.load_cached(KEY) == OK
+
+
+def test_failure_expires(monkeypatch):
+    cudaprobe.store(KEY, FAILED)
+    assert cudaprobe.load_cached(KEY) == FAILED
+    _later(monkeypatch, cudaprobe.FAILURE_TTL_S + 1)
+    assert cudaprobe.load_cached(KEY) is None
+
+
+def test_failure_without_driver_is_kept(monkeypatch):
+    key = {**KEY, "driver": None}
+    cudaprobe.store(key, FAILED)
+    _later(monkeypatch, 30 * 24 * 3600)
+    assert cudaprobe.load_cached(key) == FAILED
+
+
+def test_other_environment_misses():
+    cudaprobe.store(KEY, OK)
+    assert cudaprobe.load_cached({**KEY, "driver": 12050}) is None
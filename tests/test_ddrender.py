@@ -0,0 +1,28 @@
+"""The double-double engine against float64 where both resolve the view."""
+import numpy as np
+import pytest
+
+from core.ddrender import dd_render
+from core.render import get_renderer_state, render_view
+
+W, H, MAX_ITER = 64, 48, 500
+
+
+@pytest.mark.parametrize("cx, cy, span_x", [
+    (-0.74364, 0.13182, 1e-6),
+    (-1.25066, 0.02012, 1e-5),
+])
+def test_dd_matches_float64_render_view(cx, cy, span_x):
+    span_y = span_x * H / W
+    f64 = render_view(cx, cy, span_x, span_y, W, H, MAX_ITER, 4.0)
+    state = get_renderer_state()
+    assert state.precision == "float64"
+    dd = dd_render(cx, 0.0, cy, 0.0, span_x, span_y, W, H, MAX_ITER, 4.0)
+    escaped = f64 < MAX_ITER
+    assert escaped.mean() > 0.2
+    # the CPU float engine counts escapes one lower than dd and the kernels
+    expected = f64 + np.where(escaped & (state.backend != "CUDA"), 1.0, 0.0)
+    off = np.abs(dd - expected)
+    assert np.median(off) < 1e-4
+    assert (off < 1e-2).mean() > 0.98
+    assert ((dd < MAX_ITER) == escaped).mean() > 0.99
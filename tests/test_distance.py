@@ -0,0 +1,48 @@
+"""Exterior distance estimation against known distances and across backends."""
+import numpy as np
+
+from core.gradient import shade_by_distance
+from core.render import _cpu_escape, _cpu_render, cuda_render, get_renderer_state
+
+MAX_ITER = 2000
+
+
+def test_cpu_distance_on_the_real_axis():
+    # Outside [-2, 1/4] on the real axis the nearest point of the set is an
+    # end of that segment. The estimate is within a factor of 4 of the true
+    # distance, from above (Koebe 1/4), once the escape radius is large.
+    # Points right by the cusp at 1/4 escape too slowly for that to hold.
+    xs = np.r_[np.linspace(0.5, 2.0, 16), np.linspace(-3.0, -2.01, 12)]
+    true = np.where(xs > 0, xs - 0.25, -2.0 - xs)
+    iters, dist = _cpu_escape(xs.astype(np.complex128), MAX_ITER, 1e3, distance=True)
+    assert (iters < MAX_ITER).all()
+    ratio = dist / true
+    assert ratio.min() > 0.95 and ratio.max() < 4.0
+
+
+def test_cpu_distance_is_zero_inside_and_shading_keeps_interior():
+    box = (-0.9, 0.5, -0.7, 0.7)
+    iters, dist = _cpu_render(*box, 40, 40, 300, 4.0, distance=True)
+    inside = iters >= 300
+    assert inside.any() and (~inside).any()
+    assert (dist[inside] == 0).all() and (dist[~inside] > 0).all()
+
+    colors = np.full((40, 40, 3), 200, dtype=np.uint8)
+    shaded = shade_by_distance(colors, iters, dist, 300, pixel_size=1.4 / 40)
+    np.testing.assert_array_equal(shaded[inside], colors[inside])
+    far = dist >= 2 * 1.4 / 40
+    np.testing.assert_array_equal(shaded[far], colors[far])
+    assert (shaded[~inside & ~far] < 200).all()
+
+
+def test_cuda_distance_matches_cpu(on_cuda):
+    if not on_cuda:
+        return
+    box, W, H = (-2.0, 0.75, -1.2, 1.2), 48, 40
+    iters, dist = cuda_render(*box, W, H, 300, 4.0, distance=True)
+    assert get_renderer_state().backend == "CUDA"
+    cpu_iters, cpu_dist = _cpu_render(*box, W, H, 300, 4.0, distance=True)
+    escaped = cpu_iters < 300
+    np.testing.assert_array_equal(iters < 300, escaped)
+    assert (dist[~escaped] == 0).all()
+    np.testing.assert_allclose(dist[escaped], cpu_dist[escaped], rtol=1e-5)
@@ -0,0 +1,74 @@
+"""Poster export: banded PNG streaming against a single render."""
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from core.export import PngStreamWriter, export_poster
+from core.gradient import colorize, gradient_to_lut
+from core.prefs import DEFAULT_PREFS
+from core.render import render_view
+
+LUT = gradient_to_lut(DEFAULT_PREFS["gradient"])
+VIEW = (-0.7436, 0.1318, 0.02, 0.015)
+AXIS_VIEW = (-0.6, 0.013, 3.0, 2.34375)     # bands get their own mirror plans
+W, H, MAX_ITER = 64, 50, 300
+
+
+def _read_png(path) -> np.ndarray:
+    data = path.read_bytes()
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    pos, idat, size = 8, b"", None
+    while pos < len(data):
+        n, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + n]
+        assert struct.unpack(">I", data[pos + 8 + n:pos + 12 + n])[0] == zlib.crc32(kind + body)
+        if kind == b"IHDR":
+            size = struct.unpack(">II", body[:8])
+        elif kind == b"IDAT":
+            idat += body
+        pos += 12 + n
+    w, h = size
+    raw = np.frombuffer(zlib.decompress(idat), dtype=np.uint8).reshape(h, w * 3 + 1)
+    assert not raw[:, 0].any()          # filter type 0 on every row
+    return raw[:, 1:].reshape(h, w, 3)
+
+
+@pytest.mark.parametrize("view", [VIEW, AXIS_VIEW])
+@pytest.mark.parametrize("band_rows", [7, 16, H])
+def test_banded_poster_matches_one_render(tmp_path, view, band_rows):
+    path = tmp_path / "poster.png"
+    seen = []
+    assert export_poster(path, *view, W, H, MAX_ITER, 4.0, LUT, band_rows=band_rows,
+                         progress=lambda done, total: seen.append(done))
+    assert seen == list(range(band_rows, H, band_rows)) + [H]
+    poster = _read_png(path)
+    single = colorize(render_view(*view, W, H, MAX_ITER, 4.0), MAX_ITER, LUT)
+    # continuous at the seams: the rows either side of each match the frame
+    for r0 in range(band_rows, H, band_rows):
+        np.testing.assert_array_equal(poster[r0 - 1:r0 + 1], single[r0 - 1:r0 + 1])
+    np.testing.assert_array_equal(poster, single)
+
+
+def test_cancelled_poster_is_removed(tmp_path):
+    path = tmp_path / "poster.png"
+    calls = []
+
+    def cancelled():
+        calls.append(1)
+        return len(calls) > 2           # after two bands
+
+    assert not export_poster(path, *VIEW, W, H, MAX_ITER, 4.0, LUT, band_rows=10,
+                             cancelled=cancelled)
+    assert not path.exists()
+
+
+def test_writer_rejects_a_short_image(tmp_path):
+    path = tmp_path / "short.png"
+    with pytest.raises(ValueError):
+        with PngStreamWriter(path, 4, 3) as writer:
+            writer.write_rows(np.zeros((2, 4, 3), dtype=np.uint8))
+    with pytest.raises(ValueError), PngStreamWriter(path, 4, 3) as writer:
+        writer.write_rows(np.zeros((2, 5, 3), dtype=np.uint8))
+    assert not path.exists()            # aborted on the error
@@ -0,0 +1,63 @@
+"""The float32 tier must not be chosen where it visibly disagrees with float64."""
+import numpy as np
+import pytest
+
+from core.gradient import colorize, gradient_to_lut
+from core.prefs import DEFAULT_PREFS
+from core.render import (_FLOAT32_EPS, _FLOAT32_ITER_MARGIN,
+                         _FLOAT64_MIN_REL_SPACING, _cpu_render,
+                         choose_precision, get_renderer_state,
+                         precision_for_view, render_view)
+
+W, H = 160, 120
+
+
+@pytest.mark.parametrize("cx, cy", [(-0.743643887, 0.131825904), (-1.25066, 0.02012)])
+@pytest.mark.parametrize("max_iter", [256, 1024, 4096])
+def test_float32_agrees_with_float64_at_threshold(cx, cy, max_iter):
+    rel = _FLOAT32_ITER_MARGIN * _FLOAT32_EPS * max_iter * 1.001
+    spacing = 2.0 * rel
+    for _ in range(20):     # the scale depends on the box the spacing spans
+        spacing = rel * max(abs(cx) + spacing * W / 2, abs(cy) + spacing * H / 2, 2.0)
+    box = (cx - spacing * W / 2, cx + spacing * W / 2,
+           cy - spacing * H / 2, cy + spacing * H / 2)
+    assert choose_precision(*box, W, H, max_iter) == "float32"
+
+    f32 = _cpu_render(*box, W, H, max_iter, 4.0, "float32")
+    f64 = _cpu_render(*box, W, H, max_iter, 4.0, "float64")
+    # boundary pixels with chaotic orbits differ at any zoom; keep it to them
+    assert (np.abs(f32 - f64) > 1.0).mean() < 0.01
+    lut = gradient_to_lut(DEFAULT_PREFS["gradient"])
+    colour_err = np.abs(colorize(f32, max_iter, lut).astype(int)
+                        - colorize(f64, max_iter, lut)).max(axis=2)
+    assert (colour_err > 24).mean() < 0.005
+
+
+def test_float32_cutoff_scales_with_iterations():
+    box = (-1.0, -0.5, -0.1, 0.275)
+    assert choose_precision(*box, 800, 600, 64) == "float32"
+    assert choose_precision(*box, 800, 600, 4096) == "float64"
+
+
+@pytest.mark.parametrize("cx", [0.0, -1.5, 3.0])
+def test_double_double_takes_over_below_float64_spacing(cx):
+    scale = max(abs(cx) + 1e-9, 2.0)    # spacing is judged against at least 2
+    edge = _FLOAT64_MIN_REL_SPACING * scale
+
+    def tier(spacing):
+        return precision_for_view(cx, 0.0, spacing * W, spacing * H, W, H, 1000)
+
+    assert tier(edge * 1.01) == "float64"
+    assert tier(edge * 0.99) == "double-double"
+
+
+def test_render_view_reports_the_tier_it_used():
+    cx, cy = -0.743643887037151, 0.131825904205330
+    render_view(cx, cy, 1e-9, 1e-9 * H / W, W, H, 200, 4.0)
+    assert get_renderer_state().precision == "float64"
+    render_view(cx, cy, 1e-15, 1e-15 * H / W, W, H, 200, 4.0)
+    state = get_renderer_state()
+    assert state.precision == "double-double" and state.reason is None
+    # past what double-double resolves it still renders, but says so
+    render_view(cx, cy, 1e-31, 1e-31 * H / W, W, H, 200, 4.0)
+    assert get_renderer_state().reason == "view is deeper than double-double precision"
@@ -0,0 +1,46 @@
+import numpy as np
+
+from core.rawio import crop_raw, load_raw, sample_raw, save_raw
+
+
+def test_sample_raw_fits_the_widget_and_keeps_aspect(tmp_path):
+    iters = np.arange(600 * 800, dtype=np.float32).reshape(600, 800)
+    path = save_raw(tmp_path / "big", iters, max_iter=100, escape_radius=2.0,
+                    cx=-0.5, cy=0.0, span_x=3.0, span_y=2.25)
+    mapped, _ = load_raw(path)
+    small = sample_raw(mapped, 200, 400)
+    assert small.shape == (150, 200)
+    assert not isinstance(small, np.memmap)
+    # nearest samples of the source grid
+    assert small[0, 0] == iters[2, 2] and small[-1, -1] == iters[598, 798]
+
+
+def test_sample_raw_leaves_small_buffers_alone():
+    iters = np.ones((30, 40), dtype=np.float32)
+    assert sample_raw(iters, 800, 600).shape == (30, 40)
+
+
+def test_crop_raw_keeps_pixels_square_in_a_widget_of_another_aspect(tmp_path):
+    # 3:1 buffer into a 4:3 widget: the middle 4:3 of the columns is shown
+    iters = np.tile(np.arange(600, dtype=np.float32), (200, 1))
+    path = save_raw(tmp_path / "wide", iters, max_iter=100, escape_radius=2.0,
+                    cx=-0.5, cy=0.25, span_x=3.0, span_y=1.0, cx_lo=1e-20)
+    mapped, meta = load_raw(path)
+    sample, view = crop_raw(mapped, meta, 160, 120)
+    assert sample.shape == (120, 160)
+    assert view["span_x"] / view["span_y"] == 267 / 200
+    assert view["span_x"] / 267 == meta["span_x"] / 600
+    # the crop spans columns 166..432; its centre is half a pixel left
+    assert sample[0, 0] == 166 and sample[0, -1] == 432
+    assert view["cx"] + view["cx_lo"] == -0.5 - 0.5 * 3.0 / 600
+    assert (view["cy"], view["cy_lo"], view["max_iter"]) == (0.25, 0.0, 100)
+
+
+def test_crop_raw_trims_rows_of_a_tall_buffer():
+    iters = np.tile(np.arange(90, dtype=np.float32)[:, None], (1, 40))
+    meta = {"cx": 0.0, "cx_lo": 0.0, "cy": 0.0, "cy_lo": 0.0,
+            "span_x": 0.4, "span_y": 0.9}
+    sample, view = crop_raw(iters, meta, 800, 400)
+    assert sample.shape == (20, 40)
+    assert sample[0, 0] == 35 and sample[-1, 0] == 54
+    assert view["span_y"] == 20 * 0.01 and view["cy"] == 0.0
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from core.gradient import gradient_to_lut
+from core.prefs import DEFAULT_PREFS
+from core.refine import Refinement
+from core.render import render_view
+
+VIEW = (-0.74364, 0.13182, 0.004, 0.003)
+W, H = 64, 48
+LUT = gradient_to_lut(DEFAULT_PREFS["gradient"])
+
+
+def _run(r: Refinement):
+    for _ in range(1000):
+        if r.done:
+            return r
+        r.step(0.05)
+    raise AssertionError("refinement did not finish")
+
+
+@pytest.mark.parametrize("aa_level", [1, 4])
+def test_aa_stops_at_the_configured_level(aa_level):
+    iters = render_view(*VIEW, W, H, 200, 4.0)
+    r = _run(Refinement(iters, None, *VIEW, 200, 4.0, LUT, aa_level=aa_level))
+    assert r.samples == aa_level
+    assert r.resampled == 0 if aa_level == 1 else r.resampled > 0
+
+
+def test_iteration_pass_redoes_the_shown_aa():
+    iters = render_view(*VIEW, W, H, 100, 4.0)
+    r = _run(Refinement(iters, None, *VIEW, 100, 4.0, LUT, target_iter=200,
+                        aa_level=4, shown_aa=4))
+    # the raised cap recolours every pixel, so its AA has to be redone
+    assert r.max_iter == 200 and r.samples == 4
@@ -0,0 +1,74 @@
+"""Raising the cap by continuing orbits must match rendering at that cap."""
+import numpy as np
+import pytest
+
+from core import render
+from core.ddrender import dd_render
+from core.gradient import gradient_to_lut
+from core.prefs import DEFAULT_PREFS
+from core.refine import Refinement
+from core.render import render_state, resume_render
+
+W, H = 48, 36
+BOXES = [
+    (-2.0, 0.75, -1.2, 1.2),                # straddles the axis (mirrored rows)
+    (-0.7446, -0.7426, 0.1310, 0.1325),     # off the axis
+]
+
+
+def _assert_same(a_iters, a_state, b_iters, b_state):
+    np.testing.assert_array_equal(a_iters, b_iters)
+    np.testing.assert_array_equal(a_state.idx, b_state.idx)
+    np.testing.assert_array_equal(a_state.zr, b_state.zr)
+    np.testing.assert_array_equal(a_state.zi, b_state.zi)
+    assert a_state.n == b_state.n
+
+
+@pytest.mark.parametrize("box", BOXES)
+def test_cpu_resume_matches_direct_render(monkeypatch, box):
+    monkeypatch.setattr(render, "_cuda_ready", lambda: False)
+    iters, state = render_state(*box, W, H, 100, 4.0)
+    assert state.backend == "CPU" and state.idx.size
+    resumed = resume_render(iters, state, 400)
+    _assert_same(*resumed, *render_state(*box, W, H, 400, 4.0))
+    # in steps, and a cap at or below the state's leaves it alone
+    stepped = resume_render(*resume_render(iters, state, 250), 400)
+    _assert_same(*stepped, *resumed)
+    assert resume_render(iters, state, 100)[1] is state
+
+
+def test_cuda_state_resumed_on_cpu_keeps_the_kernel_count(monkeypatch):
+    monkeypatch.setattr(render, "_cuda_ready", lambda: False)
+    box = BOXES[1]
+    iters, state = render_state(*box, W, H, 100, 4.0)
+    direct, _ = render_state(*box, W, H, 400, 4.0)
+    # as if the CUDA kernels had rendered it: escaped pixels count one higher
+    kernel_iters = np.where(iters < 100, iters + 1.0, iters)
+    resumed, _ = resume_render(kernel_iters, state._replace(backend="CUDA"), 400)
+    np.testing.assert_array_equal(resumed, np.where(direct < 400, direct + 1.0, direct))
+
+
+@pytest.mark.parametrize("box", BOXES)
+def test_cuda_resume_matches_direct_render(on_cuda, box):
+    if not on_cuda:
+        return
+    iters, state = render_state(*box, W, H, 100, 4.0)
+    assert state.backend == "CUDA"
+    direct = render_state(*box, W, H, 400, 4.0)
+    resumed = resume_render(iters, state, 400)
+    np.testing.assert_allclose(resumed[0], direct[0], atol=1e-4)
+    np.testing.assert_array_equal(resumed[1].idx, direct[1].idx)
+
+
+def test_double_double_refinement_matches_direct_render():
+    # EscapeState is float64 only; deeper views raise the cap via render_points
+    cx, cy, span_x, span_y = 0.3602404434376143632, 0.6413130610648132, 4e-14, 3e-14
+    iters = dd_render(cx, 0.0, cy, 0.0, span_x, span_y, W, H, 800, 4.0)
+    r = Refinement(iters, None, cx, cy, span_x, span_y, 800, 4.0,
+                   gradient_to_lut(DEFAULT_PREFS["gradient"]),
+                   precision="double-double", target_iter=3200)
+    while r.max_iter < 3200:
+        r.step(0.05)
+    direct = dd_render(cx, 0.0, cy, 0.0, span_x, span_y, W, H, 3200, 4.0)
+    assert (iters < 800).any() and ((iters >= 800) & (direct < 3200)).any()
+    np.testing.assert_allclose(r.iters, direct, atol=1e-4)
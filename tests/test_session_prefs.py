@@ -0,0 +1,44 @@
+"""Opening a session must not leak its settings into prefs.json."""
+import json
+
+import pytest
+
+from core import prefs
+
+
+@pytest.fixture
+def fresh_prefs(tmp_path, monkeypatch):
+    monkeypatch.setattr(prefs, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(prefs, "CONFIG_FILE", tmp_path / "prefs.json")
+    monkeypatch.setattr(prefs, "_SESSION_OVERRIDES", {})
+    user = prefs._sanitize_prefs({**prefs.DEFAULT_PREFS, "quality": "Low",
+                                  "escape_radius": 2.0})
+    monkeypatch.setattr(prefs, "PREFS", user)
+    return user
+
+
+def _saved():
+    with open(prefs.CONFIG_FILE, encoding="utf8") as fp:
+        return json.load(fp)
+
+
+def test_session_settings_are_not_saved(fresh_prefs):
+    prefs.apply_session_prefs({"quality": "Ultra", "escape_radius": 8.0})
+    assert fresh_prefs["quality"] == "Ultra"
+    prefs.save_prefs(fresh_prefs)
+    saved = _saved()
+    assert saved["quality"] == "Low"
+    assert saved["escape_radius"] == 2.0
+
+
+def test_settings_changed_after_the_session_are_saved(fresh_prefs):
+    prefs.apply_session_prefs({"quality": "Ultra", "escape_radius": 8.0})
+    prefs.apply_session_prefs({"quality": "High"})
+    fresh_prefs["escape_radius"] = 4.0
+    prefs.save_prefs(fresh_prefs)
+    saved = _saved()
+    assert saved["quality"] == "Low"        # the user's, not the first session's
+    assert saved["escape_radius"] == 4.0
+    fresh_prefs["escape_radius"] = 8.0      # no longer held for the session
+    prefs.save_prefs(fresh_prefs)
+    assert _saved()["escape_radius"] == 8.0
@@ -0,0 +1,62 @@
+"""Mirrored rows must equal what iterating them would have given."""
+import numpy as np
+import pytest
+
+from core import ddrender, render
+from core.render import _cpu_render
+from core.symmetry import axis_snap, mirror_plan
+
+W = 40
+MAX_ITER = 300
+
+
+def _views(seed, straddle, n=6):
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        H = int(rng.integers(20, 41))           # odd and even heights
+        span_x = 10 ** rng.uniform(-3, 0.5)
+        span_y = span_x * H / W
+        cx = rng.uniform(-1.8, 0.3)
+        cy = rng.uniform(-0.4, 0.4) * span_y if straddle else rng.uniform(0.6, 2.0) * span_y
+        cy += axis_snap(cy, 0.0, span_y, H)
+        yield cx, cy, span_x, span_y, H
+
+
+def _unmirrored(monkeypatch, module, name):
+    monkeypatch.setattr(module, name, lambda *args: None)
+
+
+@pytest.mark.parametrize("straddle", [True, False])
+def test_cpu_mirroring_matches_brute_force(monkeypatch, straddle):
+    heights = set()
+    for cx, cy, span_x, span_y, H in _views(1, straddle):
+        box = (cx - span_x / 2, cx + span_x / 2, cy - span_y / 2, cy + span_y / 2)
+        assert (mirror_plan(*box[2:], H) is not None) == straddle
+        heights.add(H % 2)
+        with monkeypatch.context() as m:
+            mirrored = _cpu_render(*box, W, H, MAX_ITER, 4.0)
+            _unmirrored(m, render, "mirror_plan")
+            np.testing.assert_array_equal(mirrored, _cpu_render(*box, W, H, MAX_ITER, 4.0))
+    assert heights == {0, 1}
+
+
+@pytest.mark.parametrize("straddle", [True, False])
+def test_dd_mirroring_matches_brute_force(monkeypatch, straddle):
+    for cx, cy, span_x, span_y, H in _views(2, straddle):
+        args = (cx, 0.0, cy, 0.0, span_x, span_y, W, H, MAX_ITER, 4.0)
+        plan = ddrender.mirror_plan_for(H - 2.0 * cy / (span_y / H), H)
+        assert (abs(cy) < span_y / 2 and plan is not None) == straddle
+        with monkeypatch.context() as m:
+            mirrored = ddrender.dd_render(*args)
+            _unmirrored(m, ddrender, "mirror_plan_for")
+            np.testing.assert_array_equal(mirrored, ddrender.dd_render(*args))
+
+
+@pytest.mark.parametrize("H", [7, 8])
+def test_axis_snap_makes_the_grid_symmetric(H):
+    span_y = 0.3
+    for cy in (0.0123, -0.0456, 0.1):
+        snapped = cy + axis_snap(cy, 0.0, span_y, H)
+        assert abs(snapped - cy) <= span_y / H / 4 + 1e-15
+        assert mirror_plan(snapped - span_y / 2, snapped + span_y / 2, H) is not None
+    assert axis_snap(1.0, 0.0, span_y, H) == 0.0        # off the axis: left alone
@@ -0,0 +1,44 @@
+from core.tiles import TileCache, render_tile
+
+
+def _layout(cache, span, create=True):
+    return cache.layout(-0.75, 0.0, 0.0, 0.0, span, span * 0.75, 32, 24,
+                        64, 4.0, False, create=create)
+
+
+def test_evicting_a_levels_last_tile_drops_its_anchor():
+    cache = TileCache(max_tiles=2, size=16)
+    old = _layout(cache, 3.0)
+    cache.render(old, old.tiles[0])
+    for span in (1.0, 0.5):
+        new = _layout(cache, span)
+        cache.render(new, new.tiles[0])
+    assert len(cache._anchors) == 2
+    assert _layout(cache, 3.0, create=False) is None
+
+
+def test_anchor_stays_while_its_level_has_tiles():
+    cache = TileCache(max_tiles=3, size=16)
+    a = _layout(cache, 3.0)
+    cache.render(a, a.tiles[0])
+    cache.render(a, a.tiles[1])
+    b = _layout(cache, 1.0)
+    cache.render(b, b.tiles[0])
+    cache.render(b, b.tiles[1])        # evicts one of level a's two tiles
+    assert _layout(cache, 3.0, create=False) is not None
+    assert (a, a.tiles[1]) in cache
+
+
+def test_store_drops_tiles_of_a_lattice_that_moved():
+    cache = TileCache(size=16)
+    a = _layout(cache, 3.0)
+    job = cache.job(a, a.tiles[0])
+    result = render_tile(*job)
+    # a third of a pixel off the lattice: the level is re-anchored
+    moved = cache.layout(-0.75 + 3.0 / 32 / 3, 0.0, 0.0, 0.0, 3.0, 2.25, 32, 24,
+                         64, 4.0, False)
+    assert not cache.store(a, a.tiles[0], job[0], result)
+    assert (moved, moved.tiles[0]) not in cache
+    job = cache.job(moved, moved.tiles[0])
+    assert cache.store(moved, moved.tiles[0], job[0], render_tile(*job))
+    assert cache.get(moved, moved.tiles[0]) is not None
@@ -4,9 +4,14 @@ __all__ = [
     "PrefsDialog",
     "GradientDialog",
     "GradientPresetsDialog",
+    "ExportDialog",
+    "AnimationDialog",
 ]
 
 from .canvas     import MandelbrotCanvas
 from .mainwindow import MainWindow
-from .dialogs    import PrefsDialog, GradientDialog, GradientPresetsDialog
+from .dialogs    import (
+    PrefsDialog, GradientDialog, GradientPresetsDialog, ExportDialog,
+    AnimationDialog,
+)
 from .focalmap   import FocalMap
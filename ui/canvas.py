@@ -1,9 +1,59 @@
 from PySide6 import QtWidgets, QtGui, QtCore
 import numpy as np
-from core.render   import cuda_render, get_renderer_state
-from core.gradient import gradient_to_lut
+from core.render   import (render_view, get_renderer_state, precision_for_view,
+                           auto_iteration_cap, render_state, resume_render)
+from core.ddmath   import dd_add_float
+from core.symmetry import axis_snap
+from core.tiles    import TileCache, order_tiles, paste_tile, render_tile
+from core.gradient import gradient_to_lut, colorize, shade_by_distance
+from core.antialias import supersample
+from core.refine   import Refinement
+from core.rawio    import crop_raw
 from core.prefs    import PREFS
+from core.stats    import FrameStats, count_pixels, publish
+from core.profiling import profile_call
+from concurrent.futures import ThreadPoolExecutor
+import collections
 import math
+import sys
+import time
+
+# frames kept for the HUD's rolling FPS
+_HUD_FPS_WINDOW = 30
+# render pacing when the screen does not report its refresh rate
+_DEFAULT_REFRESH_HZ = 60.0
+# interactive frames: smallest linear resolution scale, its rounding step,
+# and how long input must pause before the full-quality frame follows
+_MIN_RES_SCALE = 0.25
+_RES_SCALE_STEP = 0.05
+_SETTLE_MS = 150
+_INTERACTIVE_ITER_FACTOR = 0.5
+# weight of the newest frame in the per-pixel cost average
+_COST_SMOOTHING = 0.5
+# full-quality frames expected to take longer than this render tile by tile
+_PROGRESSIVE_MIN_MS = 100.0
+# idle prefetch: delay after a frame, and tiles rendered per idle spell
+_PREFETCH_DELAY_MS = 250
+_PREFETCH_MAX_TILES = 64
+# idle refinement starts this long after a full-quality frame
+_REFINE_DELAY_MS = 250
+# Auto quality: caps probed for recent views; a view within half a screen
+# and a quarter octave of one of them reuses its cap instead of probing
+_AUTO_CAP_VIEWS = 32
+_AUTO_CAP_OCTAVES = 0.25
+_WHEEL_ZOOM = 0.85
+
+def _shifted(view: tuple, dx: float, dy: float) -> tuple:
+    cx, cx_lo, cy, cy_lo, span_x, span_y = view
+    return (*dd_add_float(cx, cx_lo, dx), *dd_add_float(cy, cy_lo, dy), span_x, span_y)
+
+
+def _zoomed(view: tuple, fx: float, fy: float, factor: float) -> tuple:
+    span_x, span_y = view[4], view[5]
+    cx, cx_lo, cy, cy_lo, _, _ = _shifted(view, (fx - 0.5) * span_x * (1 - factor),
+                                          (fy - 0.5) * span_y * (1 - factor))
+    return cx, cx_lo, cy, cy_lo, span_x * factor, span_y * factor
+
 
 class MandelbrotCanvas(QtWidgets.QLabel):
     requestStatus = QtCore.Signal(str)
@@ -14,9 +64,9 @@ class MandelbrotCanvas(QtWidgets.QLabel):
         super().__init__()
         # … your look & feel / sizePolicy / tracking code …
 
-        # viewport defaults
-        self.xmin, self.xmax = -2.5, 1.0
-        self.ymin, self.ymax = -1.25, 1.25
+        # viewport defaults: centre as a double-double (cx + cx_lo) so deep
+        # zooms keep their position, plus the spans of the visible window
+        self._set_default_view()
 
         # prefs & LUT
         self.max_iter      = PREFS["max_iter"]
@@ -27,85 +77,779 @@ class MandelbrotCanvas(QtWidgets.QLabel):
         self.dragging = False
         self.last_pos = QtCore.QPoint()
 
+        # performance HUD (off by default; see paintEvent)
+        self.hud_enabled = False
+        self.last_stats = None
+        self._frame_times = collections.deque(maxlen=_HUD_FPS_WINDOW)
+        self._profile_next = False
+
+        # orbits of the unescaped pixels of the current float64 frame, so a
+        # higher cap on the same view only continues those (see resume_render)
+        self._escape_state = None
+        self._state_key = None
+
+        # navigation events only move the viewport and arm this timer, so a
+        # burst of them costs one render per display frame (request_render)
+        self._render_timer = QtCore.QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        self._render_timer.timeout.connect(self._interactive_render)
+        self._last_frame_end = 0.0
+
+        # while navigating, frames are rendered at a fraction of the widget
+        # size chosen from the measured cost per pixel to hold the target
+        # frame time, then redone at full quality once input pauses
+        self._settle_timer = QtCore.QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.timeout.connect(self._settle)
+        self._frame_scale = 1.0
+        self._interactive = False
+        self._full_quality = True
+        self._px_cost_ms = None
+
+        # progressive full-quality frames (see _start_tiles): tiles render
+        # on a worker, and finished ones are collected and pasted here once
+        # per display frame; _focus is the last wheel/drag position as a
+        # fraction of the widget size
+        self._tile_pool = ThreadPoolExecutor(max_workers=1,
+                                             thread_name_prefix="mandelpy-tiles")
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._stop_workers)
+        self._tile_timer = QtCore.QTimer(self)
+        self._tile_timer.setSingleShot(True)
+        self._tile_timer.timeout.connect(self._collect_tiles)
+        self._tile_gen = 0              # bumped by _cancel_tiles
+        self._tile_jobs = []
+        self._tile_image = None
+        self._focus = None
+
+        # tiles of recent frames plus tiles prefetched while idle (the
+        # likely next zoom-in and the ring a short pan would uncover);
+        # prefetch has a worker of its own, so frames never queue behind
+        # it, and keeps one tile in flight, dropped on input
+        self._tile_cache = TileCache()
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=1,
+                                                 thread_name_prefix="mandelpy-prefetch")
+        self._prefetch_timer = QtCore.QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.timeout.connect(self._prefetch_step)
+        self._prefetch_queue = []
+        self._prefetch_gen = 0          # bumped by _cancel_prefetch
+        self._prefetch_job = None       # (layout, tile, job, future) in flight
+
+        # idle refinement (see core.refine): once a frame is up, unescaped
+        # pixels get a higher cap and edges more AA samples, a step per
+        # event-loop turn; prefetch follows when it is done
+        self._refine_timer = QtCore.QTimer(self)
+        self._refine_timer.setSingleShot(True)
+        self._refine_timer.timeout.connect(self._refine_step)
+        self._refinement = None
+        self._shown_aa = 1              # AA level of the image on screen
+        self._auto_caps = collections.deque(maxlen=_AUTO_CAP_VIEWS)
+        self._auto_cap = None           # the cap Auto quality gave last
+
         # ←── initial render
         self.full_render()
 
+    # ─── viewport helpers ─────────────────────────────────────────
+    @property
+    def xmin(self) -> float: return self.cx - self.span_x / 2
+    @property
+    def xmax(self) -> float: return self.cx + self.span_x / 2
+    @property
+    def ymin(self) -> float: return self.cy - self.span_y / 2
+    @property
+    def ymax(self) -> float: return self.cy + self.span_y / 2
+
+    def _set_default_view(self):
+        self.cx, self.cy = -0.75, 0.0
+        self.cx_lo = self.cy_lo = 0.0
+        self.span_x, self.span_y = 3.5, 2.5
+
+    def _view(self) -> tuple:
+        return self.cx, self.cx_lo, self.cy, self.cy_lo, self.span_x, self.span_y
+
+    def _set_view(self, view: tuple):
+        self.cx, self.cx_lo, self.cy, self.cy_lo, self.span_x, self.span_y = view
+
+    def _shift_center(self, dx: float, dy: float):
+        self._set_view(_shifted(self._view(), dx, dy))
+
+    def _zoom_about(self, fx: float, fy: float, factor: float):
+        """Scale the view by `factor`, keeping widget point (fx, fy) fixed."""
+        self._set_view(_zoomed(self._view(), fx, fy, factor))
+
+    def profile_next_frame(self):
+        """Run the next full_render under cProfile (see core.profiling)."""
+        self._profile_next = True
+        self.requestStatus.emit("The next frame will be profiled")
+
+    def _frame_interval_ms(self) -> float:
+        screen = self.screen()
+        hz = screen.refreshRate() if screen is not None else 0.0
+        return 1000.0 / (hz if hz > 1.0 else _DEFAULT_REFRESH_HZ)
+
+    def request_render(self):
+        """Render the current viewport at the next display frame.
+
+        Requests made before then are merged into that one render, which
+        always shows the newest viewport.
+        """
+        self._cancel_tiles()
+        self._cancel_prefetch()
+        self._cancel_refine()
+        if self._render_timer.isActive():
+            return
+        since_last = (time.perf_counter() - self._last_frame_end) * 1e3
+        self._render_timer.start(max(0, round(self._frame_interval_ms() - since_last)))
+
     def full_render(self):
+        """Render the current viewport at native resolution and full quality."""
+        self._render_timer.stop()
+        self._settle_timer.stop()
+        self._cancel_tiles()
+        self._cancel_prefetch()
+        self._cancel_refine()
+        self._run_frame(1.0, interactive=False)
+
+    def _interactive_render(self):
+        target = PREFS.get("target_frame_ms", 0)
+        if not target:
+            self.full_render()
+            return
+        self._run_frame(self._interactive_scale(target), interactive=True)
+        if not self._full_quality:
+            self._settle_timer.start(_SETTLE_MS)
+
+    def _settle(self):
+        if self._full_quality:
+            return
+        if self._frame_scale >= 1.0 and PREFS.get("idle_refine", True):
+            # a native-size frame only lacks iterations or AA: refine it in
+            # place rather than render it again
+            self._interactive, self._full_quality = False, True
+            W, H = self.current_iters.shape[1], self.current_iters.shape[0]
+            self._start_refine(self._iteration_cap(self._view(), W, H), 0)
+            return
+        self.full_render()
+
+    def _interactive_scale(self, target_ms: float) -> float:
+        """Linear resolution scale expected to render in `target_ms`."""
+        if self._px_cost_ms is None:
+            return 1.0
         W = self.width()  or 800
         H = self.height() or 600
+        scale = math.sqrt(target_ms / (self._px_cost_ms * W * H))
+        scale = round(scale / _RES_SCALE_STEP) * _RES_SCALE_STEP
+        return min(1.0, max(_MIN_RES_SCALE, scale))
 
-        self.requestStatus.emit("Rendering…")
-        QtWidgets.QApplication.processEvents()
+    def _run_frame(self, scale: float, interactive: bool):
+        self._frame_scale = scale
+        self._interactive = interactive
+        if self._profile_next:
+            self._profile_next = False
+            self._profiled_frame()
+        else:
+            self._render_frame()
+        self._last_frame_end = time.perf_counter()
 
-        # compute a zoom-dependent iteration limit
-        zoom_span = self.xmax - self.xmin
+    def _profiled_frame(self):
+        try:
+            # one-shot, so the profile covers the whole frame
+            report = profile_call(self._render_frame, progressive=False)
+        except OSError as exc:
+            self.requestStatus.emit(f"Could not write profile: {exc}")
+            return
+        self.requestStatus.emit(f"Frame profile written to {report.text_path}")
+
+    def _iteration_cap(self, view: tuple, W: int, H: int, probe: bool = True) -> int:
+        """Zoom-dependent iteration limit for `view` (see the quality pref).
+
+        Auto quality reuses the cap probed for a nearby view; with
+        ``probe=False`` a view with none nearby gets the last cap instead
+        of a probe on the spot.
+        """
+        cx, cx_lo, cy, cy_lo, span_x, span_y = view
         quality = PREFS.get("quality", "Medium")
+        if quality == "Auto":
+            cap = self._cached_auto_cap(view)
+            if cap is None and not probe and self._auto_cap is not None:
+                cap = self._auto_cap
+            elif cap is None:
+                cap = auto_iteration_cap(cx, cy, span_x, span_y, W, H,
+                                         self.escape_radius, cx_lo, cy_lo)
+                self._auto_caps.append((view, self.escape_radius, cap))
+            self._auto_cap = cap
+            return cap
         if quality == "Custom":
             min_iter   = PREFS.get("custom_min_iter", 64)
             multiplier = PREFS.get("custom_multiplier", 50.0)
-            dyn_iter   = int(max(min_iter, multiplier *
-                                  math.log2(2.5 / zoom_span)))
-        else:
-            qmap     = {"Low":0.5, "Medium":1.0, "High":2.0, "Ultra":4.0}
-            qfactor  = qmap.get(quality, 1.0)
-            dyn_iter = int(max(64, qfactor * 50 * math.log2(2.5 / zoom_span)))
+            return int(max(min_iter, multiplier * math.log2(2.5 / span_x)))
+        qmap     = {"Low":0.5, "Medium":1.0, "High":2.0, "Ultra":4.0}
+        qfactor  = qmap.get(quality, 1.0)
+        return int(max(64, qfactor * 50 * math.log2(2.5 / span_x)))
+
+    def _cached_auto_cap(self, view: tuple) -> int | None:
+        cx, cx_lo, cy, cy_lo, span_x, span_y = view
+        for (pcx, pcx_lo, pcy, pcy_lo, pspan_x, _), radius, cap in reversed(self._auto_caps):
+            if (radius == self.escape_radius
+                    and abs(math.log2(span_x / pspan_x)) <= _AUTO_CAP_OCTAVES
+                    and abs((cx - pcx) + (cx_lo - pcx_lo)) <= span_x / 2
+                    and abs((cy - pcy) + (cy_lo - pcy_lo)) <= span_y / 2):
+                return cap
+        return None
+
+    def _snapped(self, view: tuple, H: int) -> tuple:
+        # nudge views that cross the real axis (by < 1/4 px) onto a grid the
+        # engines can mirror; a no-op once snapped, as pans move whole pixels
+        return _shifted(view, 0.0, axis_snap(view[2], view[3], view[5], H))
+
+    def _layout(self, view: tuple, W: int, H: int, dyn_iter: int, distance: bool,
+                create: bool = True):
+        return self._tile_cache.layout(*view, W, H, dyn_iter, self.escape_radius,
+                                       distance, create=create)
+
+    def _render_frame(self, progressive: bool = True):
+        Wn = self.width()  or 800
+        Hn = self.height() or 600
+
+        # no processEvents() here: input handled mid-frame would re-enter
+        # request_render/full_render and start a frame inside this one
+        self.requestStatus.emit("Rendering…")
+
+        # the cap is computed for the native frame, so interactive and
+        # settled frames of a view agree (and prefetched tiles match);
+        # interactive frames never wait for an Auto probe
+        t0 = time.perf_counter()
+        dyn_iter = self._iteration_cap(self._view(), Wn, Hn, probe=not self._interactive)
+        probe_ms = (time.perf_counter() - t0) * 1e3 if PREFS.get("quality") == "Auto" else 0.0
+        distance = PREFS.get("render_mode") == "Distance"
+        if self._interactive:
+            # a prefetched view is shown at full quality straight away
+            layout = self._layout(self._snapped(self._view(), Hn), Wn, Hn,
+                                  dyn_iter, distance, create=False)
+            if layout is not None and self._tile_cache.covers(layout):
+                self._frame_scale, self._interactive = 1.0, False
+        W = max(1, round(Wn * self._frame_scale))
+        H = max(1, round(Hn * self._frame_scale))
+
+        reduce_iter = self._interactive and PREFS.get("interactive_reduce_iter", False)
+        if reduce_iter:
+            dyn_iter = max(64, int(dyn_iter * _INTERACTIVE_ITER_FACTOR))
         self.max_iter = dyn_iter
+        self._full_quality = self._frame_scale >= 1.0 and not reduce_iter and not (
+            self._interactive and PREFS.get("aa_level", 1) > 1)
 
-        iters = cuda_render(self.xmin, self.xmax,
-                            self.ymin, self.ymax,
-                            W, H,
-                            dyn_iter,                   # ← now defined
-                            self.escape_radius)
+        # snap on the native grid: reduced frames then leave the view where
+        # the settled frame will find it, rather than nudging it each time
+        self._set_view(self._snapped(self._view(), Hn))
+        key = (*self._view(), W, H, self.escape_radius)
+        state = self._escape_state if self._state_key == key else None
+        resumable = not distance and state is not None and dyn_iter > state.n
+        if progressive and not resumable and not self._interactive:
+            layout = self._layout(self._view(), W, H, dyn_iter, distance, create=False)
+            cached = layout is not None and self._tile_cache.covers(layout)
+            if cached or self._worth_tiling(W, H):
+                self._start_tiles(key, dyn_iter, distance, probe_ms)
+                return
+        t0 = time.perf_counter()
+        if resumable:
+            iters, state = resume_render(self.current_iters, state, dyn_iter)
+            dist = None
+        elif not distance and precision_for_view(self.cx, self.cy, self.span_x, self.span_y,
+                                                 W, H, dyn_iter) == "float64":
+            iters, state = render_state(self.xmin, self.xmax, self.ymin, self.ymax,
+                                        W, H, dyn_iter, self.escape_radius)
+            dist = None
+        else:
+            result = render_view(self.cx, self.cy,
+                                 self.span_x, self.span_y,
+                                 W, H,
+                                 dyn_iter,                   # ← now defined
+                                 self.escape_radius,
+                                 self.cx_lo, self.cy_lo,
+                                 distance=distance)
+            iters, dist = result if distance else (result, None)
+            state = None
+        render_ms = (time.perf_counter() - t0) * 1e3
+        self._finish_frame(key, iters, dist, state, dyn_iter, render_ms, probe_ms)
 
-        norm  = iters.astype(np.float64)
-        norm  = np.clip(norm, 0, dyn_iter)
-        idx   = (norm * (len(self.color_lut) - 1)) / dyn_iter
-        colors = self.color_lut[idx.astype(np.int32)]
+    def _finish_frame(self, key, iters, dist, escape_state, dyn_iter: int,
+                      render_ms: float, probe_ms: float, rendered_px: int | None = None):
+        """Show a finished frame.
 
-        qimg = QtGui.QImage(colors.data, W, H, 3*W,
-                            QtGui.QImage.Format.Format_RGB888).copy()
-        self.setPixmap(QtGui.QPixmap.fromImage(qimg))
-        self.current_qimage = qimg
-        backend, reason = get_renderer_state()
-        if backend == "CUDA":
-            self.requestStatus.emit(f"Rendered {W}x{H} (CUDA)")
-        elif reason:
-            self.requestStatus.emit(f"Rendered {W}x{H} (CPU: {reason})")
+        `rendered_px` is how many pixels were actually iterated; fewer than
+        W x H when tiles came from the cache.
+        """
+        W, H = key[6], key[7]
+        if rendered_px is None:
+            rendered_px = W * H
+        self._escape_state = escape_state
+        self._state_key = key if escape_state is not None else None
+        self.current_iters    = iters
+        self.current_distance = dist        # None unless in Distance mode
+
+        state = get_renderer_state()
+        # the frame's own tier: the global state reflects whatever rendered
+        # last, which may be a probe, a prefetched tile or the focal map
+        self._precision = precision_for_view(self.cx, self.cy, self.span_x,
+                                             self.span_y, W, H, dyn_iter)
+        if dist is not None and self._precision == "float32":
+            self._precision = "float64"     # distance renders never use float32
+        self.recolor()
+
+        stage = self._stage_ms
+        self.last_stats = FrameStats(
+            W, H, state.backend, self._precision, state.reason, dyn_iter,
+            render_ms, stage["color"], stage["aa"], stage["qimage"], stage["upload"],
+            *count_pixels(iters, dyn_iter), probe_ms=probe_ms)
+        publish(self.last_stats)
+        self._frame_times.append(time.perf_counter())
+        if rendered_px:
+            # frames served from the tile cache say nothing about render cost
+            s = self.last_stats
+            cost = (render_ms / rendered_px
+                    + (s.total_ms - s.aa_ms - render_ms) / (W * H))
+            self._px_cost_ms = cost if self._px_cost_ms is None else (
+                _COST_SMOOTHING * cost + (1 - _COST_SMOOTHING) * self._px_cost_ms)
+        if self._full_quality:
+            self._start_refine(dyn_iter, _REFINE_DELAY_MS)
+
+        if state.backend != "CUDA" and state.reason:
+            msg = f"Rendered {W}x{H} ({state.backend}, {self._precision}: {state.reason})"
         else:
-            self.requestStatus.emit(f"Rendered {W}x{H} (CPU)")
+            msg = f"Rendered {W}x{H} ({state.backend}, {self._precision})"
+        msg += f" · {self.last_stats.summary()}"
+        if self.last_aa_stats is not None:
+            aa = self.last_aa_stats
+            msg += f" · AA {aa.samples}x on {aa.resampled} px ({aa.fraction:.1%})"
+        self.requestStatus.emit(msg)
 
         # ─── update zoom indicator ───────────────────────────
         self.zoomChanged.emit(self.compute_zoom())
 
         # centre of current viewport  → focal-map cross-hair
-        cx = (self.xmin + self.xmax) / 2.0
-        cy = (self.ymin + self.ymax) / 2.0
-        self.viewportChanged.emit(cx, cy)
+        self.viewportChanged.emit(self.cx, self.cy)
+
+    # ─── progressive (tiled) frames ──────────────────────────────
+    def _worth_tiling(self, W: int, H: int) -> bool:
+        if self._interactive or self._px_cost_ms is None:
+            return False
+        return self._px_cost_ms * W * H > _PROGRESSIVE_MIN_MS
+
+    def _focus_points(self, W: int, H: int) -> list[tuple[float, float]]:
+        foci = [(W / 2, H / 2)]
+        if self._focus is not None:
+            foci.insert(0, (self._focus[0] * W, self._focus[1] * H))
+        return foci
+
+    def _start_tiles(self, key, dyn_iter: int, distance: bool, probe_ms: float):
+        """Render the frame tile by tile, around the cursor and centre first.
+
+        Cached tiles are pasted straight away; the rest render on the tile
+        worker and are painted over the previous image (usually the
+        upscaled interactive frame of the same view) as they arrive. Input
+        cancels the rest (see `_cancel_tiles`).
+        """
+        W, H = key[6], key[7]
+        base = self.pixmap().toImage() if not self.pixmap().isNull() else QtGui.QImage()
+        if base.isNull():
+            base = QtGui.QImage(W, H, QtGui.QImage.Format.Format_RGB888)
+            base.fill(QtCore.Qt.GlobalColor.black)
+        elif base.size() != QtCore.QSize(W, H):
+            base = base.scaled(W, H)
+        self._tile_image = base.convertToFormat(QtGui.QImage.Format.Format_RGB888)
+        layout = self._layout(key[:6], W, H, dyn_iter, distance)
+        self._tile_args = (key, layout, dyn_iter, distance, probe_ms)
+        self._tile_iters = np.empty((H, W), dtype=np.float32)
+        self._tile_dist = np.empty((H, W), dtype=np.float32) if distance else None
+        self._tile_ms = 0.0
+        self._tile_rendered = 0
+        self._tile_total = len(layout.tiles)
+
+        self._tile_gen += 1
+        missing = []
+        for tile in order_tiles(layout.tiles, self._focus_points(W, H), layout.tile_rect):
+            result = self._tile_cache.get(layout, tile)
+            if result is None:
+                missing.append(tile)
+            else:
+                self._paste_tile(layout, tile, result)
+        if not missing:
+            self._finish_tiles()
+            return
+        # submitted in focus order; the single worker keeps that order
+        self._tile_jobs = []
+        for tile in missing:
+            job = self._tile_cache.job(layout, tile)
+            future = self._tile_pool.submit(self._render_tile_job, self._tile_gen, job)
+            self._tile_jobs.append((tile, job, future))
+        self._show_tiles()
+        self._tile_timer.start(round(self._frame_interval_ms()))
+
+    def _cancel_tiles(self):
+        self._tile_timer.stop()
+        self._tile_gen += 1
+        for _, _, future in self._tile_jobs:
+            future.cancel()
+        self._tile_jobs = []
+
+    def _stop_workers(self):
+        # queued tiles would otherwise hold up interpreter exit
+        self._cancel_tiles()
+        self._cancel_prefetch()
+        self._tile_pool.shutdown(wait=False, cancel_futures=True)
+        self._prefetch_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _render_tile_job(self, gen: int, job: tuple):
+        # runs on the tile worker: touches neither the widget nor the cache
+        if gen != self._tile_gen:
+            return None                 # cancelled while queued
+        t0 = time.perf_counter()
+        return render_tile(*job), (time.perf_counter() - t0) * 1e3
+
+    def _collect_tiles(self):
+        """Paste the tiles the worker has finished, then show the frame."""
+        layout = self._tile_args[1]
+        pending = []
+        for tile, job, future in self._tile_jobs:
+            if not future.done():
+                pending.append((tile, job, future))
+                continue
+            try:
+                result, ms = future.result()
+            except Exception as exc:
+                print(f"[MandelPy canvas] Tile render failed: {exc}", file=sys.stderr)
+                self._cancel_tiles()
+                self.requestStatus.emit(f"Rendering failed: {exc}")
+                return
+            self._tile_cache.store(layout, tile, job[0], result)
+            self._tile_ms += ms
+            self._tile_rendered += 1
+            self._paste_tile(layout, tile, result)
+        self._tile_jobs = pending
+        if not pending:
+            self._finish_tiles()
+            return
+        self._show_tiles()
+        self._tile_timer.start(round(self._frame_interval_ms()))
+
+    def _paste_tile(self, layout, tile, result):
+        """Copy a tile into the frame buffers and paint it onto the image."""
+        key, _, dyn_iter, distance, _ = self._tile_args
+        span_x, W = key[4], key[6]
+        rect = paste_tile(layout, tile, result[0], self._tile_iters)
+        rows, cols = slice(rect.row0, rect.row1), slice(rect.col0, rect.col1)
+        iters = self._tile_iters[rows, cols]
+        colors = colorize(iters, dyn_iter, self.color_lut)
+        if distance:
+            paste_tile(layout, tile, result[1], self._tile_dist)
+            colors = shade_by_distance(colors, iters, self._tile_dist[rows, cols],
+                                       dyn_iter, span_x / W)
+        th, tw = iters.shape
+        painter = QtGui.QPainter(self._tile_image)
+        painter.drawImage(rect.col0, rect.row0,
+                          QtGui.QImage(colors.data, tw, th, 3 * tw,
+                                       QtGui.QImage.Format.Format_RGB888))
+        painter.end()
+
+    def _show_tiles(self):
+        self.setPixmap(QtGui.QPixmap.fromImage(self._tile_image))
+        done = self._tile_total - len(self._tile_jobs)
+        self.requestStatus.emit(f"Rendering… {done}/{self._tile_total} tiles")
+
+    def _finish_tiles(self):
+        key, _, dyn_iter, _, probe_ms = self._tile_args
+        self._tile_image = None
+        self._finish_frame(key, self._tile_iters, self._tile_dist, None,
+                           dyn_iter, self._tile_ms, probe_ms,
+                           self._tile_rendered * self._tile_cache.size ** 2)
+        self._last_frame_end = time.perf_counter()
+
+    # ─── idle prefetch ───────────────────────────────────────────
+    def _schedule_prefetch(self):
+        self._cancel_prefetch()
+        Wn, Hn = self.width() or 800, self.height() or 600
+        if self._worth_tiling(Wn, Hn):
+            self._prefetch_timer.start(_PREFETCH_DELAY_MS)
+
+    def _cancel_prefetch(self):
+        self._prefetch_timer.stop()
+        self._prefetch_queue = []
+        self._prefetch_gen += 1
+        if self._prefetch_job is not None:
+            self._prefetch_job[3].cancel()
+            self._prefetch_job = None
+
+    def _prefetch_candidates(self) -> list:
+        """(layout, tile) pairs for the likely next views, most likely first."""
+        W, H = self.width() or 800, self.height() or 600
+        distance = PREFS.get("render_mode") == "Distance"
+        fx, fy = self._focus if self._focus is not None else (0.5, 0.5)
+        zoom_view = self._snapped(_zoomed(self._view(), fx, fy, _WHEEL_ZOOM), H)
+        zoom = self._layout(zoom_view, W, H, self._iteration_cap(zoom_view, W, H), distance)
+        pairs = [(zoom, t) for t in order_tiles(zoom.tiles, [(fx * W, fy * H)],
+                                                zoom.tile_rect)]
+        here = self._layout(self._view(), W, H, self.max_iter, distance, create=False)
+        if here is not None:
+            pairs += [(here, t) for t in self._tile_cache.ring(here)]
+        pairs = [p for p in pairs if p not in self._tile_cache]
+        return pairs[:_PREFETCH_MAX_TILES]
+
+    def _prefetch_step(self):
+        """Store the tile the worker finished, then hand it the next one."""
+        if self._prefetch_job is not None:
+            layout, tile, job, future = self._prefetch_job
+            if not future.done():
+                self._prefetch_timer.start(round(self._frame_interval_ms()))
+                return
+            self._prefetch_job = None
+            try:
+                result = future.result()
+            except Exception as exc:
+                print(f"[MandelPy canvas] Prefetch failed: {exc}", file=sys.stderr)
+                self._prefetch_queue = []
+                return
+            self._tile_cache.store(layout, tile, job[0], result, prefetch=True)
+            if not self._prefetch_queue:
+                return
+        elif not self._prefetch_queue:
+            self._prefetch_queue = self._prefetch_candidates()
+            if not self._prefetch_queue:
+                return
+        layout, tile = self._prefetch_queue.pop(0)
+        job = self._tile_cache.job(layout, tile)
+        future = self._prefetch_pool.submit(self._prefetch_tile, self._prefetch_gen, job)
+        self._prefetch_job = (layout, tile, job, future)
+        self._prefetch_timer.start(round(self._frame_interval_ms()))
+
+    def _prefetch_tile(self, gen: int, job: tuple):
+        # runs on the prefetch worker, like _render_tile_job
+        if gen != self._prefetch_gen:
+            return None
+        return render_tile(*job)
+
+    # ─── idle refinement ─────────────────────────────────────────
+    def _start_refine(self, target_iter: int, delay_ms: int):
+        """Refine the frame on screen while idle, then prefetch."""
+        self._cancel_refine()
+        if not PREFS.get("idle_refine", True):
+            self._schedule_prefetch()
+            return
+        H, W = self.current_iters.shape
+        key = (*self._view(), W, H, self.escape_radius)
+        state = self._escape_state if self._state_key == key else None
+        self._refinement = Refinement(
+            self.current_iters, self.current_distance, self.cx, self.cy,
+            self.span_x, self.span_y, self.max_iter, self.escape_radius,
+            self.color_lut, self.cx_lo, self.cy_lo, self._precision, state=state,
+            target_iter=target_iter, aa_level=PREFS.get("aa_level", 1),
+            shown_aa=self._shown_aa)
+        self._refine_timer.start(delay_ms)
+
+    def _cancel_refine(self):
+        self._refine_timer.stop()
+        self._refinement = None
+
+    def _refine_step(self):
+        r = self._refinement
+        if r.step(self._frame_interval_ms() / 1e3):
+            self.current_iters, self.current_distance = r.iters, r.dist
+            self.max_iter = r.max_iter
+            if r.state is not None:
+                self._escape_state = r.state
+            self._shown_aa = r.samples
+            self._show_colors(r.colors())
+        if r.done:
+            self._refinement = None
+            self.requestStatus.emit(f"Refined: {r.max_iter} iterations · AA {r.samples}x "
+                                    f"on {r.resampled} px")
+            self._schedule_prefetch()
+            return
+        self.requestStatus.emit(f"Refining… {r.pass_label} {r.progress:.0%}")
+        self._refine_timer.start(0)
+
+    def recolor(self):
+        """Colour the cached iteration buffer with the current LUT."""
+        iters, dist = self.current_iters, self.current_distance
+        H, W = iters.shape
+        t0 = time.perf_counter()
+        colors = colorize(iters, self.max_iter, self.color_lut)
+        if dist is not None:
+            colors = shade_by_distance(colors, iters, dist, self.max_iter,
+                                       self.span_x / W)
+        t1 = time.perf_counter()
+
+        self.last_aa_stats = None
+        # interactive frames skip AA; the settle frame adds it back
+        aa_level = 1 if self._interactive else PREFS.get("aa_level", 1)
+        if aa_level > 1:
+            colors, self.last_aa_stats = supersample(
+                colors, self.cx, self.cy, self.span_x, self.span_y,
+                self.max_iter, self.escape_radius, self.color_lut,
+                samples=aa_level, cx_lo=self.cx_lo, cy_lo=self.cy_lo,
+                precision=self._precision, dist=dist)
+        self._shown_aa = aa_level
+        t2 = time.perf_counter()
+
+        qimage_ms, upload_ms = self._show_colors(colors)
+        self._stage_ms = {"color": (t1 - t0) * 1e3,
+                          "aa": (t2 - t1) * 1e3 if aa_level > 1 else 0.0,
+                          "qimage": qimage_ms, "upload": upload_ms}
+
+    def _show_colors(self, colors: np.ndarray) -> tuple[float, float]:
+        """Put an RGB frame on screen; returns the QImage and upload times (ms)."""
+        H, W = colors.shape[:2]
+        t0 = time.perf_counter()
+        qimg = QtGui.QImage(colors.data, W, H, 3*W,
+                            QtGui.QImage.Format.Format_RGB888).copy()
+        t1 = time.perf_counter()
+        pixmap = QtGui.QPixmap.fromImage(qimg)
+        if self._frame_scale < 1.0:
+            pixmap = pixmap.scaled(self.size(), QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
+                                   QtCore.Qt.TransformationMode.FastTransformation)
+        self.setPixmap(pixmap)
+        self.current_qimage = qimg
+        t2 = time.perf_counter()
+        return (t1 - t0) * 1e3, (t2 - t1) * 1e3
+
+    def load_iterations(self, iters: np.ndarray, meta: dict):
+        """Show a saved iteration buffer (see core.rawio) without rendering.
+
+        Only a widget-sized sample of the buffer is read and kept; exporting
+        it at full resolution goes through core.rawio. A buffer of another
+        aspect is cropped to the widget's (see core.rawio.crop_raw).
+        """
+        full_h, full_w = iters.shape
+        view_w = self.width()  or 800
+        view_h = self.height() or 600
+        self.current_iters, meta = crop_raw(iters, meta, view_w, view_h)
+        self.cx, self.cx_lo = meta["cx"], meta["cx_lo"]
+        self.cy, self.cy_lo = meta["cy"], meta["cy_lo"]
+        self.span_x, self.span_y = meta["span_x"], meta["span_y"]
+        self.max_iter = meta["max_iter"]
+        self.escape_radius = meta["escape_radius"]
+        self.current_distance = None
+        self._escape_state = self._state_key = None
+        self._render_timer.stop()
+        self._settle_timer.stop()
+        self._cancel_tiles()
+        self._cancel_prefetch()
+        self._cancel_refine()
+        H, W = self.current_iters.shape
+        # a sample smaller than the widget has its aspect: scaled up to fill it
+        self._frame_scale = min(1.0, W / view_w)
+        self._interactive, self._full_quality = False, True
+        self._precision = precision_for_view(self.cx, self.cy,
+                                             self.span_x, self.span_y, W, H, self.max_iter)
+        self.recolor()
+        self.requestStatus.emit(f"Loaded raw buffer {full_w}x{full_h}")
+        self.zoomChanged.emit(self.compute_zoom())
+        self.viewportChanged.emit(self.cx, self.cy)
+
+    def restore_view(self, view: dict, iters=None):
+        """Jump to a saved viewport (see core.session).
+
+        A cached buffer is shown as-is when it still fits the widget and the
+        render mode needs nothing else; otherwise the view is re-rendered.
+        """
+        W = self.width()  or 800
+        H = self.height() or 600
+        if (iters is not None and iters.shape == (H, W)
+                and PREFS.get("render_mode") != "Distance"):
+            self.load_iterations(iters, {**view, "escape_radius": self.escape_radius})
+            return
+        self.cx, self.cx_lo = view["cx"], view["cx_lo"]
+        self.cy, self.cy_lo = view["cy"], view["cy_lo"]
+        self.span_x, self.span_y = view["span_x"], view["span_y"]
+        self.full_render()
+
+    # ─── performance HUD ──────────────────────────────────────────
+    def set_hud_enabled(self, on: bool):
+        """Show or hide the overlay; only repaints, never re-renders."""
+        self.hud_enabled = bool(on)
+        self.update()
+
+    def _fps(self) -> float:
+        times = self._frame_times
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def _hud_lines(self) -> list[str]:
+        s = self.last_stats
+        if s is None:
+            return ["no frame yet"]
+        lines = [f"frame  {s.total_ms:7.1f} ms   {self._fps():5.1f} fps"]
+        if s.probe_ms:
+            lines.append(f"probe  {s.probe_ms:7.1f} ms")
+        lines += [
+            f"render {s.render_ms:7.1f} ms",
+            f"colour {s.color_ms:7.1f} ms",
+        ]
+        if s.aa_ms:
+            lines.append(f"AA     {s.aa_ms:7.1f} ms")
+        lines += [
+            f"image  {s.qimage_ms + s.upload_ms:7.1f} ms",
+            f"dyn_iter {s.max_iter}",
+            f"{s.backend} · {s.precision}",
+        ]
+        if self._frame_scale < 1.0:
+            lines.append(f"res    {self._frame_scale:.0%} while navigating")
+        cache = self._tile_cache.stats()
+        if cache.lookups or cache.prefetched:
+            lines.append(f"tiles  {cache.hit_rate:.0%} hit · "
+                         f"prefetch {cache.prefetch_yield:.0%} used")
+        if self._refinement is not None and self._refinement.pass_label:
+            r = self._refinement
+            lines.append(f"refine {r.pass_label} {r.progress:.0%}")
+        warmup = get_renderer_state().warmup
+        if not warmup.startswith("done"):
+            lines.append(f"warm-up {warmup}")
+        return lines
+
+    def paintEvent(self, e: QtGui.QPaintEvent):
+        super().paintEvent(e)
+        if not self.hud_enabled:
+            return
+        p = QtGui.QPainter(self)
+        font = QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.SystemFont.FixedFont)
+        p.setFont(font)
+        lines = self._hud_lines()
+        fm = p.fontMetrics()
+        w = max(fm.horizontalAdvance(line) for line in lines) + 16
+        h = fm.lineSpacing() * len(lines) + 12
+        p.fillRect(8, 8, w, h, QtGui.QColor(0, 0, 0, 160))
+        p.setPen(QtGui.QColor(255, 255, 255))
+        y = 14 + fm.ascent()
+        for line in lines:
+            p.drawText(16, y, line)
+            y += fm.lineSpacing()
+        p.end()
 
     def set_color_lut(self, lut: np.ndarray):
         """Update the colour lookup and repaint immediately."""
         self.color_lut = lut.copy()
-        self.full_render()
+        self.recolor()
+        if self._full_quality and not self._interactive:
+            self._start_refine(self.max_iter, _REFINE_DELAY_MS)
 
     def reset_view(self):
         """Reset viewport to defaults and repaint."""
-        self.xmin, self.xmax = -2.5, 1.0
-        self.ymin, self.ymax = -1.25, 1.25
+        self._set_default_view()
         self.full_render()
 
     def wheelEvent(self, e: QtGui.QWheelEvent):
-        zoom = 0.85 if e.angleDelta().y() > 0 else 1/0.85
+        zoom = _WHEEL_ZOOM if e.angleDelta().y() > 0 else 1/_WHEEL_ZOOM
         pos = e.position()
-        px, py = pos.x()/self.width(), pos.y()/self.height()
-        cx = self.xmin + px*(self.xmax-self.xmin)
-        cy = self.ymin + py*(self.ymax-self.ymin)
-        self.xmin = cx + (self.xmin - cx)*zoom
-        self.xmax = cx + (self.xmax - cx)*zoom
-        self.ymin = cy + (self.ymin - cy)*zoom
-        self.ymax = cy + (self.ymax - cy)*zoom
-        self.full_render()
+        self._focus = (pos.x()/self.width(), pos.y()/self.height())
+        self._zoom_about(*self._focus, zoom)
+        self.request_render()
 
     def mousePressEvent(self, e: QtGui.QMouseEvent):
+        self._cancel_prefetch()
+        self._cancel_refine()
         if e.button() == QtCore.Qt.MouseButton.LeftButton:
             self.dragging = True
             self.last_pos = e.position()
@@ -115,11 +859,11 @@ class MandelbrotCanvas(QtWidgets.QLabel):
             dx = e.position().x() - self.last_pos.x()
             dy = e.position().y() - self.last_pos.y()
             self.last_pos = e.position()
-            rx = (self.xmax - self.xmin)/self.width()
-            ry = (self.ymax - self.ymin)/self.height()
-            self.xmin -= dx*rx; self.xmax -= dx*rx
-            self.ymin -= dy*ry; self.ymax -= dy*ry
-            self.full_render()
+            rx = self.span_x/self.width()
+            ry = self.span_y/self.height()
+            self._shift_center(-dx*rx, -dy*ry)
+            self._focus = (e.position().x()/self.width(), e.position().y()/self.height())
+            self.request_render()
 
     def mouseReleaseEvent(self, e: QtGui.QMouseEvent):
         self.dragging = False
@@ -128,33 +872,23 @@ class MandelbrotCanvas(QtWidgets.QLabel):
         key = e.key()
         # pan with arrows
         step = 0.05
-        dx = (self.xmax - self.xmin)*step
-        dy = (self.ymax - self.ymin)*step
-        if   key == QtCore.Qt.Key.Key_Left:  self.xmin -= dx; self.xmax -= dx
-        elif key == QtCore.Qt.Key.Key_Right: self.xmin += dx; self.xmax += dx
-        elif key == QtCore.Qt.Key.Key_Up:    self.ymin -= dy; self.ymax -= dy
-        elif key == QtCore.Qt.Key.Key_Down:  self.ymin += dy; self.ymax += dy
+        dx = self.span_x*step
+        dy = self.span_y*step
+        if   key == QtCore.Qt.Key.Key_Left:  self._shift_center(-dx, 0.0)
+        elif key == QtCore.Qt.Key.Key_Right: self._shift_center(dx, 0.0)
+        elif key == QtCore.Qt.Key.Key_Up:    self._shift_center(0.0, -dy)
+        elif key == QtCore.Qt.Key.Key_Down:  self._shift_center(0.0, dy)
         # zoom with plus/minus
         elif key in (QtCore.Qt.Key.Key_Plus, QtCore.Qt.Key.Key_Equal):
-            factor = 0.85
-            cx = (self.xmin + self.xmax)/2; cy = (self.ymin + self.ymax)/2
-            self.xmin = cx + (self.xmin - cx)*factor
-            self.xmax = cx + (self.xmax - cx)*factor
-            self.ymin = cy + (self.ymin - cy)*factor
-            self.ymax = cy + (self.ymax - cy)*factor
+            self._zoom_about(0.5, 0.5, 0.85)
         elif key in (QtCore.Qt.Key.Key_Minus, QtCore.Qt.Key.Key_Underscore):
-            factor = 1/0.85
-            cx = (self.xmin + self.xmax)/2; cy = (self.ymin + self.ymax)/2
-            self.xmin = cx + (self.xmin - cx)*factor
-            self.xmax = cx + (self.xmax - cx)*factor
-            self.ymin = cy + (self.ymin - cy)*factor
-            self.ymax = cy + (self.ymax - cy)*factor
+            self._zoom_about(0.5, 0.5, 1/0.85)
         else:
             return
-        self.full_render()
+        self.request_render()
 
     # ---------------------------------------------------------------------
     def compute_zoom(self) -> float:
         """Return zoom factor relative to the default full-view span."""
         default_span = 3.5        # xmax-xmin of the default view (1.0 – -2.5)
-        return default_span / (self.xmax - self.xmin) 
+        return default_span / self.span_x
@@ -3,6 +3,8 @@ import shutil
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
+from core.antialias import AA_LEVELS
+from core.autotune import AUTO, CANDIDATE_BLOCKS, format_block
 from core.prefs import DEFAULT_PREFS, PREFS, save_prefs
 from core.gradient import (
     ASSETS_DIR,
@@ -28,9 +30,19 @@ class PrefsDialog(QtWidgets.QDialog):
         self.dspin_esc.setValue(PREFS["escape_radius"])
 
         self.combo_quality = QtWidgets.QComboBox()
-        self.combo_quality.addItems(["Low", "Medium", "High", "Ultra", "Custom"])
+        self.combo_quality.addItems(["Low", "Medium", "High", "Ultra", "Custom", "Auto"])
         self.combo_quality.setCurrentText(PREFS.get("quality", "Medium"))
 
+        self.combo_mode = QtWidgets.QComboBox()
+        self.combo_mode.addItems(["Iterations", "Distance"])
+        self.combo_mode.setCurrentText(PREFS.get("render_mode", "Iterations"))
+
+        self.combo_aa = QtWidgets.QComboBox()
+        for level in AA_LEVELS:
+            self.combo_aa.addItem("Off" if level == 1 else f"{level}x", level)
+        self.combo_aa.setCurrentIndex(
+            max(0, self.combo_aa.findData(PREFS.get("aa_level", 1))))
+
         self.spin_min_iter = QtWidgets.QSpinBox()
         self.spin_min_iter.setRange(10, 20000)
 
@@ -38,6 +50,31 @@ class PrefsDialog(QtWidgets.QDialog):
         self.dspin_mult.setRange(1.0, 500.0)
         self.dspin_mult.setDecimals(1)
 
+        self.combo_block = QtWidgets.QComboBox()
+        self.combo_block.addItems([AUTO] + [format_block(b) for b in CANDIDATE_BLOCKS])
+        current_block = PREFS.get("cuda_block", AUTO)
+        if self.combo_block.findText(current_block) < 0:
+            self.combo_block.addItem(current_block)
+        self.combo_block.setCurrentText(current_block)
+
+        self.spin_target = QtWidgets.QSpinBox()
+        self.spin_target.setRange(0, 1000)
+        self.spin_target.setSuffix(" ms")
+        self.spin_target.setSpecialValueText("Off")
+        self.spin_target.setValue(PREFS.get("target_frame_ms", 33))
+        self.spin_target.setToolTip(
+            "While dragging or zooming, render at a lower resolution to stay "
+            "within this frame time; full quality follows once input stops.")
+
+        self.chk_reduce_iter = QtWidgets.QCheckBox("Lower iteration cap while navigating")
+        self.chk_reduce_iter.setChecked(PREFS.get("interactive_reduce_iter", False))
+
+        self.chk_refine = QtWidgets.QCheckBox("Refine the image while idle")
+        self.chk_refine.setChecked(PREFS.get("idle_refine", True))
+        self.chk_refine.setToolTip(
+            "Once the view settles, raise the iteration cap of unescaped pixels and "
+            "add anti-aliasing samples pass by pass, up to the anti-aliasing level above.")
+
         self.path_edit = QtWidgets.QLineEdit(PREFS["default_save"])
         btn_browse = QtWidgets.QPushButton("...")
         btn_browse.clicked.connect(self.browse_path)
@@ -47,8 +84,14 @@ class PrefsDialog(QtWidgets.QDialog):
 
         form.addRow("Escape radius:", self.dspin_esc)
         form.addRow("Render quality:", self.combo_quality)
+        form.addRow("Render mode:", self.combo_mode)
+        form.addRow("Anti-aliasing:", self.combo_aa)
         form.addRow("Min iterations:", self.spin_min_iter)
         form.addRow("Multiplier:", self.dspin_mult)
+        form.addRow("CUDA block size:", self.combo_block)
+        form.addRow("Target frame time:", self.spin_target)
+        form.addRow("", self.chk_reduce_iter)
+        form.addRow("", self.chk_refine)
         form.addRow("Default save dir:", hl)
 
         bb = QtWidgets.QDialogButtonBox(
@@ -67,6 +110,9 @@ class PrefsDialog(QtWidgets.QDialog):
             self.spin_min_iter.setEnabled(custom)
             self.dspin_mult.setEnabled(custom)
 
+            if quality == "Auto":
+                # cap comes from a probe render (core.render.auto_iteration_cap)
+                return
             if custom:
                 self.spin_min_iter.setValue(PREFS.get("custom_min_iter", 64))
                 self.dspin_mult.setValue(PREFS.get("custom_multiplier", 50.0))
@@ -93,11 +139,143 @@ class PrefsDialog(QtWidgets.QDialog):
         if PREFS["quality"] == "Custom":
             PREFS["custom_min_iter"] = self.spin_min_iter.value()
             PREFS["custom_multiplier"] = self.dspin_mult.value()
+        PREFS["render_mode"] = self.combo_mode.currentText()
+        PREFS["aa_level"] = self.combo_aa.currentData()
+        PREFS["cuda_block"] = self.combo_block.currentText()
+        PREFS["target_frame_ms"] = self.spin_target.value()
+        PREFS["interactive_reduce_iter"] = self.chk_reduce_iter.isChecked()
+        PREFS["idle_refine"] = self.chk_refine.isChecked()
         PREFS["default_save"] = self.path_edit.text().strip()
         save_prefs(PREFS)
         super().accept()
 
 
+class ExportDialog(QtWidgets.QDialog):
+    """Pick size, anti-aliasing and destination for a poster export."""
+
+    def __init__(self, parent=None, width=1920, height=1080, path=""):
+        super().__init__(parent)
+        self.setWindowTitle("Export poster")
+        form = QtWidgets.QFormLayout(self)
+
+        self.spin_w = QtWidgets.QSpinBox()
+        self.spin_w.setRange(16, 65535)
+        self.spin_w.setValue(width)
+        self.spin_h = QtWidgets.QSpinBox()
+        self.spin_h.setRange(16, 65535)
+        self.spin_h.setValue(height)
+
+        self.combo_aa = QtWidgets.QComboBox()
+        for level in AA_LEVELS:
+            self.combo_aa.addItem("Off" if level == 1 else f"{level}x", level)
+        self.combo_aa.setCurrentIndex(
+            max(0, self.combo_aa.findData(PREFS.get("aa_level", 1))))
+
+        self.path_edit = QtWidgets.QLineEdit(str(path))
+        btn_browse = QtWidgets.QPushButton("...")
+        btn_browse.clicked.connect(self.browse_path)
+        hl = QtWidgets.QHBoxLayout()
+        hl.addWidget(self.path_edit)
+        hl.addWidget(btn_browse)
+
+        form.addRow("Width (px):", self.spin_w)
+        form.addRow("Height (px):", self.spin_h)
+        form.addRow("Anti-aliasing:", self.combo_aa)
+        form.addRow("File:", hl)
+
+        bb = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel
+        )
+        bb.accepted.connect(self.accept)
+        bb.rejected.connect(self.reject)
+        form.addRow(bb)
+
+    def browse_path(self):
+        fn, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export poster", self.path_edit.text(), "PNG image (*.png)"
+        )
+        if fn:
+            self.path_edit.setText(fn)
+
+    def accept(self):
+        if not self.path_edit.text().strip():
+            QtWidgets.QMessageBox.warning(self, "Export", "Please choose a file.")
+            return
+        super().accept()
+
+    def export_size(self) -> tuple[int, int]:
+        return self.spin_w.value(), self.spin_h.value()
+
+    def aa_level(self) -> int:
+        return self.combo_aa.currentData()
+
+    def path(self) -> pathlib.Path:
+        return pathlib.Path(self.path_edit.text().strip()).expanduser()
+
+
+class AnimationDialog(QtWidgets.QDialog):
+    """Options for a zoom sequence from the full view to the current view."""
+
+    def __init__(self, parent=None, width=1280, height=720, folder=""):
+        super().__init__(parent)
+        self.setWindowTitle("Export zoom animation")
+        form = QtWidgets.QFormLayout(self)
+
+        self.spin_frames = QtWidgets.QSpinBox()
+        self.spin_frames.setRange(2, 100000)
+        self.spin_frames.setValue(300)
+        self.spin_w = QtWidgets.QSpinBox()
+        self.spin_w.setRange(16, 16384)
+        self.spin_w.setValue(width)
+        self.spin_h = QtWidgets.QSpinBox()
+        self.spin_h.setRange(16, 16384)
+        self.spin_h.setValue(height)
+        self.chk_keys = QtWidgets.QCheckBox("Derive in-between frames from 2x keyframes")
+        self.chk_keys.setChecked(True)
+
+        self.path_edit = QtWidgets.QLineEdit(str(folder))
+        btn_browse = QtWidgets.QPushButton("...")
+        btn_browse.clicked.connect(self.browse_path)
+        hl = QtWidgets.QHBoxLayout()
+        hl.addWidget(self.path_edit)
+        hl.addWidget(btn_browse)
+
+        form.addRow("Frames:", self.spin_frames)
+        form.addRow("Width (px):", self.spin_w)
+        form.addRow("Height (px):", self.spin_h)
+        form.addRow("Keyframes:", self.chk_keys)
+        form.addRow("Output folder:", hl)
+
+        bb = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel
+        )
+        bb.accepted.connect(self.accept)
+        bb.rejected.connect(self.reject)
+        form.addRow(bb)
+
+    def browse_path(self):
+        d = QtWidgets.QFileDialog.getExistingDirectory(
+            self, "Choose output folder", self.path_edit.text()
+        )
+        if d:
+            self.path_edit.setText(d)
+
+    def accept(self):
+        if not self.path_edit.text().strip():
+            QtWidgets.QMessageBox.warning(self, "Animation", "Please choose a folder.")
+            return
+        super().accept()
+
+    def options(self) -> dict:
+        return dict(
+            frames=self.spin_frames.value(),
+            W=self.spin_w.value(),
+            H=self.spin_h.value(),
+            keyframes=self.chk_keys.isChecked(),
+            out_dir=pathlib.Path(self.path_edit.text().strip()).expanduser(),
+        )
+
+
 class ColourDelegate(QtWidgets.QStyledItemDelegate):
     """Paint the color cell and edit it through QColorDialog."""
 
@@ -1,7 +1,6 @@
 from PySide6 import QtWidgets, QtGui, QtCore
-import numpy as np
 from core.render   import cuda_render
-from core.gradient import gradient_to_lut
+from core.gradient import colorize
 from core.prefs    import PREFS
 
 class FocalMap(QtWidgets.QDialog):
@@ -26,9 +25,7 @@ class FocalMap(QtWidgets.QDialog):
                             self._w, self._h,
                             PREFS["max_iter"], PREFS["escape_radius"])
 
-        norm  = np.clip(iters.astype(np.float64), 0, PREFS["max_iter"])
-        idx   = (norm * (len(lut) - 1)) / PREFS["max_iter"]
-        rgb   = lut[idx.astype(np.int32)]
+        rgb   = colorize(iters, PREFS["max_iter"], lut)
 
         qimg  = QtGui.QImage(rgb.data, self._w, self._h, 3*self._w,
                              QtGui.QImage.Format.Format_RGB888).copy()
@@ -1,26 +1,30 @@
 from PySide6 import QtWidgets, QtGui, QtCore
 import pathlib, datetime
 
-# optional resource module (same rationale as in main.py) ────────────────
-try:
-    import resources_rc
-except ModuleNotFoundError:
-    pass
-
-from core.prefs    import PREFS, DEFAULT_PREFS, save_prefs, APP_NAME
-from core.gradient import gradient_to_lut
+from core.prefs    import (PREFS, DEFAULT_PREFS, save_prefs, APP_NAME,
+                            apply_session_prefs)
+from core.gradient import gradient_to_lut, ASSETS_DIR
+from core.render   import init_backend_async
+from core.export   import export_poster
+from core.animation import View, ZoomExport
+from core.rawio    import RawFormatError, load_raw, save_raw
+from core.session  import SessionFormatError, load_session, save_session
 from ui.canvas    import MandelbrotCanvas
-from ui.dialogs   import PrefsDialog, GradientDialog
+from ui.dialogs   import PrefsDialog, GradientDialog, ExportDialog, AnimationDialog
 from ui.focalmap  import FocalMap
 
 SOFTWARE_VERSION = "1.2.2"        # shown in Help ▸ About
 
+LOGO_PATH = ASSETS_DIR / "logo.png"
+
 class MainWindow(QtWidgets.QMainWindow):
+    backendReady = QtCore.Signal(bool)     # emitted from the init thread
+
     def __init__(self):
         super().__init__()
         # ─── Window setup ──────────────────────────────────────────────
         self.setWindowTitle(APP_NAME)
-        self.setWindowIcon(QtGui.QIcon(":/assets/logo.png"))
+        self.setWindowIcon(QtGui.QIcon(str(LOGO_PATH)))
         self.resize(1100, 800)
 
         # ─── Central canvas ───────────────────────────────────────────
@@ -28,6 +32,14 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setCentralWidget(self.canvas)
         self.canvas.requestStatus.connect(self.statusBar().showMessage)
 
+        # numba/CUDA load in the background; until then frames render on
+        # the CPU, and the view is redrawn once the GPU is usable. Started
+        # after the canvas exists: a finished init calls back immediately.
+        self.backendReady.connect(self._on_backend_ready)
+        init_backend_async().add_done_callback(
+            lambda f: self.backendReady.emit(f.exception() is None and f.result())
+        )
+
         # ─── Zoom indicator (right side of status-bar) ───────────────────
         self._lbl_zoom = QtWidgets.QLabel()
         self.statusBar().addPermanentWidget(self._lbl_zoom)
@@ -46,6 +58,26 @@ class MainWindow(QtWidgets.QMainWindow):
                                    shortcut="Ctrl+Shift+S",
                                    triggered=self.save_as)
 
+        act_export = QtGui.QAction("Export poster…", self,
+                                   shortcut="Ctrl+E",
+                                   triggered=self.export_poster)
+
+        act_anim   = QtGui.QAction("Export zoom animation…", self,
+                                   triggered=self.export_animation)
+
+        act_saveSes = QtGui.QAction("Save session…", self,
+                                    triggered=self.save_session)
+
+        act_openSes = QtGui.QAction("Open session…", self,
+                                    shortcut="Ctrl+O",
+                                    triggered=self.open_session)
+
+        act_saveRaw = QtGui.QAction("Save raw…", self,
+                                    triggered=self.save_raw)
+
+        act_openRaw = QtGui.QAction("Open raw…", self,
+                                    triggered=self.open_raw)
+
         act_exit   = QtGui.QAction("Exit",      self,
                                    shortcut="Ctrl+Q",
                                    triggered=self.close)
@@ -64,6 +96,13 @@ class MainWindow(QtWidgets.QMainWindow):
         act_focal  = QtGui.QAction("Focal Map", self,
                                    triggered=self._open_focal_map)
 
+        act_prof   = QtGui.QAction("Profile next frame", self,
+                                   triggered=self.canvas.profile_next_frame)
+
+        act_hud    = QtGui.QAction("Performance HUD", self,
+                                   shortcut="F3", checkable=True,
+                                   toggled=self.canvas.set_hud_enabled)
+
         act_about  = QtGui.QAction("About",     self,
                                    triggered=self._about)
 
@@ -73,6 +112,14 @@ class MainWindow(QtWidgets.QMainWindow):
         m_file = mb.addMenu("&File")
         m_file.addAction(act_save)
         m_file.addAction(act_saveAs)
+        m_file.addAction(act_export)
+        m_file.addAction(act_anim)
+        m_file.addSeparator()
+        m_file.addAction(act_openSes)
+        m_file.addAction(act_saveSes)
+        m_file.addAction(act_saveRaw)
+        m_file.addAction(act_openRaw)
+        m_file.addSeparator()
         m_file.addAction(act_prefs)
         m_file.addSeparator()
         m_file.addAction(act_exit)
@@ -82,12 +129,19 @@ class MainWindow(QtWidgets.QMainWindow):
 
         m_view = mb.addMenu("&View")
         m_view.addActions([act_home, act_focal])
+        m_view.addSeparator()
+        m_view.addAction(act_hud)
+        m_view.addAction(act_prof)
 
         m_help = mb.addMenu("&Help")
         m_help.addAction(act_about)
 
         self._focal_map = None
 
+    def _on_backend_ready(self, cuda_ok: bool):
+        if cuda_ok:
+            self.canvas.full_render()
+
     # ─── Helpers for saving ─────────────────────────────────────────
     def _default_name(self) -> pathlib.Path:
         ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -109,6 +163,168 @@ class MainWindow(QtWidgets.QMainWindow):
             self.canvas.current_qimage.save(fn)
             self.statusBar().showMessage(f"Saved to {fn}")
 
+    def save_raw(self):
+        fn, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Save raw iteration buffer",
+            str(self._default_name().with_suffix(".npy")),
+            "Raw iteration buffer (*.npy)"
+        )
+        if not fn:
+            return
+        c = self.canvas
+        try:
+            path = save_raw(fn, c.current_iters,
+                            max_iter=c.max_iter, escape_radius=c.escape_radius,
+                            cx=c.cx, cy=c.cy, span_x=c.span_x, span_y=c.span_y,
+                            cx_lo=c.cx_lo, cy_lo=c.cy_lo)
+        except OSError as exc:
+            QtWidgets.QMessageBox.warning(self, "Save raw failed", str(exc))
+            return
+        self.statusBar().showMessage(f"Saved raw buffer to {path}")
+
+    def open_raw(self):
+        fn, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Open raw iteration buffer",
+            PREFS["default_save"],
+            "Raw iteration buffer (*.npy)"
+        )
+        if not fn:
+            return
+        try:
+            iters, meta = load_raw(fn)
+        except RawFormatError as exc:
+            QtWidgets.QMessageBox.warning(self, "Open raw failed", str(exc))
+            return
+        self.canvas.load_iterations(iters, meta)
+
+    def save_session(self):
+        fn, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Save session",
+            str(self._default_name().with_suffix(".json")),
+            "MandelPy session (*.json)"
+        )
+        if not fn:
+            return
+        c = self.canvas
+        view = dict(cx=c.cx, cy=c.cy, cx_lo=c.cx_lo, cy_lo=c.cy_lo,
+                    span_x=c.span_x, span_y=c.span_y, max_iter=c.max_iter)
+        try:
+            path = save_session(fn, view,
+                                {**PREFS, "escape_radius": c.escape_radius},
+                                iters=c.current_iters)
+        except OSError as exc:
+            QtWidgets.QMessageBox.warning(self, "Save session failed", str(exc))
+            return
+        self.statusBar().showMessage(f"Saved session to {path}")
+
+    def open_session(self):
+        fn, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Open session",
+            PREFS["default_save"],
+            "MandelPy session (*.json)"
+        )
+        if not fn:
+            return
+        try:
+            session = load_session(fn)
+        except SessionFormatError as exc:
+            QtWidgets.QMessageBox.warning(self, "Open session failed", str(exc))
+            return
+        # session settings apply to this run only; prefs.json is left alone
+        apply_session_prefs({**session["render"], "gradient": session["gradient"]})
+        self.canvas.escape_radius = PREFS["escape_radius"]
+        self.canvas.color_lut = gradient_to_lut(PREFS["gradient"])
+        self.canvas.restore_view(session["view"], session["iters"])
+
+    def export_poster(self):
+        c = self.canvas
+        dlg = ExportDialog(self, c.width(), c.height(), self._default_name())
+        if not dlg.exec():
+            return
+        W, H = dlg.export_size()
+        path = dlg.path()
+
+        progress = QtWidgets.QProgressDialog("Rendering poster…", "Cancel", 0, H, self)
+        progress.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+
+        def _progress(done, total):
+            progress.setValue(done)
+            QtWidgets.QApplication.processEvents()
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # keep the canvas width in view; the height follows the aspect
+            done = export_poster(path, c.cx, c.cy, c.span_x, c.span_x * H / W,
+                                 W, H, c.max_iter, c.escape_radius, c.color_lut,
+                                 c.cx_lo, c.cy_lo,
+                                 aa_level=dlg.aa_level(),
+                                 distance=PREFS.get("render_mode") == "Distance",
+                                 progress=_progress,
+                                 cancelled=progress.wasCanceled)
+        except (OSError, ValueError) as exc:
+            progress.close()
+            QtWidgets.QMessageBox.warning(self, "Export failed", str(exc))
+            return
+        progress.close()
+        if done:
+            self.statusBar().showMessage(f"Exported {W}x{H} to {path}")
+        else:
+            self.statusBar().showMessage("Export cancelled")
+
+    def export_animation(self):
+        c = self.canvas
+        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        folder = pathlib.Path(PREFS["default_save"]) / f"mandelbrot_zoom_{ts}"
+        dlg = AnimationDialog(self, folder=folder)
+        if not dlg.exec():
+            return
+        opts = dlg.options()
+        W, H = opts["W"], opts["H"]
+        # from the full view down to the current one, at the export aspect
+        start = View(-0.75, 0.0, 3.5, 3.5 * H / W)
+        end = View(c.cx, c.cy, c.span_x, c.span_x * H / W, c.cx_lo, c.cy_lo)
+
+        try:
+            job = ZoomExport(opts["out_dir"], start, end, opts["frames"], W, H,
+                             c.max_iter, c.escape_radius, c.color_lut,
+                             keyframes=opts["keyframes"],
+                             distance=PREFS.get("render_mode") == "Distance")
+        except (OSError, ValueError) as exc:
+            QtWidgets.QMessageBox.warning(self, "Export failed", str(exc))
+            return
+
+        progress = QtWidgets.QProgressDialog("Rendering frames…", "Cancel",
+                                             0, job.total, self)
+        progress.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.canceled.connect(job.cancel)
+        # frames render on worker threads; the timer only collects them,
+        # so the dialog (and its Cancel button) stays responsive
+        timer = QtCore.QTimer(self, interval=50)
+
+        def _poll():
+            failed = None
+            try:
+                ended = job.poll()
+            except (OSError, ValueError) as exc:
+                ended, failed = True, exc
+            if not ended:
+                progress.setValue(job.done)
+                return
+            timer.stop()
+            timer.deleteLater()
+            progress.close()
+            if failed is not None:
+                QtWidgets.QMessageBox.warning(self, "Export failed", str(failed))
+            elif job.manifest is not None:
+                self.statusBar().showMessage(
+                    f"Exported {opts['frames']} frames to {opts['out_dir']}")
+            elif job.cancelled:
+                self.statusBar().showMessage("Animation export cancelled")
+
+        timer.timeout.connect(_poll)
+        timer.start()
 
     # ─── Preferences & Gradient ────────────────────────────────────
     def edit_prefs(self):
@@ -180,9 +396,7 @@ class MainWindow(QtWidgets.QMainWindow):
             )
 
         # always (re-)draw crosshair for CURRENT viewport
-        cx = (self.canvas.xmin + self.canvas.xmax) / 2.0
-        cy = (self.canvas.ymin + self.canvas.ymax) / 2.0
-        self._focal_map.update_crosshair(cx, cy)
+        self._focal_map.update_crosshair(self.canvas.cx, self.canvas.cy)
 
         self._focal_map.show()
         self._focal_map.raise_()